@@ -13,10 +13,12 @@ if str(PYTHON_SRC) not in sys.path:
     sys.path.insert(0, str(PYTHON_SRC))
 
 from dvpp_cert_extraction import (
+    ExtractionSession,
     collect_input_files,
     merge_extraction_results,
     SUPPORTED_MODELS,
     extract_certificates,
+    extract_text_layer,
     serialize_result_json,
     serialize_result_tsv,
 )
@@ -69,10 +71,22 @@ def main(argv: list[str] | None = None) -> int:
         if args.input is not None:
             result = extract_certificates(args.input, args.model)
         else:
-            batch_results = [
-                extract_certificates(input_path, args.model)
-                for input_path in collect_input_files(args.input_dir)
-            ]
+            input_paths = collect_input_files(args.input_dir)
+            # Files with a text layer never reach Gemini, so the session (API key, HTTP pool)
+            # is only created for the first file that needs the model.
+            session = None
+            batch_results = []
+            try:
+                for input_path in input_paths:
+                    file_result = extract_text_layer(input_path)
+                    if file_result is None:
+                        if session is None:
+                            session = ExtractionSession(args.model)
+                        file_result = extract_certificates(input_path, args.model, session=session)
+                    batch_results.append(file_result)
+            finally:
+                if session is not None:
+                    session.close()
             result = merge_extraction_results(batch_results)
     except (FileNotFoundError, ModuleNotFoundError, TypeError, ValueError) as exc:
         parser.exit(2, f"{exc}\n")
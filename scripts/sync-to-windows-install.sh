@@ -73,6 +73,8 @@ git show "$CURRENT_COMMIT:src/python/tools/inv_vzd_processor.py" > src/python/to
 git show "$CURRENT_COMMIT:src/python/tools/zor_spec_dat_processor.py" > src/python/tools/zor_spec_dat_processor.py
 git show "$CURRENT_COMMIT:src/python/tools/plakat_generator.py" > src/python/tools/plakat_generator.py
 git show "$CURRENT_COMMIT:src/python/tools/attendance_splitter.py" > src/python/tools/attendance_splitter.py
+git show "$CURRENT_COMMIT:src/python/tools/attendance_sheet_copier.py" > src/python/tools/attendance_sheet_copier.py
+git show "$CURRENT_COMMIT:src/python/tools/attendance_sheet_sniffer.py" > src/python/tools/attendance_sheet_sniffer.py
 
 # Templates (Excel files - binary)
 git show "$CURRENT_COMMIT:templates/template_16_hodin.xlsx" > templates/template_16_hodin.xlsx
@@ -28,6 +28,8 @@ const state = {
         modelName: 'gemini-3-flash-preview',
         matches: [],
         records: [],
+        batchId: null,
+        pendingBatchEdits: Promise.resolve(),
         diagnostics: [],
         rawText: '',
         hasStoredApiKey: false,
@@ -40,7 +42,8 @@ const state = {
             esf_exit_date: '',
             fill_header: false,
             template_path: 'D:\\JAK2024\\Dokumenty\\Evidence_podpor_poskytnutych_ucastnikum_vzdelavani_MS_ZS_upravene_DVPP.xlsx'
-        }
+        },
+        excelWriter: 'xlwings'
     }
 };
 
@@ -128,6 +131,7 @@ const elements = {
     certEsfEntryDate: document.getElementById('cert-esf-entry-date'),
     certEsfExitDate: document.getElementById('cert-esf-exit-date'),
     certFillHeader: document.getElementById('cert-fill-header'),
+    certExcelHeadless: document.getElementById('cert-excel-headless'),
     certTemplatePath: document.getElementById('cert-template-path'),
     certSelectTemplateBtn: document.getElementById('select-cert-template'),
     certCopyTsvBtn: document.getElementById('copy-cert-tsv'),
@@ -369,6 +373,7 @@ async function init() {
     elements.certEsfEntryDate.value = state.certificateExtraction.exportMetadata.esf_entry_date;
     elements.certEsfExitDate.value = state.certificateExtraction.exportMetadata.esf_exit_date;
     elements.certFillHeader.checked = !!state.certificateExtraction.exportMetadata.fill_header;
+    elements.certExcelHeadless.checked = state.certificateExtraction.excelWriter === 'openpyxl';
     elements.certTemplatePath.value = state.certificateExtraction.exportMetadata.template_path;
     setCertificateImportCollapsed(false);
     await refreshGeminiApiKeyStatus();
@@ -978,7 +983,8 @@ async function processAttendanceSplitter() {
             'attendance-splitter/process',
             'POST',
             {
-                filePaths: state.selectedFiles['attendance-splitter'].map((file) => file.path)
+                filePaths: state.selectedFiles['attendance-splitter'].map((file) => file.path),
+                backend: document.querySelector('input[name="attendance-splitter-backend"]:checked')?.value || 'openpyxl'
             }
         );
         renderAttendanceSplitterResults(result);
@@ -1712,6 +1718,7 @@ function toggleCertificateImportPanel() {
 }
 
 function resetCertificateExtractionOutput() {
+    releaseCertificateBatch();
     state.certificateExtraction.records = [];
     state.certificateExtraction.diagnostics = [];
     refreshCertificateGridRows();
@@ -1738,6 +1745,10 @@ function bindCertificateMetadataInputs() {
     elements.certFillHeader.addEventListener('change', (event) => {
         state.certificateExtraction.exportMetadata.fill_header = !!event.target.checked;
     });
+
+    elements.certExcelHeadless.addEventListener('change', (event) => {
+        state.certificateExtraction.excelWriter = event.target.checked ? 'openpyxl' : 'xlwings';
+    });
 }
 
 async function refreshGeminiApiKeyStatus() {
@@ -1949,7 +1960,7 @@ async function processCertificatesWithGemini() {
 
         showLoading(false);
         applyCertificateBatchResult(result.data.batch, result.data.diagnostics || []);
-        showMessage(`Vytěženo ${state.certificateExtraction.records.length} certifikátů.`, 'success');
+        showCertificateImportMessage(`Vytěženo ${state.certificateExtraction.records.length} certifikátů.`, result.data.duplicates);
     } catch (error) {
         showLoading(false);
         console.error('Gemini certificate import error:', error);
@@ -1976,15 +1987,27 @@ async function processCertificatesFromRawText() {
         showLoading(false);
 
         applyCertificateBatchResult(result.data.batch, []);
-        showMessage(`Načteno ${state.certificateExtraction.records.length} certifikátů z raw textu.`, 'success');
+        showCertificateImportMessage(`Načteno ${state.certificateExtraction.records.length} certifikátů z raw textu.`, result.data.duplicates);
     } catch (error) {
         showLoading(false);
         console.error('Raw text certificate import error:', error);
-        showMessage(`Chyba při načítání raw textu: ${error.message}`, 'error');
+        showMessage(`Chyba při načítání raw textu: ${formatApiErrorMessage(error)}`, 'error');
+    }
+}
+
+function showCertificateImportMessage(message, duplicates) {
+    const repeated = (duplicates || []).filter((item) => item.scope !== 'person').length;
+    if (!repeated) {
+        showMessage(message, 'success');
+        return;
     }
+
+    showMessage(`${message} ${repeated} z nich už bylo načteno dříve nebo se v dávce opakuje.`, 'warning');
 }
 
 function applyCertificateBatchResult(batch, diagnostics) {
+    releaseCertificateBatch();
+    state.certificateExtraction.batchId = batch.batch_id || null;
     state.certificateExtraction.records = Array.isArray(batch.records) ? batch.records : [];
     state.certificateExtraction.diagnostics = diagnostics;
     if (state.certificateExtraction.records.length > 0) {
@@ -2220,16 +2243,67 @@ function renderCertificateDiagnostics() {
     `;
 }
 
+function releaseCertificateBatch() {
+    const batchId = state.certificateExtraction.batchId;
+    if (!batchId) {
+        return;
+    }
+
+    state.certificateExtraction.batchId = null;
+    state.certificateExtraction.pendingBatchEdits = Promise.resolve();
+    window.electronAPI.apiCall(`dvpp-certificates/batches/${batchId}`, 'DELETE')
+        .catch((error) => console.warn('Release certificate batch error:', error));
+}
+
+function queueCertificateBatchEdits(edits) {
+    const batchId = state.certificateExtraction.batchId;
+    if (!batchId || !edits.length) {
+        return;
+    }
+
+    // Edits are sent in order; if the backend rejects them, exports fall back to sending the full record list.
+    state.certificateExtraction.pendingBatchEdits = state.certificateExtraction.pendingBatchEdits
+        .then(() => window.electronAPI.apiCall(`dvpp-certificates/batches/${batchId}/edits`, 'POST', { edits }))
+        .catch((error) => {
+            console.warn('Certificate batch edit error:', error);
+            if (state.certificateExtraction.batchId === batchId) {
+                state.certificateExtraction.batchId = null;
+            }
+        });
+}
+
+async function callCertificateExport(endpoint, payload) {
+    await state.certificateExtraction.pendingBatchEdits;
+    const batchId = state.certificateExtraction.batchId;
+    if (batchId) {
+        try {
+            return await window.electronAPI.apiCall(endpoint, 'POST', { ...payload, batchId });
+        } catch (error) {
+            if (!error?.data?.batchMissing) {
+                throw error;
+            }
+            state.certificateExtraction.batchId = null;
+        }
+    }
+
+    return window.electronAPI.apiCall(endpoint, 'POST', {
+        ...payload,
+        records: state.certificateExtraction.records
+    });
+}
+
 function updateCertificateField(index, field, value) {
     const record = state.certificateExtraction.records[index];
     if (!record) {
         return;
     }
     record.working_record[field] = value;
+    queueCertificateBatchEdits([{ op: 'set', index, field, value }]);
 }
 
 function removeCertificateRecord(index) {
     state.certificateExtraction.records.splice(index, 1);
+    queueCertificateBatchEdits([{ op: 'delete', index }]);
     refreshCertificateGridRows();
     updateCertificateActions();
 }
@@ -2249,6 +2323,7 @@ function applyCertificateTemplateToAllRecords() {
     state.certificateExtraction.records.forEach((record) => {
         record.working_record.sablona = selectedTemplate;
     });
+    queueCertificateBatchEdits([{ op: 'set_all', field: 'sablona', value: selectedTemplate }]);
 
     refreshCertificateGridRows();
     showMessage(`Šablona ${selectedTemplate} byla nastavena do všech řádků.`, 'success');
@@ -2269,6 +2344,7 @@ function applyCertificateFormaToAllRecords() {
     state.certificateExtraction.records.forEach((record) => {
         record.working_record.forma = selectedForma;
     });
+    queueCertificateBatchEdits([{ op: 'set_all', field: 'forma', value: selectedForma }]);
 
     refreshCertificateGridRows();
     showMessage(`Forma ${selectedForma} byla nastavena do všech řádků.`, 'success');
@@ -2289,6 +2365,7 @@ function applyCertificatePohlaviToAllRecords() {
     state.certificateExtraction.records.forEach((record) => {
         record.working_record.pohlavi = selectedPohlavi;
     });
+    queueCertificateBatchEdits([{ op: 'set_all', field: 'pohlavi', value: selectedPohlavi }]);
 
     refreshCertificateGridRows();
     showMessage(`Pohlaví ${selectedPohlavi} bylo nastaveno do všech řádků.`, 'success');
@@ -2309,9 +2386,7 @@ function updateCertificateActions() {
 
 async function copyCertificateTsv() {
     try {
-        const result = await window.electronAPI.apiCall('dvpp-certificates/export/tsv', 'POST', {
-            records: state.certificateExtraction.records
-        });
+        const result = await callCertificateExport('dvpp-certificates/export/tsv', {});
         await copyTextToClipboard(result.data.content, 'TSV obsah byl zkopírován do schránky.');
     } catch (error) {
         console.error('Copy TSV error:', error);
@@ -2326,10 +2401,7 @@ async function saveCertificateTsv() {
             return;
         }
 
-        await window.electronAPI.apiCall('dvpp-certificates/export/tsv', 'POST', {
-            records: state.certificateExtraction.records,
-            outputPath
-        });
+        await callCertificateExport('dvpp-certificates/export/tsv', { outputPath });
         showMessage(`TSV export byl uložen: ${wslToWindowsPath(outputPath)}`, 'success');
     } catch (error) {
         console.error('Save TSV error:', error);
@@ -2344,10 +2416,10 @@ async function saveCertificateExcel() {
             return;
         }
 
-        const result = await window.electronAPI.apiCall('dvpp-certificates/export/excel', 'POST', {
-            records: state.certificateExtraction.records,
+        const result = await callCertificateExport('dvpp-certificates/export/excel', {
             exportMetadata: state.certificateExtraction.exportMetadata,
             templatePath: state.certificateExtraction.exportMetadata.template_path,
+            excelWriter: state.certificateExtraction.excelWriter,
             outputPath
         });
         showMessage(`Excel export byl vytvořen: ${wslToWindowsPath(result.data.output_path)}`, 'success');
@@ -2387,8 +2459,7 @@ async function saveCertificateEsfImport() {
             return;
         }
 
-        const result = await window.electronAPI.apiCall('dvpp-certificates/export/esf', 'POST', {
-            records: state.certificateExtraction.records,
+        const result = await callCertificateExport('dvpp-certificates/export/esf', {
             exportMetadata: state.certificateExtraction.exportMetadata,
             outputPath
         });
@@ -3043,7 +3114,9 @@ async function generatePlakat(event) {
         const requestData = {
             projects: projects,
             orientation: orientation,
-            common_text: commonText
+            common_text: commonText,
+            bypassCache: document.getElementById('plakat-bypass-cache')?.checked || false,
+            renderer: document.querySelector('input[name="plakat-renderer"]:checked')?.value || 'remote'
         };
         
         const result = await window.electronAPI.apiCall('process/plakat', 'POST', requestData);
@@ -3100,6 +3173,8 @@ function buildPlakatResultHtml(result, saveResults, targetFolder) {
         <div class="result-summary">
             <p><strong>Úspěšně:</strong> ${data.successful_projects || 0}/${data.total_projects || 0}</p>
             ${failedCount > 0 ? `<p class="plakat-failed-count"><strong>Selhalo:</strong> ${failedCount}</p>` : ''}
+            ${data.cached_projects > 0 ? `<p><strong>Z mezipaměti:</strong> ${data.cached_projects}</p>` : ''}
+            ${data.local_projects > 0 ? `<p class="plakat-draft-count"><strong>Neoficiální náhled (vykresleno lokálně):</strong> ${data.local_projects}</p>` : ''}
             <p><strong>Složka:</strong> ${escapeHtml(targetFolder)}</p>
         </div>
     `;
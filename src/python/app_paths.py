@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+from typing import Mapping
+
+
+CACHE_DIR_ENV = "NASTROJE_OPJAK_CACHE_DIR"
+WINDOWS_APP_DIR_NAME = "NastrojeOPJAK"
+POSIX_APP_DIR_NAME = ".nastroje-opjak"
+
+
+def resolve_cache_dir(name: str, env: Mapping[str, str] | None = None) -> Path:
+    environment = os.environ if env is None else env
+    override = str(environment.get(CACHE_DIR_ENV, "")).strip()
+    if override:
+        return Path(override).expanduser() / name
+
+    if sys.platform == "win32":
+        app_data = environment.get("APPDATA") or os.path.expanduser("~")
+        return Path(app_data) / WINDOWS_APP_DIR_NAME / "cache" / name
+    return Path.home() / POSIX_APP_DIR_NAME / "cache" / name
@@ -2,11 +2,15 @@
 
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass, field
 import json
 import os
 from pathlib import Path
-from typing import Callable, Mapping
+import time
+import warnings
+from typing import TYPE_CHECKING, Awaitable, Callable, Mapping, Sequence
 
 from dvpp_certificates.domain import CertificateRecord
 from dvpp_certificates.normalization import (
@@ -16,6 +20,10 @@ from dvpp_certificates.normalization import (
     normalize_topic,
     strip_titles,
 )
+from dvpp_certificates.text_layer import TextLayerParser, extract_text_layer_certificates
+
+if TYPE_CHECKING:
+    from dvpp_certificates.extraction_cache import CertificateExtractionCache
 
 
 SUPPORTED_EXTENSIONS = frozenset({".pdf", ".jpg", ".jpeg", ".png"})
@@ -29,6 +37,17 @@ MODEL_NAME_MAPPING = {
 }
 PRIMARY_API_KEY_ENV = "GEMINI_API_KEY"
 FALLBACK_API_KEY_ENV = "GOOGLE_API_KEY"
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_MAX_RETRIES = 2
+DEFAULT_RETRY_BACKOFF_SECONDS = 2.0
+DEFAULT_BATCH_SIZE = 1
+DEFAULT_MAX_BATCH_BYTES = 4 * 1024 * 1024
+TRANSIENT_STATUS_CODES = frozenset({408, 429})
+
+
+class MalformedResponseError(ValueError):
+    """The model answered, but its output cannot be mapped onto the requested files."""
+
 
 @dataclass(slots=True)
 class ExtractionResult:
@@ -41,6 +60,115 @@ class ExtractionResult:
             if not isinstance(certificate, CertificateRecord):
                 raise TypeError("certificates must contain CertificateRecord items")
 
+
+@dataclass(slots=True)
+class RequestUsage:
+    request_bytes: int = 0
+    response_bytes: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+    def add(self, other: RequestUsage) -> None:
+        self.request_bytes += other.request_bytes
+        self.response_bytes += other.response_bytes
+        self.input_tokens += other.input_tokens
+        self.output_tokens += other.output_tokens
+
+    def split(self, count: int) -> list[RequestUsage]:
+        shares = []
+        for index in range(count):
+            shares.append(
+                RequestUsage(
+                    **{
+                        name: value // count + (1 if index < value % count else 0)
+                        for name, value in asdict(self).items()
+                    }
+                )
+            )
+        return shares
+
+
+@dataclass(slots=True)
+class FileExtractionOutcome:
+    source_file: str
+    result: ExtractionResult | None = None
+    error: str = ""
+    attempts: int = 0
+    cache_hit: bool = False
+    text_layer: bool = False
+    wall_time_ms: float = 0.0
+    queue_wait_ms: float = 0.0
+    usage: RequestUsage = field(default_factory=RequestUsage)
+
+    @property
+    def success(self) -> bool:
+        return self.result is not None
+
+    @property
+    def retries(self) -> int:
+        return max(0, self.attempts - 1)
+
+
+class TokenBucket:
+    def __init__(
+        self,
+        rate: float,
+        capacity: float = 1.0,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self.tokens = self.capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.updated_at = clock()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = self.clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+                await self.sleep((1.0 - self.tokens) / self.rate)
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+
+    status_code = getattr(exc, "status_code", None)
+    if status_code is None:
+        status_code = getattr(getattr(exc, "response", None), "status_code", None)
+    if isinstance(status_code, int):
+        return status_code in TRANSIENT_STATUS_CODES or status_code >= 500
+
+    try:
+        import httpx
+    except ImportError:
+        return False
+    return isinstance(exc, (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError))
+
+
+def is_malformed_response(exc: BaseException) -> bool:
+    if isinstance(exc, MalformedResponseError):
+        return True
+
+    try:
+        from pydantic_ai.exceptions import UnexpectedModelBehavior
+    except ImportError:
+        return False
+    # Raised once the agent runs out of retries for output that fails schema validation.
+    return isinstance(exc, UnexpectedModelBehavior)
+
+
 def resolve_model_name(model_name: str) -> str:
     try:
         return MODEL_NAME_MAPPING[model_name]
@@ -93,23 +221,230 @@ def collect_input_files(path: str | Path) -> list[Path]:
     return files
 
 
-def create_agent(*, model_name: str, api_key: str):
+def create_agent(*, model_name: str, api_key: str, http_client=None):
     from pydantic_ai import Agent
     from pydantic_ai.models.google import GoogleModel
     from pydantic_ai.providers.google import GoogleProvider
 
     resolved_model_name = resolve_model_name(model_name)
-    provider = GoogleProvider(api_key=api_key)
+    provider = GoogleProvider(api_key=api_key, http_client=http_client)
     model = GoogleModel(resolved_model_name, provider=provider)
     return Agent(model=model, output_type=ExtractionResult)
 
 
+def create_http_client(max_connections: int = DEFAULT_MAX_CONCURRENCY):
+    import httpx
+    from pydantic_ai.models import DEFAULT_HTTP_TIMEOUT
+
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(timeout=DEFAULT_HTTP_TIMEOUT, connect=5),
+        limits=httpx.Limits(
+            max_connections=max(1, max_connections),
+            max_keepalive_connections=max(1, max_connections),
+        ),
+    )
+
+
 def _binary_content_from_path(path: Path):
     from pydantic_ai import BinaryContent
 
     return BinaryContent.from_path(path)
 
 
+def _thread_event_loop() -> asyncio.AbstractEventLoop:
+    # Agent.run_sync drives requests on the calling thread's event loop.
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        try:
+            loop = asyncio.get_event_loop()
+        except RuntimeError:
+            loop = None
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+    return loop
+
+
+def _resolve_api_key(api_key: str | None, env: Mapping[str, str] | None) -> str:
+    return api_key.strip() if isinstance(api_key, str) and api_key.strip() else load_api_key(env)
+
+
+def extract_text_layer(
+    input_path: str | Path,
+    parsers: Sequence[TextLayerParser] | None = None,
+) -> ExtractionResult | None:
+    certificates = extract_text_layer_certificates(input_path, parsers)
+    if certificates is None:
+        return None
+    return ExtractionResult(certificates=certificates)
+
+
+def _payload_item_size(item: object) -> int:
+    if isinstance(item, str):
+        return len(item.encode("utf-8"))
+    data = getattr(item, "data", None)
+    return len(data) if isinstance(data, (bytes, bytearray)) else 0
+
+
+def _record_response_usage(usage: RequestUsage, response: object) -> None:
+    output = getattr(response, "output", None)
+    if isinstance(output, ExtractionResult):
+        output = {"certificates": [asdict(record) for record in output.certificates]}
+    try:
+        usage.response_bytes += len(json.dumps(output, ensure_ascii=False, default=str).encode("utf-8"))
+    except (TypeError, ValueError):
+        pass
+
+    run_usage = getattr(response, "usage", None)
+    if callable(run_usage):
+        run_usage = run_usage()
+    usage.input_tokens += int(getattr(run_usage, "input_tokens", 0) or 0)
+    usage.output_tokens += int(getattr(run_usage, "output_tokens", 0) or 0)
+
+
+def _build_file_prompt() -> str:
+    return f"{build_extraction_prompt()}\n\nNyni zpracuj prilozeny soubor."
+
+
+def _build_batch_prompt() -> str:
+    return (
+        f"{build_extraction_prompt()}\n\n"
+        "Nyni zpracuj vsechny prilozene soubory. Kazdy soubor uvozuje radek "
+        "'Soubor <cislo>: <nazev>'. U kazdeho certifikatu vypln origin.source_index "
+        "cislem souboru a origin.source_file jeho nazvem."
+    )
+
+
+def _origin_value(origin: object, field_name: str) -> object:
+    if isinstance(origin, Mapping):
+        return origin.get(field_name)
+    return getattr(origin, field_name, None)
+
+
+def _split_batch_output(output: object, input_paths: Sequence[Path]) -> list[ExtractionResult]:
+    if isinstance(output, ExtractionResult):
+        certificates = [(certificate.origin, asdict(certificate)) for certificate in output.certificates]
+    elif isinstance(output, Mapping) and "certificates" in output:
+        certificates = [(certificate.get("origin"), certificate) for certificate in output["certificates"]]
+    else:
+        raise MalformedResponseError("Malformed extraction response: missing certificates")
+
+    file_indexes = {path.name: index for index, path in enumerate(input_paths)}
+    results = [ExtractionResult(certificates=[]) for _ in input_paths]
+    for origin, fields in certificates:
+        source_index = _origin_value(origin, "source_index")
+        source_name = Path(str(_origin_value(origin, "source_file") or "")).name
+        if isinstance(source_index, int) and 1 <= source_index <= len(input_paths):
+            file_index = source_index - 1
+        elif source_name in file_indexes:
+            file_index = file_indexes[source_name]
+        else:
+            raise MalformedResponseError("Malformed extraction response: certificate without source file")
+        fields = {key: value for key, value in fields.items() if key != "origin"}
+        try:
+            results[file_index].certificates.append(normalize_certificate_fields(fields))
+        except (TypeError, ValueError) as exc:
+            raise MalformedResponseError(f"Malformed extraction response: {exc}") from exc
+
+    # An empty file in a shared answer is indistinguishable from one the model skipped,
+    # so only a request for that file alone may report zero certificates.
+    missing = [path.name for path, result in zip(input_paths, results) if not result.certificates]
+    if missing:
+        raise MalformedResponseError(f"Malformed extraction response: no certificates for {', '.join(missing)}")
+    return results
+
+
+def _pack_batches(
+    items: Sequence[tuple[FileExtractionOutcome, Path, str | None]],
+    batch_size: int,
+    max_batch_bytes: int,
+) -> list[list[tuple[FileExtractionOutcome, Path, str | None]]]:
+    batches: list[list[tuple[FileExtractionOutcome, Path, str | None]]] = []
+    current: list[tuple[FileExtractionOutcome, Path, str | None]] = []
+    current_bytes = 0
+    for item in items:
+        size = item[1].stat().st_size
+        if current and (len(current) >= batch_size or current_bytes + size > max_batch_bytes):
+            batches.append(current)
+            current, current_bytes = [], 0
+        current.append(item)
+        current_bytes += size
+    if current:
+        batches.append(current)
+    return batches
+
+
+class ExtractionSession:
+    def __init__(
+        self,
+        model_name: str,
+        *,
+        api_key: str | None = None,
+        env: Mapping[str, str] | None = None,
+        agent_factory: Callable[..., object] | None = None,
+        binary_content_factory: Callable[[Path], object] | None = None,
+        max_connections: int = DEFAULT_MAX_CONCURRENCY,
+    ) -> None:
+        self.model_name = model_name
+        self.api_key = _resolve_api_key(api_key, env)
+        self.prompt = _build_file_prompt()
+        self.batch_prompt = _build_batch_prompt()
+        self.binary_loader = _binary_content_from_path if binary_content_factory is None else binary_content_factory
+        self.http_client = None
+        if agent_factory is None:
+            self.http_client = create_http_client(max_connections)
+            self.agent = create_agent(model_name=model_name, api_key=self.api_key, http_client=self.http_client)
+        else:
+            self.agent = agent_factory(model_name=model_name, api_key=self.api_key)
+
+    def _payload(self, input_path: str | Path) -> list[object]:
+        return [self.prompt, self.binary_loader(validate_input_file(input_path))]
+
+    def extract(self, input_path: str | Path) -> ExtractionResult:
+        response = self.agent.run_sync(self._payload(input_path))
+        return _coerce_extraction_output(response.output)
+
+    async def extract_async(
+        self,
+        input_path: str | Path,
+        usage: RequestUsage | None = None,
+    ) -> ExtractionResult:
+        response = await self._run_async(self._payload(input_path), usage)
+        return _coerce_extraction_output(response.output)
+
+    async def extract_batch_async(
+        self,
+        input_paths: Sequence[str | Path],
+        usage: RequestUsage | None = None,
+    ) -> list[ExtractionResult]:
+        validated_paths = [validate_input_file(path) for path in input_paths]
+        payload: list[object] = [self.batch_prompt]
+        for index, path in enumerate(validated_paths, start=1):
+            payload.extend([f"Soubor {index}: {path.name}", self.binary_loader(path)])
+        response = await self._run_async(payload, usage)
+        return _split_batch_output(response.output, validated_paths)
+
+    async def _run_async(self, payload: list[object], usage: RequestUsage | None = None):
+        if usage is not None:
+            usage.request_bytes += sum(_payload_item_size(item) for item in payload)
+        if hasattr(self.agent, "run"):
+            response = await self.agent.run(payload)
+        else:
+            response = await asyncio.to_thread(self.agent.run_sync, payload)
+        if usage is not None:
+            _record_response_usage(usage, response)
+        return response
+
+    async def aclose(self) -> None:
+        if self.http_client is not None and not self.http_client.is_closed:
+            await self.http_client.aclose()
+
+    def close(self) -> None:
+        if self.http_client is not None and not self.http_client.is_closed:
+            # Pooled connections from run_sync belong to the thread's loop, so close them there.
+            _thread_event_loop().run_until_complete(self.aclose())
+
+
 def extract_certificates(
     input_path: str | Path,
     model_name: str,
@@ -118,15 +453,246 @@ def extract_certificates(
     env: Mapping[str, str] | None = None,
     agent_factory: Callable[..., object] | None = None,
     binary_content_factory: Callable[[Path], object] | None = None,
+    session: ExtractionSession | None = None,
+) -> ExtractionResult:
+    validated_input = validate_input_file(input_path)
+    if session is not None:
+        return session.extract(validated_input)
+
+    session = ExtractionSession(
+        model_name,
+        api_key=api_key,
+        env=env,
+        agent_factory=agent_factory,
+        binary_content_factory=binary_content_factory,
+    )
+    try:
+        return session.extract(validated_input)
+    finally:
+        session.close()
+
+
+async def extract_certificates_async(
+    input_path: str | Path,
+    model_name: str,
+    *,
+    api_key: str | None = None,
+    env: Mapping[str, str] | None = None,
+    agent_factory: Callable[..., object] | None = None,
+    binary_content_factory: Callable[[Path], object] | None = None,
+    session: ExtractionSession | None = None,
 ) -> ExtractionResult:
     validated_input = validate_input_file(input_path)
-    resolved_api_key = api_key.strip() if isinstance(api_key, str) and api_key.strip() else load_api_key(env)
-    agent_builder = create_agent if agent_factory is None else agent_factory
-    binary_loader = _binary_content_from_path if binary_content_factory is None else binary_content_factory
-    agent = agent_builder(model_name=model_name, api_key=resolved_api_key)
-    prompt = f"{build_extraction_prompt()}\n\nNyni zpracuj prilozeny soubor."
-    response = agent.run_sync([prompt, binary_loader(validated_input)])
-    output = response.output
+    if session is not None:
+        return await session.extract_async(validated_input)
+
+    session = ExtractionSession(
+        model_name,
+        api_key=api_key,
+        env=env,
+        agent_factory=agent_factory,
+        binary_content_factory=binary_content_factory,
+    )
+    try:
+        return await session.extract_async(validated_input)
+    finally:
+        await session.aclose()
+
+
+def extract_many(
+    input_paths: Sequence[str | Path],
+    model_name: str,
+    **kwargs,
+) -> list[FileExtractionOutcome]:
+    return asyncio.run(extract_many_async(input_paths, model_name, **kwargs))
+
+
+async def extract_many_async(
+    input_paths: Sequence[str | Path],
+    model_name: str,
+    *,
+    api_key: str | None = None,
+    env: Mapping[str, str] | None = None,
+    agent_factory: Callable[..., object] | None = None,
+    binary_content_factory: Callable[[Path], object] | None = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    requests_per_minute: float | None = None,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    retry_backoff: float = DEFAULT_RETRY_BACKOFF_SECONDS,
+    sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    cache: CertificateExtractionCache | None = None,
+    bypass_cache: bool = False,
+    session: ExtractionSession | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+    use_text_layer: bool = True,
+    text_layer_parsers: Sequence[TextLayerParser] | None = None,
+) -> list[FileExtractionOutcome]:
+    concurrency = max(1, int(max_concurrency))
+    owns_session = session is None
+    semaphore = asyncio.Semaphore(concurrency)
+    limiter = (
+        TokenBucket(requests_per_minute / 60.0, capacity=concurrency, sleep=sleep)
+        if requests_per_minute
+        else None
+    )
+
+    # Wall time runs from when a file's own work starts: preparation for local results,
+    # the first acquired request slot for model calls. Time spent queued is queue_wait_ms.
+    work_started_at: dict[int, float] = {}
+    holding_slot: set[int] = set()
+
+    def finish(outcome: FileExtractionOutcome) -> None:
+        outcome.wall_time_ms = (time.perf_counter() - work_started_at[id(outcome)]) * 1000
+
+    @asynccontextmanager
+    async def request_slot(waiting: Sequence[FileExtractionOutcome]):
+        queued_at = time.perf_counter()
+        async with semaphore:
+            if limiter is not None:
+                await limiter.acquire()
+            acquired_at = time.perf_counter()
+            waited_ms = (acquired_at - queued_at) * 1000
+            for outcome in waiting:
+                outcome.queue_wait_ms += waited_ms
+                if id(outcome) not in holding_slot:
+                    holding_slot.add(id(outcome))
+                    work_started_at[id(outcome)] = acquired_at
+            yield
+
+    def store(outcome: FileExtractionOutcome, cache_key: str | None, result: ExtractionResult) -> None:
+        outcome.result = result
+        outcome.error = ""
+        finish(outcome)
+        if cache_key is not None:
+            try:
+                cache.put(cache_key, result)
+            except OSError:
+                pass
+
+    async def prepare(
+        outcome: FileExtractionOutcome,
+    ) -> tuple[FileExtractionOutcome, Path, str | None] | None:
+        work_started_at[id(outcome)] = time.perf_counter()
+        try:
+            validated_path = validate_input_file(outcome.source_file)
+        except (FileNotFoundError, ValueError) as exc:
+            outcome.error = str(exc)
+            finish(outcome)
+            return None
+
+        if use_text_layer:
+            local_result = await asyncio.to_thread(extract_text_layer, validated_path, text_layer_parsers)
+            if local_result is not None:
+                outcome.result = local_result
+                outcome.text_layer = True
+                finish(outcome)
+                return None
+
+        cache_key = None
+        if cache is not None:
+            cache_key = await asyncio.to_thread(cache.key_for, validated_path, model_name)
+            cached_result = None if bypass_cache else cache.get(cache_key)
+            if cached_result is not None:
+                outcome.result = cached_result
+                outcome.cache_hit = True
+                finish(outcome)
+                return None
+        return outcome, validated_path, cache_key
+
+    async def extract_one(outcome: FileExtractionOutcome, input_path: Path, cache_key: str | None) -> None:
+        for attempt in range(max_retries + 1):
+            outcome.attempts += 1
+            try:
+                async with request_slot([outcome]):
+                    result = await session.extract_async(input_path, outcome.usage)
+                store(outcome, cache_key, result)
+                return
+            except Exception as exc:
+                outcome.error = str(exc)
+                # Bad keys, invalid model output or unreadable files fail the same way every time.
+                if not is_transient_error(exc):
+                    break
+                if attempt < max_retries:
+                    await sleep(retry_backoff * (2 ** attempt))
+        finish(outcome)
+
+    async def extract_group(group: list[tuple[FileExtractionOutcome, Path, str | None]]) -> None:
+        if len(group) == 1:
+            await extract_one(*group[0])
+            return
+
+        group_outcomes = [outcome for outcome, _path, _cache_key in group]
+        error = ""
+        for attempt in range(max_retries + 1):
+            for outcome in group_outcomes:
+                outcome.attempts += 1
+            batch_usage = RequestUsage()
+            try:
+                async with request_slot(group_outcomes):
+                    results = await session.extract_batch_async(
+                        [path for _outcome, path, _cache_key in group],
+                        batch_usage,
+                    )
+            except Exception as exc:
+                for outcome, share in zip(group_outcomes, batch_usage.split(len(group))):
+                    outcome.usage.add(share)
+                # Only an answer that cannot be split per file is worth asking again in smaller parts;
+                # throttling backs off like a single request and anything else fails the group at once.
+                if is_malformed_response(exc):
+                    middle = len(group) // 2
+                    await asyncio.gather(extract_group(group[:middle]), extract_group(group[middle:]))
+                    return
+                error = str(exc)
+                if not is_transient_error(exc):
+                    break
+                if attempt < max_retries:
+                    await sleep(retry_backoff * (2 ** attempt))
+                continue
+
+            for (outcome, _path, cache_key), result, share in zip(group, results, batch_usage.split(len(group))):
+                outcome.usage.add(share)
+                store(outcome, cache_key, result)
+            return
+
+        for outcome in group_outcomes:
+            outcome.error = error
+            finish(outcome)
+
+    outcomes = [FileExtractionOutcome(source_file=str(path)) for path in input_paths]
+    prepared = [item for item in await asyncio.gather(*(prepare(outcome) for outcome in outcomes)) if item]
+    if not prepared:
+        return outcomes
+
+    if session is None:
+        try:
+            session = ExtractionSession(
+                model_name,
+                api_key=api_key,
+                env=env,
+                agent_factory=agent_factory,
+                binary_content_factory=binary_content_factory,
+                max_connections=concurrency,
+            )
+        except ValueError as exc:
+            for outcome, _path, _cache_key in prepared:
+                outcome.error = str(exc)
+                finish(outcome)
+            return outcomes
+
+    try:
+        if batch_size > 1:
+            groups = _pack_batches(prepared, batch_size, max_batch_bytes)
+        else:
+            groups = [[item] for item in prepared]
+        await asyncio.gather(*(extract_group(group) for group in groups))
+        return outcomes
+    finally:
+        if owns_session:
+            await session.aclose()
+
+
+def _coerce_extraction_output(output: object) -> ExtractionResult:
     if isinstance(output, ExtractionResult):
         return output
     if isinstance(output, Mapping):
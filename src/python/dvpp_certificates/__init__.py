@@ -11,6 +11,7 @@ from dvpp_certificates.normalization import (
     normalize_certificate_fields,
     normalize_date,
     normalize_forma,
+    normalize_many,
     normalize_topic,
     strip_titles,
 )
@@ -20,7 +21,13 @@ from dvpp_certificates.exporters import (
     export_records_to_tsv,
     resolve_excel_template_path,
 )
-from dvpp_certificates.raw_text_parser import parse_raw_text_batch
+from dvpp_certificates.raw_text_parser import (
+    RawTextLineError,
+    RawTextParseError,
+    iter_raw_text_records,
+    parse_raw_text_batch,
+    parse_raw_text_stream,
+)
 
 __all__ = [
     "CertificateRecord",
@@ -28,16 +35,21 @@ __all__ = [
     "ExportMetadata",
     "FORMA_CATALOG",
     "ExtractionBatch",
+    "RawTextLineError",
+    "RawTextParseError",
     "RecordOrigin",
     "TOPIC_CATALOG",
     "export_records_to_excel",
     "export_records_to_tsv",
     "WorkingRecord",
+    "iter_raw_text_records",
     "normalize_certificate_fields",
     "normalize_date",
     "normalize_forma",
+    "normalize_many",
     "normalize_topic",
     "parse_raw_text_batch",
+    "parse_raw_text_stream",
     "resolve_excel_template_path",
     "strip_titles",
 ]
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import threading
+import uuid
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Iterable, Mapping
+
+from dvpp_certificates.domain import ExtractionBatch, normalize_record_field
+
+if TYPE_CHECKING:
+    from dvpp_certificates.duplicate_index import CertificateDuplicateIndex
+
+
+DEFAULT_MAX_STORED_BATCHES = 8
+EDIT_OPERATIONS = ("set", "set_all", "delete")
+
+
+class BatchNotFoundError(LookupError):
+    pass
+
+
+class CertificateBatchStore:
+    def __init__(
+        self,
+        max_batches: int = DEFAULT_MAX_STORED_BATCHES,
+        duplicate_index: CertificateDuplicateIndex | None = None,
+    ):
+        self.max_batches = max(1, int(max_batches))
+        self.duplicate_index = duplicate_index
+        self._batches: OrderedDict[str, ExtractionBatch] = OrderedDict()
+        self._revisions: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def add(self, batch: ExtractionBatch) -> str:
+        batch_id = uuid.uuid4().hex
+        with self._lock:
+            self._batches[batch_id] = batch
+            self._revisions[batch_id] = 0
+            while len(self._batches) > self.max_batches:
+                evicted_id, _batch = self._batches.popitem(last=False)
+                self._revisions.pop(evicted_id, None)
+        if self.duplicate_index is not None:
+            self.duplicate_index.register(batch_id, batch.records)
+        return batch_id
+
+    def get(self, batch_id: str) -> ExtractionBatch:
+        with self._lock:
+            return self._get_locked(batch_id)
+
+    def revision(self, batch_id: str) -> int:
+        with self._lock:
+            self._get_locked(batch_id)
+            return self._revisions[batch_id]
+
+    def apply_edits(self, batch_id: str, edits: Iterable[Mapping[str, Any]]) -> dict[str, Any]:
+        with self._lock:
+            batch = self._get_locked(batch_id)
+            prepared = _prepare_edits(edits, len(batch.records))
+            applied = []
+            for operation, index, field_name, value in prepared:
+                if operation == "delete":
+                    batch.records.delete(index)
+                elif operation == "set_all":
+                    value = batch.records.set_column(field_name, value)
+                else:
+                    value = batch.records.set_value(index, field_name, value)
+                applied.append({"op": operation, "index": index, "field": field_name, "value": value})
+            self._revisions[batch_id] += 1
+            return {
+                "batch_id": batch_id,
+                "revision": self._revisions[batch_id],
+                "record_count": len(batch.records),
+                "applied": applied,
+            }
+
+    def duplicates(self, batch_id: str) -> list[dict[str, Any]]:
+        with self._lock:
+            records = self._get_locked(batch_id).records
+            if self.duplicate_index is None:
+                return []
+            return self.duplicate_index.find_duplicates(batch_id, records)
+
+    def discard(self, batch_id: str) -> bool:
+        with self._lock:
+            self._revisions.pop(batch_id, None)
+            return self._batches.pop(batch_id, None) is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._batches)
+
+    def _get_locked(self, batch_id: str) -> ExtractionBatch:
+        batch = self._batches.get(str(batch_id))
+        if batch is None:
+            raise BatchNotFoundError(f"Unknown certificate batch: {batch_id}")
+        self._batches.move_to_end(str(batch_id))
+        return batch
+
+
+def _prepare_edits(
+    edits: Iterable[Mapping[str, Any]],
+    record_count: int,
+) -> list[tuple[str, int | None, str | None, str | None]]:
+    # Validate the whole delta before touching the table so a bad edit leaves the batch unchanged.
+    if isinstance(edits, (str, bytes)) or not isinstance(edits, Iterable):
+        raise TypeError("edits must be a list")
+
+    prepared: list[tuple[str, int | None, str | None, str | None]] = []
+    for edit in edits:
+        if not isinstance(edit, Mapping):
+            raise TypeError("edit must be a mapping")
+        operation = edit.get("op", "set")
+        if operation not in EDIT_OPERATIONS:
+            raise ValueError(f"Unsupported edit operation: {operation}")
+
+        index = None
+        if operation != "set_all":
+            index = edit.get("index")
+            if isinstance(index, bool) or not isinstance(index, int) or not 0 <= index < record_count:
+                raise ValueError(f"Record index out of range: {index}")
+
+        if operation == "delete":
+            prepared.append((operation, index, None, None))
+            record_count -= 1
+            continue
+
+        field_name = edit.get("field")
+        value = normalize_record_field(str(field_name), edit.get("value", ""))
+        prepared.append((operation, index, str(field_name), value))
+    return prepared
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import json
 from copy import deepcopy
 from dataclasses import asdict, dataclass, field, replace
+from typing import Any, Iterable, Iterator, Mapping, NamedTuple
 from dvpp_certificates.normalization import (
     normalize_forma,
     normalize_pohlavi,
@@ -11,6 +13,46 @@ from dvpp_certificates.normalization import (
 )
 
 
+REQUIRED_RECORD_FIELDS = (
+    "surname",
+    "name",
+    "birth_date",
+    "course_name",
+    "completion_date",
+    "hours",
+)
+OPTIONAL_RECORD_FIELDS = (
+    "forma",
+    "pohlavi",
+    "sablona",
+    "topic",
+    "uncertainty_notes",
+)
+RECORD_FIELDS = REQUIRED_RECORD_FIELDS + OPTIONAL_RECORD_FIELDS
+ORIGIN_FIELDS = ("source_mode", "source_file", "raw_row", "model_name", "source_index")
+RECORD_FIELD_NORMALIZERS = {
+    "surname": lambda value: normalize_person_name(value, "surname"),
+    "name": lambda value: normalize_person_name(value, "name"),
+    "birth_date": lambda value: validate_record_date(value, "birth_date"),
+    "completion_date": lambda value: validate_record_date(value, "completion_date"),
+    "forma": normalize_forma,
+    "pohlavi": normalize_pohlavi,
+    "topic": normalize_topic,
+}
+
+
+def normalize_record_field(field_name: str, value: object) -> str:
+    if field_name not in RECORD_FIELDS:
+        raise ValueError(f"Unknown record field: {field_name}")
+    if not isinstance(value, str):
+        raise TypeError(f"{field_name} must be a string")
+    cleaned_value = value.strip()
+    if not cleaned_value and field_name in REQUIRED_RECORD_FIELDS:
+        raise ValueError(f"{field_name} must not be empty")
+    normalizer = RECORD_FIELD_NORMALIZERS.get(field_name)
+    return cleaned_value if normalizer is None else normalizer(cleaned_value)
+
+
 @dataclass(slots=True)
 class RecordOrigin:
     source_mode: str
@@ -36,48 +78,11 @@ class CertificateRecord:
     origin: RecordOrigin | None = None
 
     def __post_init__(self) -> None:
-        required_fields = (
-            "surname",
-            "name",
-            "birth_date",
-            "course_name",
-            "completion_date",
-            "hours",
-        )
-        for field_name in required_fields:
-            value = getattr(self, field_name)
-            if not isinstance(value, str):
-                raise TypeError(f"{field_name} must be a string")
-            cleaned_value = value.strip()
-            if not cleaned_value:
-                raise ValueError(f"{field_name} must not be empty")
-            setattr(self, field_name, cleaned_value)
-
-        if not isinstance(self.forma, str):
-            raise TypeError("forma must be a string")
-        if not isinstance(self.pohlavi, str):
-            raise TypeError("pohlavi must be a string")
-        if not isinstance(self.sablona, str):
-            raise TypeError("sablona must be a string")
-        if not isinstance(self.topic, str):
-            raise TypeError("topic must be a string")
-        if not isinstance(self.uncertainty_notes, str):
-            raise TypeError("uncertainty_notes must be a string")
+        for field_name in RECORD_FIELDS:
+            setattr(self, field_name, normalize_record_field(field_name, getattr(self, field_name)))
         if self.origin is not None and not isinstance(self.origin, RecordOrigin):
             raise TypeError("origin must be a RecordOrigin instance or None")
 
-        self.surname = normalize_person_name(self.surname, "surname")
-        self.name = normalize_person_name(self.name, "name")
-        self.birth_date = validate_record_date(self.birth_date, "birth_date")
-        self.completion_date = validate_record_date(
-            self.completion_date, "completion_date"
-        )
-        self.forma = normalize_forma(self.forma)
-        self.pohlavi = normalize_pohlavi(self.pohlavi)
-        self.sablona = self.sablona.strip()
-        self.topic = normalize_topic(self.topic)
-        self.uncertainty_notes = self.uncertainty_notes.strip()
-
 
 @dataclass(slots=True)
 class WorkingRecord:
@@ -144,11 +149,202 @@ class ExportMetadata:
             )
 
 
+class RecordRow(NamedTuple):
+    surname: str
+    name: str
+    birth_date: str
+    course_name: str
+    completion_date: str
+    hours: str
+    forma: str
+    pohlavi: str
+    sablona: str
+    topic: str
+    uncertainty_notes: str
+
+
+class RecordTable:
+    """Column store for extracted and working certificate values.
+
+    Working columns share the extracted lists until a column is first edited,
+    so unedited batches keep a single copy of every value.
+    """
+
+    __slots__ = ("_extracted", "_working", "_origins")
+
+    def __init__(self, records: Iterable[WorkingRecord | CertificateRecord] = ()):
+        self._extracted: dict[str, list[str]] = {name: [] for name in RECORD_FIELDS}
+        self._working: dict[str, list[str]] = dict(self._extracted)
+        self._origins: list[RecordOrigin | None] = []
+        for record in records:
+            self.append(record)
+
+    @classmethod
+    def from_payload(cls, payload: Iterable[Mapping[str, Any]]) -> RecordTable:
+        table = cls()
+        for item in payload:
+            if not isinstance(item, Mapping):
+                raise TypeError("record must be a WorkingRecord or mapping")
+            extracted = item.get("extracted_record", item.get("working_record", item))
+            working = item.get("working_record", extracted)
+            table._append_values(
+                _normalize_payload_values(extracted),
+                _normalize_payload_values(working) if working is not extracted else None,
+                _coerce_origin(extracted.get("origin")),
+            )
+        return table
+
+    def __len__(self) -> int:
+        return len(self._origins)
+
+    def __iter__(self) -> Iterator[WorkingRecord]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def __getitem__(self, index: int) -> WorkingRecord:
+        index = range(len(self))[index]
+        record = object.__new__(WorkingRecord)
+        record.extracted_record = self._build_record(self._extracted, index)
+        record.working_record = self._build_record(self._working, index)
+        return record
+
+    def append(self, record: WorkingRecord | CertificateRecord) -> None:
+        if isinstance(record, WorkingRecord):
+            extracted, working = record.extracted_record, record.working_record
+        elif isinstance(record, CertificateRecord):
+            extracted, working = record, None
+        else:
+            raise TypeError("records must contain WorkingRecord or CertificateRecord items")
+        self._append_values(
+            [getattr(extracted, name) for name in RECORD_FIELDS],
+            None if working is None else [getattr(working, name) for name in RECORD_FIELDS],
+            extracted.origin,
+        )
+
+    def value(self, index: int, field_name: str, *, working: bool = True) -> str:
+        columns = self._working if working else self._extracted
+        return columns[field_name][index]
+
+    def origin(self, index: int) -> RecordOrigin | None:
+        return self._origins[index]
+
+    def set_value(self, index: int, field_name: str, value: object) -> str:
+        normalized = normalize_record_field(field_name, value)
+        self._editable_column(field_name)[index] = normalized
+        return normalized
+
+    def set_column(self, field_name: str, value: object) -> str:
+        normalized = normalize_record_field(field_name, value)
+        self._working[field_name] = [normalized] * len(self)
+        return normalized
+
+    def delete(self, index: int) -> None:
+        index = range(len(self))[index]
+        for name in RECORD_FIELDS:
+            extracted_column = self._extracted[name]
+            working_column = self._working[name]
+            del extracted_column[index]
+            if working_column is not extracted_column:
+                del working_column[index]
+        del self._origins[index]
+
+    def edited_fields(self, index: int) -> list[str]:
+        return [
+            name
+            for name in RECORD_FIELDS
+            if self._working[name] is not self._extracted[name]
+            and self._working[name][index] != self._extracted[name][index]
+        ]
+
+    def working_rows(self) -> Iterator[RecordRow]:
+        return map(RecordRow._make, zip(*(self._working[name] for name in RECORD_FIELDS)))
+
+    def to_payload(self) -> list[dict[str, Any]]:
+        origins = [_origin_payload(origin) for origin in self._origins]
+        extracted_rows = zip(*(self._extracted[name] for name in RECORD_FIELDS))
+        working_rows = zip(*(self._working[name] for name in RECORD_FIELDS))
+        return [
+            {
+                "extracted_record": {**dict(zip(RECORD_FIELDS, extracted)), "origin": origin},
+                "working_record": {
+                    **dict(zip(RECORD_FIELDS, working)),
+                    "origin": None if origin is None else dict(origin),
+                },
+            }
+            for extracted, working, origin in zip(extracted_rows, working_rows, origins)
+        ]
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_payload(), ensure_ascii=False)
+
+    def _editable_column(self, field_name: str) -> list[str]:
+        column = self._working[field_name]
+        if column is self._extracted[field_name]:
+            column = self._working[field_name] = list(column)
+        return column
+
+    def _append_values(
+        self,
+        extracted_values: list[str],
+        working_values: list[str] | None,
+        origin: RecordOrigin | None,
+    ) -> None:
+        for name, extracted_value, working_value in zip(
+            RECORD_FIELDS,
+            extracted_values,
+            extracted_values if working_values is None else working_values,
+        ):
+            extracted_column = self._extracted[name]
+            working_column = self._working[name]
+            extracted_column.append(extracted_value)
+            if working_column is not extracted_column:
+                working_column.append(working_value)
+            elif working_value != extracted_value:
+                self._working[name] = extracted_column[:-1] + [working_value]
+        self._origins.append(origin)
+
+    def _build_record(self, columns: dict[str, list[str]], index: int) -> CertificateRecord:
+        origin = self._origins[index]
+        record = object.__new__(CertificateRecord)
+        for name in RECORD_FIELDS:
+            setattr(record, name, columns[name][index])
+        record.origin = None if origin is None else replace(origin)
+        return record
+
+
+def _normalize_payload_values(payload: Mapping[str, Any]) -> list[str]:
+    unknown_fields = set(payload) - set(RECORD_FIELDS) - {"origin"}
+    if unknown_fields:
+        raise TypeError(f"Unexpected record fields: {', '.join(sorted(unknown_fields))}")
+    for name in REQUIRED_RECORD_FIELDS:
+        if name not in payload:
+            raise TypeError(f"Missing required field: {name}")
+    return [normalize_record_field(name, payload.get(name, "")) for name in RECORD_FIELDS]
+
+
+def _coerce_origin(origin: object) -> RecordOrigin | None:
+    if origin is None or isinstance(origin, RecordOrigin):
+        return origin
+    if isinstance(origin, Mapping):
+        return RecordOrigin(**dict(origin))
+    raise TypeError("origin must be a RecordOrigin instance or None")
+
+
+def _origin_payload(origin: RecordOrigin | None) -> dict[str, Any] | None:
+    if origin is None:
+        return None
+    return {name: getattr(origin, name) for name in ORIGIN_FIELDS}
+
+
 @dataclass(slots=True)
 class ExtractionBatch:
     input_mode: str
-    records: list[WorkingRecord] = field(default_factory=list)
+    records: RecordTable = field(default_factory=RecordTable)
     source_folder: str = ""
     warnings: list[str] = field(default_factory=list)
     errors: list[str] = field(default_factory=list)
     export_metadata: ExportMetadata = field(default_factory=ExportMetadata)
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.records, RecordTable):
+            self.records = RecordTable(self.records)
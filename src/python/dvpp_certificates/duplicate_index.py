@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import unicodedata
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from dvpp_certificates.domain import RecordTable
+
+
+DUPLICATE_INDEX_FILENAME = "duplicate_index.json"
+DUPLICATE_INDEX_VERSION = 1
+DEFAULT_MAX_INDEXED_CERTIFICATES = 100_000
+
+
+def _key_part(value: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", value.casefold())
+    folded = "".join(character for character in decomposed if not unicodedata.combining(character))
+    return " ".join(folded.split())
+
+
+def _hash_key(*parts: str) -> str | None:
+    key_parts = [_key_part(part) for part in parts]
+    # Records with a blank identity field cannot be told apart, so they are never indexed.
+    if not all(key_parts):
+        return None
+    # Only digests are persisted, so the index never stores names or birth dates in clear text.
+    material = "\x1f".join(key_parts)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()[:32]
+
+
+def person_key(surname: str, name: str, birth_date: str) -> str | None:
+    return _hash_key(surname, name, birth_date)
+
+
+def certificate_key(surname: str, name: str, birth_date: str, course_name: str, completion_date: str) -> str | None:
+    return _hash_key(surname, name, birth_date, course_name, completion_date)
+
+
+class CertificateDuplicateIndex:
+    def __init__(
+        self,
+        cache_dir: str | Path,
+        max_certificates: int = DEFAULT_MAX_INDEXED_CERTIFICATES,
+    ):
+        self.index_path = Path(cache_dir) / DUPLICATE_INDEX_FILENAME
+        self.max_certificates = max_certificates
+        self._certificates: dict[str, dict[str, Any]] | None = None
+        self._persons: dict[str, str] | None = None
+        self._lock = threading.Lock()
+
+    def register(self, batch_id: str, records: RecordTable) -> int:
+        imported_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        added = 0
+        with self._lock:
+            certificates, persons = self._load()
+            for index, row in enumerate(records.working_rows()):
+                row_certificate_key = certificate_key(
+                    row.surname, row.name, row.birth_date, row.course_name, row.completion_date
+                )
+                row_person_key = person_key(row.surname, row.name, row.birth_date)
+                if row_person_key is not None:
+                    persons.setdefault(row_person_key, batch_id)
+                if row_certificate_key is None or row_certificate_key in certificates:
+                    continue
+                origin = records.origin(index)
+                certificates[row_certificate_key] = {
+                    "batch_id": batch_id,
+                    "source_file": "" if origin is None else origin.source_file,
+                    "source_index": index,
+                    "imported_at": imported_at,
+                }
+                added += 1
+            self._evict()
+            try:
+                self._save()
+            except OSError:
+                # The in-memory index keeps working for this session even if the cache dir is read-only.
+                pass
+        return added
+
+    def find_duplicates(self, batch_id: str | None, records: RecordTable) -> list[dict[str, Any]]:
+        duplicates: list[dict[str, Any]] = []
+        first_in_batch: dict[str, int] = {}
+        with self._lock:
+            certificates, persons = self._load()
+            for index, row in enumerate(records.working_rows()):
+                row_certificate_key = certificate_key(
+                    row.surname, row.name, row.birth_date, row.course_name, row.completion_date
+                )
+                if row_certificate_key is not None:
+                    earlier_index = first_in_batch.setdefault(row_certificate_key, index)
+                    if earlier_index != index:
+                        duplicates.append({"index": index, "scope": "batch", "duplicate_of": {"index": earlier_index}})
+                        continue
+
+                    entry = certificates.get(row_certificate_key)
+                    if entry is not None and entry["batch_id"] != batch_id:
+                        duplicates.append({"index": index, "scope": "history", "duplicate_of": dict(entry)})
+                        continue
+
+                row_person_key = person_key(row.surname, row.name, row.birth_date)
+                known_in = None if row_person_key is None else persons.get(row_person_key)
+                if known_in is not None and known_in != batch_id:
+                    duplicates.append({"index": index, "scope": "person", "duplicate_of": {"batch_id": known_in}})
+        return duplicates
+
+    def clear(self) -> None:
+        with self._lock:
+            self._certificates, self._persons = {}, {}
+            self._save()
+
+    def _evict(self) -> None:
+        # Dicts keep insertion order, so the oldest registrations go first.
+        for entries in (self._certificates, self._persons):
+            overflow = len(entries) - self.max_certificates
+            for stale_key in list(entries)[:max(0, overflow)]:
+                del entries[stale_key]
+
+    def _save(self) -> None:
+        payload = json.dumps(
+            {
+                "version": DUPLICATE_INDEX_VERSION,
+                "certificates": self._certificates,
+                "persons": self._persons,
+            },
+            ensure_ascii=False,
+        )
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.index_path.with_name(f"{self.index_path.name}.{os.getpid()}.tmp")
+        temp_path.write_text(payload, encoding="utf-8")
+        os.replace(temp_path, self.index_path)
+
+    def _load(self) -> tuple[dict[str, dict[str, Any]], dict[str, str]]:
+        if self._certificates is None or self._persons is None:
+            self._certificates, self._persons = {}, {}
+            try:
+                raw_data = json.loads(self.index_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                raw_data = {}
+            if isinstance(raw_data, dict) and raw_data.get("version") == DUPLICATE_INDEX_VERSION:
+                self._certificates = dict(raw_data.get("certificates") or {})
+                self._persons = dict(raw_data.get("persons") or {})
+        return self._certificates, self._persons
@@ -2,17 +2,37 @@ from __future__ import annotations
 
 import csv
 import io
+import re
 import shutil
-from dataclasses import asdict
+from copy import copy
+from datetime import datetime
 from pathlib import Path
-from typing import Any, Mapping
-
-from dvpp_certificates.domain import CertificateRecord, ExportMetadata, RecordOrigin, WorkingRecord
+from typing import Any, Iterable, Mapping
+
+from dvpp_certificates.domain import (
+    CertificateRecord,
+    ExportMetadata,
+    RECORD_FIELDS,
+    RecordRow,
+    RecordTable,
+    WorkingRecord,
+)
 
 
 DEFAULT_EXCEL_TEMPLATE_PATH = (
     r"D:\JAK2024\Dokumenty\Evidence_podpor_poskytnutych_ucastnikum_vzdelavani_MS_ZS_upravene_DVPP.xlsx"
 )
+EXCEL_SHEET_NAME = "podpory"
+EXCEL_DATA_START_ROW = 11
+EXCEL_DATA_MIN_END_ROW = 500
+EXCEL_DATA_FIRST_COLUMN = 2
+EXCEL_DATA_LAST_COLUMN = 10
+EXCEL_DATE_FORMAT = "DD.MM.YYYY"
+EXCEL_MACRO_SUFFIXES = (".xlsm", ".xltm")
+# openpyxl drops drawings and form controls from the template, so it is opt-in.
+DEFAULT_WORKBOOK_WRITER = "xlwings"
+WORKBOOK_WRITER_NAMES = ("openpyxl", "xlwings")
+EXCEL_DATE_RE = re.compile(r"^\d{2}\.\d{2}\.\d{4}$")
 ESF_HEADER = [
     "Jmeno_Osoby",
     "Prijmeni_Osoby",
@@ -88,11 +108,11 @@ def resolve_excel_template_path(template_path: str | None) -> str:
 
 
 def export_records_to_tsv(
-    records: list[WorkingRecord | Mapping[str, Any]],
+    records: RecordTable | list[WorkingRecord | Mapping[str, Any]],
     *,
     output_path: str | None = None,
 ) -> dict[str, str | None]:
-    lines = [_format_tsv_row(_coerce_working_record(record)) for record in records]
+    lines = [_format_tsv_row(record) for record in _coerce_working_records(records)]
     content = "\n".join(lines)
 
     if output_path:
@@ -105,7 +125,7 @@ def export_records_to_tsv(
 
 
 def export_records_to_esf_csv(
-    records: list[WorkingRecord | Mapping[str, Any]],
+    records: RecordTable | list[WorkingRecord | Mapping[str, Any]],
     *,
     export_metadata: ExportMetadata | Mapping[str, Any] | None = None,
     output_path: str | None = None,
@@ -120,8 +140,7 @@ def export_records_to_esf_csv(
     writer.writerow(ESF_HEADER)
 
     seen_people = set()
-    for record in records:
-        working_record = _coerce_working_record(record)
+    for working_record in _coerce_working_records(records):
         person_key = _person_identity_key(working_record)
         if person_key in seen_people:
             continue
@@ -141,12 +160,12 @@ def export_records_to_esf_csv(
 
 
 def export_records_to_excel(
-    records: list[WorkingRecord | Mapping[str, Any]],
+    records: RecordTable | list[WorkingRecord | Mapping[str, Any]],
     export_metadata: ExportMetadata | Mapping[str, Any],
     *,
     template_path: str | None = None,
     output_path: str | None = None,
-    workbook_writer=None,
+    workbook_writer=DEFAULT_WORKBOOK_WRITER,
 ) -> str:
     metadata = _coerce_export_metadata(export_metadata)
 
@@ -158,12 +177,27 @@ def export_records_to_excel(
     resolved_output.parent.mkdir(parents=True, exist_ok=True)
     shutil.copy2(resolved_template, resolved_output)
 
-    records_to_export = [_coerce_working_record(record) for record in records]
-    writer = _write_records_with_xlwings if workbook_writer is None else workbook_writer
+    records_to_export = list(_coerce_working_records(records))
+    writer = _resolve_workbook_writer(workbook_writer)
     writer(str(resolved_output), records_to_export, metadata)
     return str(resolved_output)
 
 
+def _resolve_workbook_writer(workbook_writer):
+    if callable(workbook_writer):
+        return workbook_writer
+    writers = {
+        "openpyxl": _write_records_with_openpyxl,
+        "xlwings": _write_records_with_xlwings,
+    }
+    writer_name = workbook_writer or DEFAULT_WORKBOOK_WRITER
+    if writer_name not in writers:
+        raise ValueError(
+            f"Unknown Excel workbook writer: {writer_name} (expected one of {', '.join(WORKBOOK_WRITER_NAMES)})"
+        )
+    return writers[writer_name]
+
+
 def _resolve_excel_output_path(template_path: Path, output_path: str | None) -> Path:
     if output_path:
         return Path(output_path).expanduser()
@@ -180,36 +214,44 @@ def _coerce_export_metadata(
     return ExportMetadata(**dict(export_metadata))
 
 
-def _coerce_working_record(record: WorkingRecord | Mapping[str, Any]) -> CertificateRecord:
+def _coerce_working_records(
+    records: RecordTable | Iterable[WorkingRecord | Mapping[str, Any]],
+) -> Iterable[CertificateRecord | RecordRow]:
+    if isinstance(records, RecordTable):
+        return records.working_rows()
+
+    records = list(records)
+    if all(isinstance(record, WorkingRecord) for record in records):
+        return [record.working_record for record in records]
+    return RecordTable.from_payload(_working_payload(record) for record in records).working_rows()
+
+
+def _working_payload(record: WorkingRecord | Mapping[str, Any]) -> Mapping[str, Any]:
     if isinstance(record, WorkingRecord):
-        return record.working_record
+        return {
+            "working_record": {name: getattr(record.working_record, name) for name in RECORD_FIELDS}
+        }
     if not isinstance(record, Mapping):
         raise TypeError("record must be a WorkingRecord or mapping")
-
-    payload = dict(record.get("working_record", record))
-    origin_payload = payload.get("origin")
-    if isinstance(origin_payload, Mapping):
-        payload["origin"] = RecordOrigin(**dict(origin_payload))
-    return CertificateRecord(**payload)
+    return {"working_record": record.get("working_record", record)}
 
 
-def _format_tsv_row(record: CertificateRecord) -> str:
-    payload = asdict(record)
+def _format_tsv_row(record: CertificateRecord | RecordRow) -> str:
     fields = [
-        payload.get("surname", ""),
-        payload.get("name", ""),
-        payload.get("birth_date", ""),
-        payload.get("sablona", ""),
-        payload.get("course_name", ""),
-        payload.get("completion_date", ""),
-        payload.get("hours", ""),
-        payload.get("forma", ""),
-        payload.get("topic", ""),
+        record.surname,
+        record.name,
+        record.birth_date,
+        record.sablona,
+        record.course_name,
+        record.completion_date,
+        record.hours,
+        record.forma,
+        record.topic,
     ]
     return "\t".join(str(field) for field in fields)
 
 
-def _format_esf_row(record: CertificateRecord, export_metadata: ExportMetadata) -> list[str]:
+def _format_esf_row(record: CertificateRecord | RecordRow, export_metadata: ExportMetadata) -> list[str]:
     row = ESF_DEFAULT_ROW.copy()
     row[0] = record.name
     row[1] = record.surname
@@ -233,7 +275,7 @@ def _person_identity_key(record: CertificateRecord) -> tuple[str, str, str]:
 
 def _write_records_with_xlwings(
     output_path: str,
-    records: list[CertificateRecord],
+    records: list[CertificateRecord | RecordRow],
     export_metadata: ExportMetadata,
 ) -> None:
     import xlwings as xw
@@ -242,7 +284,7 @@ def _write_records_with_xlwings(
     book = None
     try:
         book = app.books.open(output_path)
-        sheet = book.sheets["podpory"]
+        sheet = book.sheets[EXCEL_SHEET_NAME]
         _write_records_to_sheet(sheet, records, export_metadata)
         book.save()
     finally:
@@ -253,7 +295,7 @@ def _write_records_with_xlwings(
 
 def _write_records_to_sheet(
     sheet,
-    records: list[CertificateRecord],
+    records: list[CertificateRecord | RecordRow],
     export_metadata: ExportMetadata,
 ) -> None:
     if export_metadata.fill_header:
@@ -261,22 +303,98 @@ def _write_records_to_sheet(
         sheet.range("I6").value = export_metadata.zor_number
         sheet.range("D7").value = export_metadata.recipient_name
 
-    data_start_row = 11
-    data_end_row = max(data_start_row + len(records) - 1, 500)
+    data_start_row = EXCEL_DATA_START_ROW
+    data_end_row = max(data_start_row + len(records) - 1, EXCEL_DATA_MIN_END_ROW)
     sheet.range(f"B{data_start_row}:J{data_end_row}").clear_contents()
 
     if records:
-        sheet.range(f"B{data_start_row}").value = [
-            [
-                record.surname,
-                record.name,
-                record.sablona,
-                record.course_name,
-                record.completion_date,
-                record.hours,
-                record.forma,
-                record.topic,
-                "",
-            ]
-            for record in records
+        sheet.range(f"B{data_start_row}").value = [_excel_row_values(record) for record in records]
+
+
+def _excel_row_values(record: CertificateRecord | RecordRow) -> list[str]:
+    return [
+        record.surname,
+        record.name,
+        record.sablona,
+        record.course_name,
+        record.completion_date,
+        record.hours,
+        record.forma,
+        record.topic,
+        "",
+    ]
+
+
+def _excel_cell_value(value: str):
+    # Mirror what Excel does when the xlwings writer types the same strings into the sheet.
+    if not value:
+        return None
+    if value.isdigit():
+        return int(value)
+    if EXCEL_DATE_RE.fullmatch(value):
+        try:
+            return datetime.strptime(value, "%d.%m.%Y")
+        except ValueError:
+            return value
+    return value
+
+
+def _write_records_with_openpyxl(
+    output_path: str,
+    records: list[CertificateRecord | RecordRow],
+    export_metadata: ExportMetadata,
+) -> None:
+    from openpyxl import load_workbook
+    from openpyxl.cell.cell import MergedCell
+
+    workbook = load_workbook(
+        output_path,
+        keep_vba=Path(output_path).suffix.lower() in EXCEL_MACRO_SUFFIXES,
+        keep_links=True,
+    )
+    try:
+        sheet = workbook[EXCEL_SHEET_NAME]
+        if export_metadata.fill_header:
+            sheet["D6"] = export_metadata.project_number
+            sheet["I6"] = export_metadata.zor_number
+            sheet["D7"] = export_metadata.recipient_name
+
+        data_start_row = EXCEL_DATA_START_ROW
+        data_end_row = max(data_start_row + len(records) - 1, EXCEL_DATA_MIN_END_ROW)
+        for row in sheet.iter_rows(
+            min_row=data_start_row,
+            max_row=min(data_end_row, sheet.max_row),
+            min_col=EXCEL_DATA_FIRST_COLUMN,
+            max_col=EXCEL_DATA_LAST_COLUMN,
+        ):
+            for cell in row:
+                if not isinstance(cell, MergedCell):
+                    cell.value = None
+
+        style_row = [
+            sheet.cell(row=data_start_row, column=column)
+            for column in range(EXCEL_DATA_FIRST_COLUMN, EXCEL_DATA_LAST_COLUMN + 1)
         ]
+        for row_index, record in enumerate(records, start=data_start_row):
+            for template_cell, value in zip(style_row, _excel_row_values(record)):
+                cell = sheet.cell(row=row_index, column=template_cell.column)
+                if isinstance(cell, MergedCell):
+                    continue
+                if not cell.has_style and template_cell.has_style:
+                    cell._style = copy(template_cell._style)
+                cell.value = _excel_cell_value(value)
+                if isinstance(cell.value, datetime) and cell.number_format == "General":
+                    cell.number_format = EXCEL_DATE_FORMAT
+
+        _extend_data_validations(sheet, data_start_row, data_end_row)
+        workbook.save(output_path)
+    finally:
+        workbook.close()
+
+
+def _extend_data_validations(sheet, data_start_row: int, data_end_row: int) -> None:
+    # Template validations usually stop at the preformatted block; stretch them over every written row.
+    for validation in sheet.data_validations.dataValidation:
+        for cell_range in validation.sqref.ranges:
+            if cell_range.min_row <= data_start_row <= cell_range.max_row < data_end_row:
+                cell_range.expand(down=data_end_row - cell_range.max_row)
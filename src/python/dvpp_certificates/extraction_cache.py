@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from dataclasses import asdict
+from functools import lru_cache
+from pathlib import Path
+
+from dvpp_cert_extraction import ExtractionResult, build_extraction_prompt
+from dvpp_certificates.domain import CertificateRecord
+
+
+EXTRACTION_CACHE_VERSION = 1
+DEFAULT_EXTRACTION_CACHE_MAX_BYTES = 32 * 1024 * 1024
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+@lru_cache(maxsize=1)
+def prompt_fingerprint() -> str:
+    return hashlib.sha256(build_extraction_prompt().encode("utf-8")).hexdigest()
+
+
+def file_digest(path: str | Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class CertificateExtractionCache:
+    def __init__(
+        self,
+        cache_dir: str | Path,
+        max_bytes: int = DEFAULT_EXTRACTION_CACHE_MAX_BYTES,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def key_for(self, path: str | Path, model_name: str) -> str:
+        material = f"v{EXTRACTION_CACHE_VERSION}:{file_digest(path)}:{model_name}:{prompt_fingerprint()}"
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> ExtractionResult | None:
+        entry_path = self._entry_path(key)
+        try:
+            payload = json.loads(entry_path.read_text(encoding="utf-8"))
+            result = ExtractionResult(
+                certificates=[CertificateRecord(**item) for item in payload["certificates"]]
+            )
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError, KeyError):
+            self._discard(entry_path)
+            return None
+
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+        return result
+
+    def put(self, key: str, result: ExtractionResult) -> None:
+        certificates = []
+        for certificate in result.certificates:
+            item = asdict(certificate)
+            item.pop("origin", None)
+            certificates.append(item)
+        payload = json.dumps({"certificates": certificates}, ensure_ascii=False)
+
+        entry_path = self._entry_path(key)
+        with self._lock:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            temp_path = entry_path.with_name(f"{entry_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            temp_path.write_text(payload, encoding="utf-8")
+            os.replace(temp_path, entry_path)
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            for entry_path in self.cache_dir.glob("*.json"):
+                self._discard(entry_path)
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _evict(self) -> None:
+        entries = []
+        total_size = 0
+        for entry_path in self.cache_dir.glob("*.json"):
+            try:
+                stat = entry_path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry_path))
+            total_size += stat.st_size
+
+        entries.sort()
+        for _mtime, size, entry_path in entries:
+            if total_size <= self.max_bytes:
+                break
+            self._discard(entry_path)
+            total_size -= size
+
+    @staticmethod
+    def _discard(entry_path: Path) -> None:
+        try:
+            entry_path.unlink()
+        except OSError:
+            pass
@@ -1,13 +1,57 @@
 from __future__ import annotations
 
-from typing import Mapping
+from typing import TYPE_CHECKING, Mapping, Sequence
 
-from dvpp_cert_extraction import ExtractionResult, extract_certificates
+from dvpp_cert_extraction import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_MAX_RETRIES,
+    ExtractionResult,
+    ExtractionSession,
+    FileExtractionOutcome,
+    extract_certificates,
+    extract_many,
+)
+
+if TYPE_CHECKING:
+    from dvpp_certificates.extraction_cache import CertificateExtractionCache
 
 
 class GeminiCertificateImporter:
-    def __init__(self, extractor=extract_certificates):
+    def __init__(
+        self,
+        extractor=extract_certificates,
+        batch_extractor=extract_many,
+        cache: CertificateExtractionCache | None = None,
+        session_factory=ExtractionSession,
+    ):
         self.extractor = extractor
+        self.batch_extractor = batch_extractor
+        self.cache = cache
+        self.session_factory = session_factory
+        self._sessions: dict[tuple[str, str | None], ExtractionSession] = {}
+
+    def session_for(
+        self,
+        model_name: str,
+        *,
+        api_key: str | None = None,
+        env: Mapping[str, str] | None = None,
+    ) -> ExtractionSession:
+        session_key = (model_name, api_key)
+        session = self._sessions.get(session_key)
+        if session is None:
+            session = self.session_factory(model_name, api_key=api_key, env=env)
+            self._sessions[session_key] = session
+        return session
+
+    def close(self) -> None:
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+        for session in sessions:
+            close = getattr(session, "close", None)
+            if close is not None:
+                close()
 
     def import_file(
         self,
@@ -20,6 +64,33 @@ class GeminiCertificateImporter:
         return self.extractor(
             file_path,
             model_name,
+            session=self.session_for(model_name, api_key=api_key, env=env),
+        )
+
+    def import_files(
+        self,
+        file_paths: Sequence[str],
+        *,
+        model_name: str,
+        api_key: str | None = None,
+        env: Mapping[str, str] | None = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        requests_per_minute: float | None = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        bypass_cache: bool = False,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        use_text_layer: bool = True,
+    ) -> list[FileExtractionOutcome]:
+        return self.batch_extractor(
+            list(file_paths),
+            model_name,
             api_key=api_key,
             env=env,
+            max_concurrency=max_concurrency,
+            requests_per_minute=requests_per_minute,
+            max_retries=max_retries,
+            cache=self.cache,
+            bypass_cache=bypass_cache,
+            batch_size=batch_size,
+            use_text_layer=use_text_layer,
         )
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 from datetime import datetime
+from functools import lru_cache
+from itertools import repeat
 import re
-from typing import TYPE_CHECKING, Mapping
+from typing import TYPE_CHECKING, Iterable, Mapping
 import unicodedata
 
 if TYPE_CHECKING:
@@ -81,9 +83,12 @@ TITLE_PATTERNS = (
     r"Ph\.D\.",
     r"DiS\.",
 )
-LEADING_TITLES_RE = re.compile(rf"^(?:{'|'.join(TITLE_PATTERNS)})\s*")
-TRAILING_TITLES_RE = re.compile(rf"\s*,?\s*(?:{'|'.join(TITLE_PATTERNS)})$")
+TITLES_RE = re.compile(
+    rf"^(?:(?:{'|'.join(TITLE_PATTERNS)})[\s,]*)+|[\s,]*(?:(?:{'|'.join(TITLE_PATTERNS)})[\s,]*)+$"
+)
 NORMALIZED_DATE_RE = re.compile(r"^\d{2}\.\d{2}\.\d{4}$")
+WHITESPACE_RE = re.compile(r"\s+")
+NORMALIZATION_CACHE_SIZE = 4096
 
 
 def _normalize_topic_key(value: str) -> str:
@@ -92,7 +97,7 @@ def _normalize_topic_key(value: str) -> str:
         character for character in normalized if not unicodedata.combining(character)
     )
     ascii_dash = without_diacritics.replace("–", "-").replace("—", "-")
-    collapsed = re.sub(r"\s+", " ", ascii_dash)
+    collapsed = WHITESPACE_RE.sub(" ", ascii_dash)
     return collapsed.strip()
 
 
@@ -103,21 +108,9 @@ for topic_alias, topic_name in TOPIC_ALIASES.items():
     TOPIC_LOOKUP[_normalize_topic_key(topic_alias)] = topic_name
 
 
+@lru_cache(maxsize=NORMALIZATION_CACHE_SIZE)
 def strip_titles(value: str) -> str:
-    cleaned = value.strip()
-    while cleaned:
-        updated = LEADING_TITLES_RE.sub("", cleaned).strip(" ,")
-        if updated == cleaned:
-            break
-        cleaned = updated
-
-    while cleaned:
-        updated = TRAILING_TITLES_RE.sub("", cleaned).strip(" ,")
-        if updated == cleaned:
-            break
-        cleaned = updated
-
-    return cleaned
+    return TITLES_RE.sub("", value.strip().strip(" ,")).strip(" ,")
 
 
 def normalize_person_name(value: str, field_name: str) -> str:
@@ -127,10 +120,13 @@ def normalize_person_name(value: str, field_name: str) -> str:
     return cleaned
 
 
+@lru_cache(maxsize=NORMALIZATION_CACHE_SIZE)
 def normalize_date(value: str) -> str:
     stripped = value.strip()
     has_uncertainty_marker = stripped.endswith("?")
     date_value = stripped[:-1].strip() if has_uncertainty_marker else stripped
+    if NORMALIZED_DATE_RE.fullmatch(date_value):
+        return f"{date_value}?" if has_uncertainty_marker else date_value
 
     normalized = date_value
     for date_format in DATE_FORMATS:
@@ -146,6 +142,7 @@ def normalize_date(value: str) -> str:
     return normalized
 
 
+@lru_cache(maxsize=NORMALIZATION_CACHE_SIZE)
 def validate_record_date(value: str, field_name: str) -> str:
     normalized = normalize_date(value)
     date_value = normalized[:-1] if normalized.endswith("?") else normalized
@@ -158,6 +155,7 @@ def validate_record_date(value: str, field_name: str) -> str:
     return normalized
 
 
+@lru_cache(maxsize=NORMALIZATION_CACHE_SIZE)
 def normalize_topic(value: str) -> str:
     stripped = value.strip()
     if not stripped:
@@ -165,6 +163,7 @@ def normalize_topic(value: str) -> str:
     return TOPIC_LOOKUP.get(_normalize_topic_key(stripped), "")
 
 
+@lru_cache(maxsize=NORMALIZATION_CACHE_SIZE)
 def normalize_forma(value: str) -> str:
     stripped = value.strip()
     if not stripped:
@@ -172,6 +171,7 @@ def normalize_forma(value: str) -> str:
     return stripped if stripped in FORMA_WHITELIST else ""
 
 
+@lru_cache(maxsize=NORMALIZATION_CACHE_SIZE)
 def normalize_pohlavi(value: str) -> str:
     stripped = value.strip()
     if not stripped:
@@ -216,3 +216,26 @@ def normalize_certificate_fields(
         "origin": origin,
     }
     return CertificateRecord(**payload)
+
+
+def normalize_many(
+    raw_records: Iterable[Mapping[str, object]],
+    origins: Iterable[RecordOrigin | None] | None = None,
+) -> list:
+    origin_values = repeat(None) if origins is None else origins
+    return [
+        normalize_certificate_fields(raw_record, origin=origin)
+        for raw_record, origin in zip(raw_records, origin_values)
+    ]
+
+
+def clear_normalization_caches() -> None:
+    for cached in (
+        strip_titles,
+        normalize_date,
+        validate_record_date,
+        normalize_topic,
+        normalize_forma,
+        normalize_pohlavi,
+    ):
+        cached.cache_clear()
@@ -1,12 +1,50 @@
 from __future__ import annotations
 
-from dvpp_certificates.domain import ExtractionBatch, RecordOrigin, WorkingRecord
+import io
+import os
+from collections import deque
+from concurrent.futures import Executor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from itertools import islice
+from typing import Callable, Iterable, Iterator, TextIO, TypeVar, Union
+
+from dvpp_certificates.domain import CertificateRecord, ExtractionBatch, RecordOrigin, RecordTable
 from dvpp_certificates.normalization import normalize_certificate_fields
 
 
 LEGACY_COLUMN_COUNT = 8
 CURRENT_COLUMN_COUNT = 9
 TRIMMED_LEGACY_COLUMN_COUNT = 6
+RAW_TEXT_CHUNK_SIZE = 1000
+MAX_PENDING_CHUNKS = 8
+MAX_REPORTED_LINE_ERRORS = 20
+
+RawTextSource = Union[str, os.PathLike, TextIO, Iterable[str]]
+RawTextRow = tuple[int, int, str]
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+
+@dataclass(slots=True)
+class RawTextLineError:
+    line_number: int
+    message: str
+    raw_row: str = ""
+
+    def __str__(self) -> str:
+        return f"Malformed raw text row at line {self.line_number}: {self.message}"
+
+
+class RawTextParseError(ValueError):
+    def __init__(self, line_errors: list[RawTextLineError]):
+        self.line_errors = line_errors
+        message = "; ".join(str(line_error) for line_error in line_errors[:MAX_REPORTED_LINE_ERRORS])
+        remaining = len(line_errors) - MAX_REPORTED_LINE_ERRORS
+        if remaining > 0:
+            message = f"{message} (+{remaining} more)"
+        super().__init__(message)
 
 
 def normalize_raw_text_columns(columns: list[str]) -> list[str]:
@@ -15,57 +53,145 @@ def normalize_raw_text_columns(columns: list[str]) -> list[str]:
     return columns
 
 
-def parse_raw_text_batch(text: str) -> ExtractionBatch:
-    records: list[WorkingRecord] = []
+@contextmanager
+def open_raw_text_source(source: RawTextSource) -> Iterator[Iterable[str]]:
+    # Plain strings are pasted text; paths are opened lazily so large files are never read whole.
+    if isinstance(source, os.PathLike):
+        with open(source, encoding="utf-8-sig") as handle:
+            yield handle
+    elif isinstance(source, str):
+        yield io.StringIO(source, newline=None)
+    else:
+        yield source
 
-    for line_number, line in enumerate(text.splitlines(), start=1):
+
+def parse_raw_text_row(line: str, source_index: int) -> CertificateRecord:
+    columns = normalize_raw_text_columns(line.split("\t"))
+    if len(columns) not in (LEGACY_COLUMN_COUNT, CURRENT_COLUMN_COUNT):
+        raise ValueError("wrong column count, expected 6, 8 or 9 tab-separated columns")
+
+    if len(columns) == CURRENT_COLUMN_COUNT:
+        sablona = columns[3]
+        course_name = columns[4]
+        completion_date = columns[5]
+        hours = columns[6]
+        forma = columns[7]
+        topic = columns[8]
+    else:
+        sablona = ""
+        course_name = columns[3]
+        completion_date = columns[4]
+        hours = columns[5]
+        forma = columns[6]
+        topic = columns[7]
+
+    return normalize_certificate_fields(
+        {
+            "surname": columns[0],
+            "name": columns[1],
+            "birth_date": columns[2],
+            "sablona": sablona,
+            "course_name": course_name,
+            "completion_date": completion_date,
+            "hours": hours,
+            "forma": forma,
+            "topic": topic,
+        },
+        origin=RecordOrigin(
+            source_mode="raw_text",
+            raw_row=line,
+            source_index=source_index,
+        ),
+    )
+
+
+def _iter_raw_text_rows(lines: Iterable[str]) -> Iterator[RawTextRow]:
+    source_index = 0
+    for line_number, line in enumerate(lines, start=1):
+        line = line.rstrip("\r\n")
         if not line.strip():
             continue
+        source_index += 1
+        yield line_number, source_index, line
+
 
-        columns = normalize_raw_text_columns(line.split("\t"))
-        if len(columns) not in (LEGACY_COLUMN_COUNT, CURRENT_COLUMN_COUNT):
-            raise ValueError(
-                "Malformed raw text row at line "
-                f"{line_number}: wrong column count, expected 6, 8 or 9 tab-separated columns"
-            )
-
-        if len(columns) == CURRENT_COLUMN_COUNT:
-            sablona = columns[3]
-            course_name = columns[4]
-            completion_date = columns[5]
-            hours = columns[6]
-            forma = columns[7]
-            topic = columns[8]
+def _parse_raw_text_chunk(rows: list[RawTextRow]) -> list[CertificateRecord | RawTextLineError]:
+    results: list[CertificateRecord | RawTextLineError] = []
+    for line_number, source_index, line in rows:
+        try:
+            results.append(parse_raw_text_row(line, source_index))
+        except (TypeError, ValueError) as exc:
+            results.append(RawTextLineError(line_number, str(exc), line))
+    return results
+
+
+def _chunked(items: Iterable[_T], size: int) -> Iterator[list[_T]]:
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _map_bounded(
+    executor: Executor,
+    function: Callable[[_T], _R],
+    items: Iterable[_T],
+) -> Iterator[_R]:
+    pending = deque()
+    for item in items:
+        pending.append(executor.submit(function, item))
+        if len(pending) >= MAX_PENDING_CHUNKS:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def iter_raw_text_records(
+    source: RawTextSource,
+    *,
+    errors: list[RawTextLineError] | None = None,
+    executor: Executor | None = None,
+    chunk_size: int = RAW_TEXT_CHUNK_SIZE,
+) -> Iterator[CertificateRecord]:
+    line_errors = [] if errors is None else errors
+    with open_raw_text_source(source) as lines:
+        chunks = _chunked(_iter_raw_text_rows(lines), max(1, chunk_size))
+        if executor is None:
+            results = map(_parse_raw_text_chunk, chunks)
         else:
-            sablona = ""
-            course_name = columns[3]
-            completion_date = columns[4]
-            hours = columns[5]
-            forma = columns[6]
-            topic = columns[7]
-
-        origin = RecordOrigin(
-            source_mode="raw_text",
-            raw_row=line,
-            source_index=len(records) + 1,
-        )
-        record = normalize_certificate_fields(
-            {
-                "surname": columns[0],
-                "name": columns[1],
-                "birth_date": columns[2],
-                "sablona": sablona,
-                "course_name": course_name,
-                "completion_date": completion_date,
-                "hours": hours,
-                "forma": forma,
-                "topic": topic,
-            },
-            origin=origin,
-        )
-        records.append(WorkingRecord(extracted_record=record))
+            results = _map_bounded(executor, _parse_raw_text_chunk, chunks)
+        for chunk_results in results:
+            for item in chunk_results:
+                if isinstance(item, RawTextLineError):
+                    line_errors.append(item)
+                else:
+                    yield item
+
+    if errors is None and line_errors:
+        raise RawTextParseError(line_errors)
+
 
+def parse_raw_text_stream(
+    source: RawTextSource,
+    *,
+    executor: Executor | None = None,
+    chunk_size: int = RAW_TEXT_CHUNK_SIZE,
+) -> ExtractionBatch:
+    line_errors: list[RawTextLineError] = []
+    records = RecordTable(
+        iter_raw_text_records(
+            source,
+            errors=line_errors,
+            executor=executor,
+            chunk_size=chunk_size,
+        )
+    )
+    if line_errors:
+        raise RawTextParseError(line_errors)
     if not records:
         raise ValueError("No certificate rows found in raw text input")
 
     return ExtractionBatch(input_mode="raw_text", records=records)
+
+
+def parse_raw_text_batch(text: str) -> ExtractionBatch:
+    return parse_raw_text_stream(text)
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import re
+import unicodedata
+from pathlib import Path
+from typing import Callable, Mapping, Sequence
+
+from dvpp_certificates.domain import CertificateRecord
+from dvpp_certificates.normalization import normalize_certificate_fields, strip_titles
+
+
+TextLayerParser = Callable[[str], Mapping[str, str] | None]
+
+TEXT_LAYER_PARSERS: list[TextLayerParser] = []
+
+SPACED_DATE_RE = re.compile(r"(\d{1,2})\.\s*(\d{1,2})\.\s*(\d{4})")
+LABELLED_NAME_RE = re.compile(
+    r"^\s*(?P<label>jmeno a prijmeni|ucastnik|ucastnice)\s*:\s*(?P<value>.+?)\s*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+LABELLED_BIRTH_DATE_RE = re.compile(
+    r"(?:datum narozeni|narozena?|nar\.)\s*:?\s*(?P<value>\d{1,2}\.\s*\d{1,2}\.\s*\d{4})",
+    re.IGNORECASE,
+)
+LABELLED_COURSE_RE = re.compile(
+    r"^\s*(?:nazev (?:vzdelavaciho )?programu|nazev kurzu|vzdelavaci program)\s*:\s*(?P<value>.+?)\s*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+LABELLED_COMPLETION_RE = re.compile(
+    r"^\s*(?:datum (?:konani|ukonceni|absolvovani)|termin konani)\s*:\s*(?P<value>.+?)\s*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+LABELLED_HOURS_RE = re.compile(
+    r"(?:v rozsahu|rozsah|pocet hodin)\s*:?\s*(?P<value>\d+(?:[.,]\d+)?)",
+    re.IGNORECASE,
+)
+LABELLED_TOPIC_RE = re.compile(
+    r"^\s*tema\s*:\s*(?P<value>.+?)\s*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+NAME_FIRST_LABEL = "jmeno a prijmeni"
+TEXT_LAYER_NOTE = "Načteno z textové vrstvy PDF, formu a šablonu doplňte ručně."
+
+
+def register_text_layer_parser(parser: TextLayerParser) -> TextLayerParser:
+    TEXT_LAYER_PARSERS.append(parser)
+    return parser
+
+
+def _fold_character(character: str) -> str:
+    folded = "".join(
+        part for part in unicodedata.normalize("NFKD", character) if not unicodedata.combining(part)
+    )
+    return folded[:1] or character
+
+
+def fold_diacritics(text: str) -> str:
+    # One output character per input character, so match spans index the original text.
+    return "".join(_fold_character(character) for character in text)
+
+
+def _format_spaced_date(match: re.Match[str]) -> str:
+    day, month, year = match.groups()
+    return f"{int(day):02d}.{int(month):02d}.{year}"
+
+
+def _split_full_name(full_name: str, name_first: bool) -> tuple[str, str] | None:
+    # A surname in capitals marks itself; otherwise only a two-word name under a
+    # "Jméno a příjmení" label has a known order, and anything else is left to Gemini.
+    parts = strip_titles(full_name).split()
+    if len(parts) < 2:
+        return None
+    capitalised = [part.isupper() and len(part) > 1 for part in parts]
+    if any(capitalised) and not all(capitalised):
+        marked_count = sum(capitalised)
+        if all(capitalised[:marked_count]):
+            return " ".join(parts[:marked_count]), " ".join(parts[marked_count:])
+        if all(capitalised[-marked_count:]):
+            return " ".join(parts[-marked_count:]), " ".join(parts[:-marked_count])
+        return None
+    if name_first and len(parts) == 2:
+        return parts[1], parts[0]
+    return None
+
+
+def parse_labelled_certificate(page_text: str) -> dict[str, str] | None:
+    """Generic "Label: value" layout; not registered by default, pass it in ``parsers`` to opt in."""
+    folded_text = fold_diacritics(page_text)
+    matches = {
+        field_name: pattern.search(folded_text)
+        for field_name, pattern in (
+            ("name", LABELLED_NAME_RE),
+            ("birth_date", LABELLED_BIRTH_DATE_RE),
+            ("course_name", LABELLED_COURSE_RE),
+            ("completion_date", LABELLED_COMPLETION_RE),
+            ("hours", LABELLED_HOURS_RE),
+            ("topic", LABELLED_TOPIC_RE),
+        )
+    }
+    values = {
+        field_name: page_text[match.start("value"):match.end("value")]
+        for field_name, match in matches.items()
+        if match is not None
+    }
+    if any(field_name not in values for field_name in ("name", "birth_date", "course_name", "completion_date", "hours")):
+        return None
+
+    name_first = matches["name"].group("label").lower() == NAME_FIRST_LABEL
+    full_name = _split_full_name(values["name"], name_first)
+    completion_dates = list(SPACED_DATE_RE.finditer(values["completion_date"]))
+    if full_name is None or not completion_dates:
+        return None
+
+    surname, name = full_name
+    return {
+        "surname": surname,
+        "name": name,
+        "birth_date": _format_spaced_date(SPACED_DATE_RE.search(values["birth_date"])),
+        "course_name": values["course_name"],
+        "completion_date": _format_spaced_date(completion_dates[-1]),
+        "hours": values["hours"],
+        "topic": values.get("topic", ""),
+        "uncertainty_notes": TEXT_LAYER_NOTE,
+    }
+
+
+def read_pdf_pages(path: str | Path) -> list[str] | None:
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        return None
+
+    try:
+        reader = PdfReader(str(path))
+        return [page.extract_text() or "" for page in reader.pages]
+    except Exception:
+        return None
+
+
+def parse_text_layer_pages(
+    pages: Sequence[str],
+    parsers: Sequence[TextLayerParser] | None = None,
+) -> list[CertificateRecord] | None:
+    active_parsers = TEXT_LAYER_PARSERS if parsers is None else parsers
+    certificates: list[CertificateRecord] = []
+    for page_text in pages:
+        if not page_text.strip():
+            continue
+        for parser in active_parsers:
+            fields = parser(page_text)
+            if fields is None:
+                continue
+            try:
+                certificates.append(normalize_certificate_fields(fields))
+            except (TypeError, ValueError):
+                continue
+            break
+        else:
+            return None
+    return certificates or None
+
+
+def extract_text_layer_certificates(
+    path: str | Path,
+    parsers: Sequence[TextLayerParser] | None = None,
+) -> list[CertificateRecord] | None:
+    if Path(path).suffix.lower() != ".pdf":
+        return None
+    pages = read_pdf_pages(path)
+    if not pages:
+        return None
+    return parse_text_layer_pages(pages, parsers)
@@ -0,0 +1,8 @@
+from plakat.form_tokens import extract_form_token, extract_step_progress
+from plakat.scheduler import PoliteScheduler
+
+__all__ = [
+    "PoliteScheduler",
+    "extract_form_token",
+    "extract_step_progress",
+]
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+
+CHECKPOINT_FILENAME = ".plakat_checkpoint.json"
+CHECKPOINT_VERSION = 1
+
+
+def batch_fingerprint(orientation: str, common_text: str, renderer: str) -> str:
+    material = json.dumps([CHECKPOINT_VERSION, orientation, common_text, renderer], ensure_ascii=False)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()[:32]
+
+
+class PosterCheckpoint:
+    def __init__(self, output_dir: str | Path, fingerprint: str):
+        self.manifest_path = Path(output_dir) / CHECKPOINT_FILENAME
+        self.fingerprint = fingerprint
+        self._projects: dict[str, dict[str, Any]] | None = None
+        self._lock = threading.Lock()
+
+    def completed_file(self, project_id: str, project_name: str) -> Path | None:
+        with self._lock:
+            entry = self._load().get(project_id)
+        if entry is None or entry.get("name") != project_name:
+            return None
+        # A manifest entry only counts while its PDF is still next to it.
+        file_path = self.manifest_path.parent / str(entry.get("filename", ""))
+        return file_path if file_path.is_file() else None
+
+    def record(self, project_id: str, project_name: str, filename: str) -> None:
+        with self._lock:
+            self._load()[project_id] = {
+                "name": project_name,
+                "filename": filename,
+                "completed_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            }
+            self._save()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._projects = {}
+            try:
+                self.manifest_path.unlink()
+            except OSError:
+                pass
+
+    def _save(self) -> None:
+        payload = json.dumps(
+            {
+                "version": CHECKPOINT_VERSION,
+                "fingerprint": self.fingerprint,
+                "projects": self._projects,
+            },
+            ensure_ascii=False,
+            indent=2,
+        )
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.manifest_path.with_name(f"{self.manifest_path.name}.{os.getpid()}.tmp")
+        temp_path.write_text(payload, encoding="utf-8")
+        os.replace(temp_path, self.manifest_path)
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        if self._projects is None:
+            self._projects = {}
+            try:
+                raw_data = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                raw_data = {}
+            # A manifest written for other poster settings must not mark these projects as done.
+            if (
+                isinstance(raw_data, dict)
+                and raw_data.get("version") == CHECKPOINT_VERSION
+                and raw_data.get("fingerprint") == self.fingerprint
+            ):
+                self._projects = dict(raw_data.get("projects") or {})
+        return self._projects
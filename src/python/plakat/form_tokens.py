@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import html as html_lib
+import re
+
+
+FORM_TOKEN_FIELD = "form[_token]"
+
+_INPUT_TAG_RE = re.compile(r"<input\b(?P<attrs>[^<>]*)/?>", re.IGNORECASE)
+_ATTRIBUTE_RE = re.compile(
+    r"""(?P<name>[^\s=/>"']+)(?:\s*=\s*(?:"(?P<double>[^"]*)"|'(?P<single>[^']*)'|(?P<bare>[^\s"'=<>`]+)))?"""
+)
+_STEPS_LIST_RE = re.compile(
+    r"""<ul\b[^>]*\bid\s*=\s*["']?steps["']?[^>]*>(?P<items>.*?)</ul\s*>""",
+    re.IGNORECASE | re.DOTALL,
+)
+_LIST_ITEM_RE = re.compile(r"<li\b(?P<attrs>[^>]*)>", re.IGNORECASE)
+
+
+def _attributes(raw_attributes: str) -> dict[str, str]:
+    attributes: dict[str, str] = {}
+    for match in _ATTRIBUTE_RE.finditer(raw_attributes):
+        value = match.group("double")
+        if value is None:
+            value = match.group("single")
+        if value is None:
+            value = match.group("bare") or ""
+        attributes.setdefault(match.group("name").lower(), html_lib.unescape(value))
+    return attributes
+
+
+def _has_unbalanced_quotes(raw_attributes: str) -> bool:
+    return raw_attributes.count('"') % 2 == 1 or raw_attributes.count("'") % 2 == 1
+
+
+def _scan_form_token(page: str) -> str | None:
+    # Jump straight to occurrences of the field name and only parse the enclosing tag.
+    position = page.find(FORM_TOKEN_FIELD)
+    while position != -1:
+        tag_start = page.rfind("<", 0, position)
+        tag_end = page.find(">", position)
+        if tag_start != -1 and tag_end != -1:
+            match = _INPUT_TAG_RE.fullmatch(page, tag_start, tag_end + 1)
+            # An odd quote count means a ">" inside an attribute value cut the tag short.
+            if match is not None and not _has_unbalanced_quotes(match.group("attrs")):
+                attributes = _attributes(match.group("attrs"))
+                if attributes.get("name") == FORM_TOKEN_FIELD:
+                    return attributes.get("value", "")
+        position = page.find(FORM_TOKEN_FIELD, position + len(FORM_TOKEN_FIELD))
+    return None
+
+
+def _parse_form_token_with_soup(page: str) -> str | None:
+    try:
+        from bs4 import BeautifulSoup
+    except ImportError:
+        return None
+
+    token_input = BeautifulSoup(page, "html.parser").find("input", {"name": FORM_TOKEN_FIELD})
+    if token_input is None:
+        return None
+    return token_input.get("value", "")
+
+
+def extract_form_token(page: str) -> str | None:
+    token = _scan_form_token(page)
+    if token is None and FORM_TOKEN_FIELD in page:
+        token = _parse_form_token_with_soup(page)
+    return token
+
+
+def extract_step_progress(page: str) -> list[str] | None:
+    steps = _STEPS_LIST_RE.search(page)
+    if steps is None:
+        return None
+
+    progress = []
+    for item in _LIST_ITEM_RE.finditer(steps.group("items")):
+        classes = _attributes(item.group("attrs")).get("class", "").split()
+        if "done" in classes:
+            progress.append("DONE")
+        elif "active" in classes:
+            progress.append("ACTIVE")
+        else:
+            progress.append("PENDING")
+    return progress
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import io
+import math
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Sequence
+
+from reportlab.lib.colors import HexColor, black
+from reportlab.lib.pagesizes import A3, landscape, portrait
+from reportlab.lib.units import mm
+from reportlab.lib.utils import simpleSplit
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas
+
+
+FONT_NAME = "PlakatSans"
+BOLD_FONT_NAME = "PlakatSans-Bold"
+PROGRAM_NAME = "Operační program Jan Amos Komenský"
+FINANCING_TEXT = "Spolufinancováno Evropskou unií"
+# The emblem and funding line only approximate the official artwork, so every page says so.
+DRAFT_NOTICE = "Neoficiální náhled – pro zveřejnění použijte plakát ze služby publicita.dotaceeu.cz"
+EU_BLUE = HexColor("#003399")
+EU_YELLOW = HexColor("#FFCC00")
+MARGIN = 20 * mm
+
+_font_lock = threading.Lock()
+_registered_fonts: tuple[str, str] | None = None
+
+
+class PosterRenderError(RuntimeError):
+    pass
+
+
+def default_font_candidates() -> list[tuple[Path, Path]]:
+    # Built-in PDF fonts lack Czech diacritics, so a system TrueType font is required.
+    if sys.platform == "win32":
+        fonts_dir = Path(os.environ.get("WINDIR", r"C:\Windows")) / "Fonts"
+        return [
+            (fonts_dir / "arial.ttf", fonts_dir / "arialbd.ttf"),
+            (fonts_dir / "calibri.ttf", fonts_dir / "calibrib.ttf"),
+        ]
+    if sys.platform == "darwin":
+        return [
+            (Path("/System/Library/Fonts/Supplemental/Arial.ttf"), Path("/System/Library/Fonts/Supplemental/Arial Bold.ttf")),
+            (Path("/Library/Fonts/Arial.ttf"), Path("/Library/Fonts/Arial Bold.ttf")),
+        ]
+    return [
+        (Path("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"), Path("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf")),
+        (Path("/usr/share/fonts/dejavu/DejaVuSans.ttf"), Path("/usr/share/fonts/dejavu/DejaVuSans-Bold.ttf")),
+        (Path("/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf"), Path("/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf")),
+    ]
+
+
+def register_poster_fonts(candidates: Sequence[tuple[Path, Path]] | None = None) -> tuple[str, str]:
+    global _registered_fonts
+    with _font_lock:
+        if _registered_fonts is not None:
+            return _registered_fonts
+        for regular_path, bold_path in candidates or default_font_candidates():
+            if not regular_path.is_file() or not bold_path.is_file():
+                continue
+            try:
+                pdfmetrics.registerFont(TTFont(FONT_NAME, str(regular_path)))
+                pdfmetrics.registerFont(TTFont(BOLD_FONT_NAME, str(bold_path)))
+            except Exception:
+                continue
+            _registered_fonts = (FONT_NAME, BOLD_FONT_NAME)
+            return _registered_fonts
+    raise PosterRenderError("No TrueType font with Czech characters found for local poster rendering")
+
+
+def _fit_lines(
+    text: str,
+    font_name: str,
+    max_width: float,
+    max_height: float,
+    max_size: float,
+    min_size: float,
+) -> tuple[list[str], float]:
+    # Shrink the font until the wrapped text fits the box; long texts stay at min_size.
+    size = max_size
+    while True:
+        lines = simpleSplit(text, font_name, size, max_width)
+        if len(lines) * size * 1.2 <= max_height or size <= min_size:
+            return lines, size
+        size = max(min_size, size - 2)
+
+
+def _draw_lines(pdf: canvas.Canvas, lines: list[str], font_name: str, size: float, x: float, top: float) -> float:
+    pdf.setFont(font_name, size)
+    y = top - size
+    for line in lines:
+        pdf.drawString(x, y, line)
+        y -= size * 1.2
+    return y
+
+
+def _draw_eu_emblem(pdf: canvas.Canvas, x: float, y: float, height: float) -> float:
+    width = height * 1.5
+    pdf.setFillColor(EU_BLUE)
+    pdf.rect(x, y, width, height, stroke=0, fill=1)
+    pdf.setFillColor(EU_YELLOW)
+    centre_x, centre_y = x + width / 2, y + height / 2
+    ring_radius = height / 3
+    star_radius = height / 18
+    for index in range(12):
+        angle = 2 * math.pi * index / 12
+        star_x = centre_x + ring_radius * math.sin(angle)
+        star_y = centre_y + ring_radius * math.cos(angle)
+        points = []
+        for point in range(10):
+            radius = star_radius if point % 2 == 0 else star_radius * 0.4
+            point_angle = math.pi * point / 5
+            points.append((star_x + radius * math.sin(point_angle), star_y + radius * math.cos(point_angle)))
+        path = pdf.beginPath()
+        path.moveTo(*points[0])
+        for point_x, point_y in points[1:]:
+            path.lineTo(point_x, point_y)
+        path.close()
+        pdf.drawPath(path, stroke=0, fill=1)
+    return width
+
+
+def render_poster(project_name: str, orientation: str, common_text: str) -> bytes:
+    if orientation not in ("portrait", "landscape"):
+        raise ValueError(f"Unsupported poster orientation: {orientation}")
+    regular_font, bold_font = register_poster_fonts()
+    page_width, page_height = landscape(A3) if orientation == "landscape" else portrait(A3)
+    content_width = page_width - 2 * MARGIN
+    footer_height = 45 * mm
+
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=(page_width, page_height), invariant=1)
+    pdf.setTitle(project_name)
+    pdf.setFillColor(black)
+
+    text_area = page_height - 2 * MARGIN - footer_height
+    title_lines, title_size = _fit_lines(project_name, bold_font, content_width, text_area * 0.45, 60, 24)
+    y = _draw_lines(pdf, title_lines, bold_font, title_size, MARGIN, page_height - MARGIN)
+
+    body_top = y - 10 * mm
+    body_lines, body_size = _fit_lines(common_text, regular_font, content_width, body_top - MARGIN - footer_height, 32, 14)
+    _draw_lines(pdf, body_lines, regular_font, body_size, MARGIN, body_top)
+
+    pdf.setStrokeColor(EU_BLUE)
+    pdf.setLineWidth(1)
+    pdf.line(MARGIN, MARGIN + footer_height, page_width - MARGIN, MARGIN + footer_height)
+    emblem_height = 25 * mm
+    emblem_y = MARGIN + (footer_height - emblem_height) / 2
+    emblem_width = _draw_eu_emblem(pdf, MARGIN, emblem_y, emblem_height)
+
+    pdf.setFillColor(black)
+    label_x = MARGIN + emblem_width + 8 * mm
+    pdf.setFont(bold_font, 22)
+    pdf.drawString(label_x, emblem_y + emblem_height - 22, FINANCING_TEXT)
+    pdf.setFont(regular_font, 16)
+    pdf.drawString(label_x, emblem_y + 4, PROGRAM_NAME)
+
+    pdf.setFont(regular_font, 10)
+    pdf.drawRightString(page_width - MARGIN, MARGIN / 2, DRAFT_NOTICE)
+
+    pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+
+POSTER_CACHE_VERSION = 1
+DEFAULT_POSTER_CACHE_MAX_BYTES = 64 * 1024 * 1024
+PDF_SIGNATURE = b"%PDF"
+
+
+class PosterCache:
+    def __init__(
+        self,
+        cache_dir: str | Path,
+        max_bytes: int = DEFAULT_POSTER_CACHE_MAX_BYTES,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def key_for(self, project_name: str, orientation: str, common_text: str, generator_version: str) -> str:
+        material = json.dumps(
+            [POSTER_CACHE_VERSION, project_name, orientation, common_text, generator_version],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> bytes | None:
+        entry_path = self._entry_path(key)
+        try:
+            content = entry_path.read_bytes()
+        except FileNotFoundError:
+            return None
+        except OSError:
+            self._discard(entry_path)
+            return None
+        if not content.startswith(PDF_SIGNATURE):
+            self._discard(entry_path)
+            return None
+
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+        return content
+
+    def put(self, key: str, content: bytes) -> None:
+        entry_path = self._entry_path(key)
+        with self._lock:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            temp_path = entry_path.with_name(f"{entry_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            temp_path.write_bytes(content)
+            os.replace(temp_path, entry_path)
+            self._evict()
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._discard(self._entry_path(key))
+
+    def clear(self) -> None:
+        with self._lock:
+            for entry_path in self.cache_dir.glob("*.pdf"):
+                self._discard(entry_path)
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.pdf"
+
+    def _evict(self) -> None:
+        entries = []
+        total_size = 0
+        for entry_path in self.cache_dir.glob("*.pdf"):
+            try:
+                stat = entry_path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry_path))
+            total_size += stat.st_size
+
+        entries.sort()
+        for _mtime, size, entry_path in entries:
+            if total_size <= self.max_bytes:
+                break
+            self._discard(entry_path)
+            total_size -= size
+
+    @staticmethod
+    def _discard(entry_path: Path) -> None:
+        try:
+            entry_path.unlink()
+        except OSError:
+            pass
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable
+from urllib.parse import urlsplit
+
+
+DEFAULT_REQUESTS_PER_SECOND = 2.0
+DEFAULT_PER_HOST_LIMIT = 3
+DEFAULT_MAX_RETRIES = 4
+DEFAULT_BASE_BACKOFF_SECONDS = 1.0
+DEFAULT_MAX_BACKOFF_SECONDS = 60.0
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def _retry_after_seconds(response: Any) -> float | None:
+    value = (getattr(response, "headers", None) or {}).get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class _HostState:
+    __slots__ = ("slots", "backoff", "not_before")
+
+    def __init__(self, limit: int):
+        self.slots = threading.BoundedSemaphore(limit)
+        self.backoff = 0.0
+        self.not_before = 0.0
+
+
+class PoliteScheduler:
+    def __init__(
+        self,
+        requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+        per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+        *,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        base_backoff: float = DEFAULT_BASE_BACKOFF_SECONDS,
+        max_backoff: float = DEFAULT_MAX_BACKOFF_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if requests_per_second <= 0:
+            raise ValueError("requests_per_second must be positive")
+        self.requests_per_second = float(requests_per_second)
+        self.per_host_limit = max(1, int(per_host_limit))
+        self.max_retries = max(0, int(max_retries))
+        self.base_backoff = max(0.0, float(base_backoff))
+        self.max_backoff = max(self.base_backoff, float(max_backoff))
+        self.clock = clock
+        self.sleep = sleep
+        self.retried_responses = 0
+        self._hosts: dict[str, _HostState] = {}
+        self._lock = threading.Lock()
+        self._next_slot_at = clock()
+
+    def request(self, session: Any, method: str, url: str, **kwargs: Any) -> Any:
+        host = self._host(url)
+        with host.slots:
+            attempt = 0
+            while True:
+                self._wait_for_turn(host)
+                response = session.request(method, url, **kwargs)
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    self._record_success(host)
+                    return response
+                if attempt >= self.max_retries:
+                    return response
+                attempt += 1
+                response.close()
+                self._record_throttle(host, _retry_after_seconds(response))
+
+    def host_backoff(self, url: str) -> float:
+        return self._host(url).backoff
+
+    def _host(self, url: str) -> _HostState:
+        key = urlsplit(url).netloc.lower()
+        with self._lock:
+            host = self._hosts.get(key)
+            if host is None:
+                host = self._hosts[key] = _HostState(self.per_host_limit)
+            return host
+
+    def _wait_for_turn(self, host: _HostState) -> None:
+        # Reserve the next global slot and honour the host's cooldown in one step, then sleep outside the lock.
+        with self._lock:
+            now = self.clock()
+            start_at = max(now, self._next_slot_at, host.not_before)
+            self._next_slot_at = start_at + 1.0 / self.requests_per_second
+        delay = start_at - now
+        if delay > 0:
+            self.sleep(delay)
+
+    def _record_throttle(self, host: _HostState, retry_after: float | None) -> None:
+        with self._lock:
+            self.retried_responses += 1
+            host.backoff = min(self.max_backoff, max(self.base_backoff, host.backoff * 2))
+            cooldown = host.backoff if retry_after is None else min(self.max_backoff, max(retry_after, host.backoff))
+            host.not_before = max(host.not_before, self.clock() + cooldown)
+
+    def _record_success(self, host: _HostState) -> None:
+        with self._lock:
+            host.backoff /= 2
+            if host.backoff < self.base_backoff / 4:
+                host.backoff = 0.0
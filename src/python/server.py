@@ -4,7 +4,7 @@ import sys
 import tempfile
 from pathlib import Path
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 
 # Add tools directory to path
@@ -14,10 +14,16 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'tools'))
 from tools.inv_vzd_processor import InvVzdProcessor
 from tools.zor_spec_dat_processor import ZorSpecDatProcessor
 from tools.plakat_generator import PlakatGenerator
-from tools.dvpp_report_processor import DvppReportProcessor
+from tools.dvpp_report_processor import MAX_BATCH_WORKERS, DvppReportProcessor, DvppScanCache
 from tools.dvpp_certificate_processor import DvppCertificateProcessor
 from tools.attendance_splitter import AttendanceSplitter
 from channel_config import load_channel_config, resolve_debug_mode
+from app_paths import resolve_cache_dir
+from dvpp_certificates.batch_store import CertificateBatchStore
+from dvpp_certificates.duplicate_index import CertificateDuplicateIndex
+from dvpp_certificates.extraction_cache import CertificateExtractionCache
+from dvpp_certificates.importers import GeminiCertificateImporter
+from plakat.poster_cache import PosterCache
 
 # Initialize logging
 from logger import init_logging
@@ -26,6 +32,12 @@ CHANNEL_CONFIG = load_channel_config()
 BACKEND_INSTANCE_TOKEN = os.environ.get("ELECTRON_APP_INSTANCE_TOKEN", "")
 BACKEND_PORT = int(os.environ.get("FLASK_PORT") or os.environ.get("PORT") or 5000)
 PACKAGE_JSON_PATH = Path(__file__).resolve().parents[2] / "package.json"
+DVPP_SCAN_CACHE = DvppScanCache(resolve_cache_dir("dvpp"))
+DVPP_CERTIFICATE_CACHE = CertificateExtractionCache(resolve_cache_dir("dvpp_certificates"))
+PLAKAT_POSTER_CACHE = PosterCache(resolve_cache_dir("plakat"))
+DVPP_CERTIFICATE_BATCHES = CertificateBatchStore(
+    duplicate_index=CertificateDuplicateIndex(resolve_cache_dir("dvpp_certificates")),
+)
 
 # DEBUG mode is controlled by env override or channel configuration
 DEBUG_MODE = resolve_debug_mode(CHANNEL_CONFIG, os.environ)
@@ -371,8 +383,21 @@ def process_attendance_splitter_files():
                 },
             }), 400
 
+        backend = data.get("backend") or AttendanceSplitter.BACKEND_OPENPYXL
+        if backend not in AttendanceSplitter.BACKENDS:
+            return jsonify({
+                "success": False,
+                "status": "error",
+                "message": f"Neznámý způsob kopírování listů: {backend}",
+                "data": {
+                    "files": [],
+                    "created_count": 0,
+                    "failed_count": 0,
+                },
+            }), 400
+
         converted_paths = [convert_path_if_needed(path) for path in file_paths]
-        processor = AttendanceSplitter(tool_logger)
+        processor = AttendanceSplitter(tool_logger, backend=backend)
         return jsonify(processor.process(converted_paths))
     except Exception as exc:
         server_logger.exception("Attendance splitter processing failed")
@@ -951,7 +976,7 @@ def process_plakat():
             return jsonify({"error": "Společný text musí být string s max. 255 znaky"}), 400
         
         # Process with PlakatGenerator
-        processor = PlakatGenerator(tool_logger)
+        processor = PlakatGenerator(tool_logger, poster_cache=PLAKAT_POSTER_CACHE)
         
         # Create temporary output directory
         temp_dir = tempfile.mkdtemp()
@@ -959,7 +984,9 @@ def process_plakat():
             'projects': projects,
             'orientation': orientation,
             'common_text': common_text,
-            'output_dir': temp_dir
+            'output_dir': temp_dir,
+            'bypass_cache': data.get('bypassCache', False),
+            'renderer': data.get('renderer', 'remote')
         }
         
         try:
@@ -984,6 +1011,8 @@ def process_plakat():
                         "successful_projects": result['data'].get('successful_projects', 0),
                         "failed_projects": result['data'].get('failed_projects', 0),
                         "total_projects": result['data'].get('total_projects', 0),
+                        "cached_projects": result['data'].get('cached_projects', 0),
+                        "local_projects": result['data'].get('local_projects', 0),
                         "output_files": output_files
                     },
                     "errors": result.get('errors', []),
@@ -1025,7 +1054,7 @@ def scan_dvpp_directory():
                 "message": "No project directory provided"
             }), 400
 
-        processor = DvppReportProcessor(tool_logger)
+        processor = DvppReportProcessor(tool_logger, scan_cache=DVPP_SCAN_CACHE)
         matches = processor.scan_project_directory(project_dir)
 
         return jsonify({
@@ -1058,7 +1087,10 @@ def process_dvpp_report():
         file_paths = [convert_path_if_needed(path) for path in data.get('filePaths', [])]
 
         processor = DvppReportProcessor(tool_logger)
-        result = processor.process(file_paths, {"project_dir": project_dir})
+        result = processor.process(file_paths, {
+            "project_dir": project_dir,
+            "lazy_tables": data.get('lazyTables'),
+        })
 
         if result["success"]:
             return jsonify({
@@ -1086,6 +1118,84 @@ def process_dvpp_report():
         }), 500
 
 
+@app.route('/api/process/dvpp-report-batch', methods=['POST'])
+def process_dvpp_report_batch():
+    """Generate DVPP HTML reports for several project directories concurrently.
+
+    With ``stream: true`` the response is NDJSON with one line per project as it completes.
+    """
+    try:
+        data = request.get_json()
+
+        if not data:
+            return jsonify({
+                "status": "error",
+                "message": "No data provided"
+            }), 400
+
+        projects = []
+        for item in data.get('projects') or []:
+            if isinstance(item, str):
+                projects.append({
+                    "project_dir": convert_path_if_needed(item),
+                    "lazy_tables": data.get('lazyTables'),
+                })
+            elif isinstance(item, dict):
+                projects.append({
+                    "project_dir": convert_path_if_needed(item.get('projectDir')),
+                    "files": [convert_path_if_needed(path) for path in item.get('filePaths') or []],
+                    "lazy_tables": item.get('lazyTables', data.get('lazyTables')),
+                })
+
+        if not projects:
+            return jsonify({
+                "status": "error",
+                "message": "Nebyl zadán žádný projektový adresář"
+            }), 400
+
+        max_workers = None
+        if data.get('maxWorkers') not in (None, ''):
+            try:
+                max_workers = int(data.get('maxWorkers'))
+            except (TypeError, ValueError):
+                max_workers = 0
+            if max_workers < 1:
+                return jsonify({
+                    "status": "error",
+                    "message": "Počet souběžných projektů musí být kladné celé číslo"
+                }), 400
+            max_workers = min(max_workers, MAX_BATCH_WORKERS)
+
+        processor = DvppReportProcessor(tool_logger, scan_cache=DVPP_SCAN_CACHE)
+
+        if data.get('stream'):
+            def generate():
+                for item in processor.iter_batch(projects, max_workers=max_workers):
+                    yield json.dumps(item, ensure_ascii=False) + "\n"
+
+            return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+        results = processor.process_batch(projects, max_workers=max_workers)
+        successful_projects = sum(1 for item in results if item["success"])
+
+        return jsonify({
+            "status": "success" if successful_projects else "error",
+            "message": f"Vygenerováno DVPP reportů: {successful_projects} z {len(results)}",
+            "data": {
+                "results": results,
+                "successful_projects": successful_projects,
+                "failed_projects": len(results) - successful_projects,
+            }
+        }), 200 if successful_projects else 400
+
+    except Exception as e:
+        server_logger.error(f"Error processing DVPP report batch: {str(e)}")
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 500
+
+
 @app.route('/api/dvpp-certificates/import/gemini', methods=['POST'])
 def import_dvpp_certificates_gemini():
     """Import DVPP certificates from selected files through Gemini."""
@@ -1103,15 +1213,27 @@ def import_dvpp_certificates_gemini():
         model_name = data.get('modelName')
         api_key = data.get('apiKey')
 
-        processor = DvppCertificateProcessor(tool_logger)
-        result = processor.process(
-            file_paths,
-            {
-                "folder_path": folder_path,
-                "model_name": model_name,
-                "api_key": api_key,
-            }
+        processor = DvppCertificateProcessor(
+            tool_logger,
+            importer=GeminiCertificateImporter(cache=DVPP_CERTIFICATE_CACHE),
+            batch_store=DVPP_CERTIFICATE_BATCHES,
         )
+        try:
+            result = processor.process(
+                file_paths,
+                {
+                    "folder_path": folder_path,
+                    "model_name": model_name,
+                    "api_key": api_key,
+                    "max_concurrency": data.get('maxConcurrency'),
+                    "requests_per_minute": data.get('requestsPerMinute'),
+                    "bypass_cache": data.get('bypassCache', False),
+                    "batch_size": data.get('batchSize'),
+                    "use_text_layer": data.get('useTextLayer', True),
+                }
+            )
+        finally:
+            processor.close()
 
         if result["success"]:
             return jsonify({
@@ -1197,7 +1319,7 @@ def import_dvpp_certificates_raw_text():
                 "message": "No data provided"
             }), 400
 
-        processor = DvppCertificateProcessor(tool_logger)
+        processor = DvppCertificateProcessor(tool_logger, batch_store=DVPP_CERTIFICATE_BATCHES)
         result = processor.import_raw_text(data.get("rawText", ""))
 
         if result["success"]:
@@ -1237,10 +1359,11 @@ def export_dvpp_certificates_tsv():
                 "message": "No data provided"
             }), 400
 
-        processor = DvppCertificateProcessor(tool_logger)
+        processor = DvppCertificateProcessor(tool_logger, batch_store=DVPP_CERTIFICATE_BATCHES)
         result = processor.export_tsv(
             data.get("records", []),
             output_path=convert_path_if_needed(data.get("outputPath")),
+            batch_id=data.get("batchId"),
         )
 
         if result["success"]:
@@ -1256,6 +1379,7 @@ def export_dvpp_certificates_tsv():
         return jsonify({
             "status": "error",
             "message": "TSV export selhal",
+            "data": result.get("data"),
             "errors": result.get("errors", []),
             "warnings": result.get("warnings", []),
             "info": result.get("info", []),
@@ -1280,12 +1404,14 @@ def export_dvpp_certificates_excel():
                 "message": "No data provided"
             }), 400
 
-        processor = DvppCertificateProcessor(tool_logger)
+        processor = DvppCertificateProcessor(tool_logger, batch_store=DVPP_CERTIFICATE_BATCHES)
         result = processor.export_excel(
             data.get("records", []),
             data.get("exportMetadata", {}),
             template_path=convert_path_if_needed(data.get("templatePath")),
             output_path=convert_path_if_needed(data.get("outputPath")),
+            batch_id=data.get("batchId"),
+            workbook_writer=data.get("excelWriter"),
         )
 
         if result["success"]:
@@ -1303,6 +1429,7 @@ def export_dvpp_certificates_excel():
         return jsonify({
             "status": "error",
             "message": message,
+            "data": result.get("data"),
             "errors": error_messages,
             "warnings": result.get("warnings", []),
             "info": result.get("info", []),
@@ -1327,11 +1454,12 @@ def export_dvpp_certificates_esf():
                 "message": "No data provided"
             }), 400
 
-        processor = DvppCertificateProcessor(tool_logger)
+        processor = DvppCertificateProcessor(tool_logger, batch_store=DVPP_CERTIFICATE_BATCHES)
         result = processor.export_esf(
             data.get("records", []),
             export_metadata_payload=data.get("exportMetadata", {}),
             output_path=convert_path_if_needed(data.get("outputPath")),
+            batch_id=data.get("batchId"),
         )
 
         if result["success"]:
@@ -1349,6 +1477,7 @@ def export_dvpp_certificates_esf():
         return jsonify({
             "status": "error",
             "message": message,
+            "data": result.get("data"),
             "errors": error_messages,
             "warnings": result.get("warnings", []),
             "info": result.get("info", []),
@@ -1361,6 +1490,106 @@ def export_dvpp_certificates_esf():
             "message": str(e)
         }), 500
 
+
+@app.route('/api/dvpp-certificates/batches/<batch_id>/edits', methods=['POST'])
+def update_dvpp_certificate_batch(batch_id):
+    """Apply record edits from the UI to a stored certificate batch."""
+    try:
+        data = request.get_json()
+
+        if not data:
+            return jsonify({
+                "status": "error",
+                "message": "No data provided"
+            }), 400
+
+        processor = DvppCertificateProcessor(tool_logger, batch_store=DVPP_CERTIFICATE_BATCHES)
+        result = processor.update_batch(batch_id, data.get("edits", []))
+
+        if result["success"]:
+            return jsonify({
+                "status": "success",
+                "message": "Úpravy certifikátů byly uloženy",
+                "data": result["data"],
+                "errors": result.get("errors", []),
+                "warnings": result.get("warnings", []),
+                "info": result.get("info", []),
+            })
+
+        error_messages = result.get("errors", [])
+        return jsonify({
+            "status": "error",
+            "message": error_messages[0] if error_messages else "Uložení úprav certifikátů selhalo",
+            "data": result.get("data"),
+            "errors": error_messages,
+            "warnings": result.get("warnings", []),
+            "info": result.get("info", []),
+        }), 400
+
+    except Exception as e:
+        server_logger.error(f"Error updating DVPP certificate batch: {str(e)}")
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 500
+
+
+@app.route('/api/dvpp-certificates/batches/<batch_id>/duplicates', methods=['GET'])
+def get_dvpp_certificate_batch_duplicates(batch_id):
+    """List records of a stored batch that repeat within it or match earlier imports."""
+    try:
+        processor = DvppCertificateProcessor(tool_logger, batch_store=DVPP_CERTIFICATE_BATCHES)
+        result = processor.find_duplicates(batch_id)
+
+        if result["success"]:
+            return jsonify({
+                "status": "success",
+                "message": "Duplicity certifikátů byly zkontrolovány",
+                "data": result["data"],
+                "errors": result.get("errors", []),
+                "warnings": result.get("warnings", []),
+                "info": result.get("info", []),
+            })
+
+        error_messages = result.get("errors", [])
+        return jsonify({
+            "status": "error",
+            "message": error_messages[0] if error_messages else "Kontrola duplicit selhala",
+            "data": result.get("data"),
+            "errors": error_messages,
+            "warnings": result.get("warnings", []),
+            "info": result.get("info", []),
+        }), 400
+
+    except Exception as e:
+        server_logger.error(f"Error checking DVPP certificate duplicates: {str(e)}")
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 500
+
+
+@app.route('/api/dvpp-certificates/batches/<batch_id>', methods=['DELETE'])
+def discard_dvpp_certificate_batch(batch_id):
+    """Release a stored certificate batch."""
+    try:
+        processor = DvppCertificateProcessor(tool_logger, batch_store=DVPP_CERTIFICATE_BATCHES)
+        result = processor.discard_batch(batch_id)
+        return jsonify({
+            "status": "success",
+            "message": "Dávka certifikátů byla uvolněna",
+            "data": result["data"],
+            "errors": result.get("errors", []),
+            "warnings": result.get("warnings", []),
+            "info": result.get("info", []),
+        })
+    except Exception as e:
+        server_logger.error(f"Error discarding DVPP certificate batch: {str(e)}")
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 500
+
 @app.route('/api/config', methods=['GET'])
 def get_config():
     """Get application configuration"""
@@ -0,0 +1,270 @@
+"""Copy single worksheets into standalone workbooks with openpyxl or Excel."""
+
+from __future__ import annotations
+
+import logging
+import platform
+from copy import copy
+from pathlib import Path
+from typing import Any
+
+from openpyxl import Workbook, load_workbook
+from openpyxl.workbook.defined_name import DefinedName
+from openpyxl.worksheet.worksheet import Worksheet
+
+
+class OpenpyxlSheetCopier:
+    """Sheet copier that writes one source sheet into a new workbook without Excel.
+
+    The loaded source workbook is kept between calls, so splitting many sheets
+    of the same file parses it only once. Call ``close`` when done.
+    """
+
+    def __init__(self, logger: logging.Logger | None = None):
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self._source_key: tuple[str, int, int] | None = None
+        self._source_workbook = None
+
+    def __call__(self, source_path: str | Path, sheet_name: str, output_path: str | Path) -> None:
+        workbook = self._load_source(Path(source_path))
+        source_sheet = workbook[sheet_name]
+
+        target_workbook = Workbook()
+        target_workbook.remove(target_workbook.active)
+        target_workbook.loaded_theme = workbook.loaded_theme
+        target_workbook.calculation = copy(workbook.calculation)
+        target_sheet = target_workbook.create_sheet(source_sheet.title)
+
+        copy_worksheet(source_sheet, target_sheet)
+        self._copy_defined_names(workbook, source_sheet, target_workbook, target_sheet)
+        target_workbook.save(output_path)
+
+    def close(self) -> None:
+        if self._source_workbook is not None:
+            self._source_workbook.close()
+        self._source_workbook = None
+        self._source_key = None
+
+    def __enter__(self) -> "OpenpyxlSheetCopier":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _load_source(self, source_path: Path):
+        stat = source_path.stat()
+        key = (str(source_path.resolve()), stat.st_mtime_ns, stat.st_size)
+        if key != self._source_key:
+            self.close()
+            self._source_workbook = load_workbook(
+                source_path,
+                read_only=False,
+                data_only=False,
+                keep_links=True,
+            )
+            self._source_key = key
+        return self._source_workbook
+
+    def _copy_defined_names(
+        self,
+        source_workbook,
+        source_sheet: Worksheet,
+        target_workbook: Workbook,
+        target_sheet: Worksheet,
+    ) -> None:
+        for name, defined_name in source_workbook.defined_names.items():
+            if _refers_only_to_sheet(defined_name, source_sheet.title):
+                target_workbook.defined_names[name] = _clone_defined_name(defined_name)
+            else:
+                self.logger.debug("Skipping defined name %s outside sheet %s", name, source_sheet.title)
+
+        for name, defined_name in source_sheet.defined_names.items():
+            target_sheet.defined_names[name] = _clone_defined_name(defined_name)
+
+
+class ExcelSheetCopier:
+    """Sheet copier that keeps one hidden Excel session per source workbook.
+
+    Excel is started and the source opened on the first copy; further sheets of
+    the same file reuse both. Use one instance per thread, since the COM
+    session belongs to the thread that created it, and call ``close`` when done.
+    """
+
+    def __init__(self, logger: logging.Logger | None = None):
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self._app = None
+        self._source_path: Path | None = None
+        self._source_book = None
+        self._com_initialized = False
+
+    def __call__(self, source_path: str | Path, sheet_name: str, output_path: str | Path) -> None:
+        source_book = self._open_source(Path(source_path))
+        output_book = None
+        try:
+            source_book.sheets[sheet_name].api.Copy()
+            output_book = self._app.books.active
+            output_book.save(str(Path(output_path).resolve()))
+        finally:
+            if output_book is not None:
+                output_book.close()
+
+    def close(self) -> None:
+        try:
+            if self._source_book is not None:
+                self._source_book.close()
+        finally:
+            self._source_book = None
+            self._source_path = None
+            try:
+                if self._app is not None:
+                    self._app.quit()
+            finally:
+                self._app = None
+                if self._com_initialized:
+                    import pythoncom
+
+                    pythoncom.CoUninitialize()
+                    self._com_initialized = False
+
+    def __enter__(self) -> "ExcelSheetCopier":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _open_source(self, source_path: Path):
+        resolved_path = source_path.resolve()
+        if self._source_book is not None and resolved_path == self._source_path:
+            return self._source_book
+
+        if self._app is None:
+            self._start_excel()
+        if self._source_book is not None:
+            self._source_book.close()
+            self._source_book = None
+        self._source_book = self._app.books.open(
+            str(resolved_path),
+            update_links=False,
+            read_only=True,
+        )
+        self._source_path = resolved_path
+        return self._source_book
+
+    def _start_excel(self) -> None:
+        if platform.system() != "Windows":
+            raise RuntimeError(
+                "Rozdělení listů vyžaduje Windows s nainstalovaným Microsoft Excelem"
+            )
+
+        try:
+            import xlwings as xw
+        except ImportError as exc:
+            raise RuntimeError("Knihovna xlwings není dostupná") from exc
+
+        try:
+            import pythoncom
+        except ImportError:
+            pythoncom = None
+        if pythoncom is not None:
+            # Worker threads need their own COM apartment before talking to Excel.
+            pythoncom.CoInitialize()
+            self._com_initialized = True
+
+        self._app = xw.App(visible=False, add_book=False)
+        self._app.display_alerts = False
+        self._app.screen_updating = False
+
+
+def _refers_only_to_sheet(defined_name: DefinedName, sheet_title: str) -> bool:
+    if defined_name.type != "RANGE":
+        # Constants survive the split; formulas may point at sheets that are not copied.
+        return "!" not in (defined_name.attr_text or "")
+    destinations = list(defined_name.destinations)
+    return bool(destinations) and all(
+        title == sheet_title and cell_range for title, cell_range in destinations
+    )
+
+
+def _clone_defined_name(defined_name: DefinedName) -> DefinedName:
+    clone = copy(defined_name)
+    clone.localSheetId = None
+    return clone
+
+
+def copy_worksheet(source: Worksheet, target: Worksheet) -> None:
+    """Copy cells, styles and sheet-level settings between workbooks."""
+    _copy_cells(source, target)
+
+    for merged_range in source.merged_cells.ranges:
+        target.merge_cells(str(merged_range))
+
+    for key, dimension in source.column_dimensions.items():
+        target_dimension = target.column_dimensions[key]
+        target_dimension.min = dimension.min
+        target_dimension.max = dimension.max
+        target_dimension.width = dimension.width
+        target_dimension.hidden = dimension.hidden
+        target_dimension.outlineLevel = dimension.outlineLevel
+        target_dimension.collapsed = dimension.collapsed
+        target_dimension.bestFit = dimension.bestFit
+
+    for index, dimension in source.row_dimensions.items():
+        target_dimension = target.row_dimensions[index]
+        target_dimension.height = dimension.height
+        target_dimension.hidden = dimension.hidden
+        target_dimension.outlineLevel = dimension.outlineLevel
+        target_dimension.collapsed = dimension.collapsed
+
+    for validation in source.data_validations.dataValidation:
+        target.add_data_validation(copy(validation))
+
+    for conditional_range in source.conditional_formatting:
+        for rule in conditional_range.rules:
+            target.conditional_formatting.add(str(conditional_range.sqref), copy(rule))
+
+    for image in getattr(source, "_images", []):
+        target.add_image(image)
+
+    target.sheet_format = copy(source.sheet_format)
+    target.sheet_properties = copy(source.sheet_properties)
+    target.sheet_view.zoomScale = source.sheet_view.zoomScale
+    target.sheet_view.showGridLines = source.sheet_view.showGridLines
+    target.freeze_panes = source.freeze_panes
+    target.page_setup = copy(source.page_setup)
+    target.print_options = copy(source.print_options)
+    target.page_margins = copy(source.page_margins)
+    target.HeaderFooter = copy(source.HeaderFooter)
+    target.protection = copy(source.protection)
+    target.auto_filter.ref = source.auto_filter.ref
+    if source.print_area:
+        target.print_area = source.print_area
+    target.print_title_rows = source.print_title_rows
+    target.print_title_cols = source.print_title_cols
+
+
+def _copy_cells(source: Worksheet, target: Worksheet) -> None:
+    # Style arrays index into per-workbook style tables, so each distinct source style is
+    # registered in the target once and its resulting array reused for every other cell.
+    style_map: dict[tuple[int, ...], Any] = {}
+    for row in source.iter_rows():
+        for cell in row:
+            if cell.value is None and not cell.has_style:
+                continue
+            target_cell = target.cell(row=cell.row, column=cell.column, value=cell.value)
+            if cell.has_style:
+                style_key = tuple(cell._style)
+                target_style = style_map.get(style_key)
+                if target_style is None:
+                    target_cell.font = copy(cell.font)
+                    target_cell.fill = copy(cell.fill)
+                    target_cell.border = copy(cell.border)
+                    target_cell.alignment = copy(cell.alignment)
+                    target_cell.protection = copy(cell.protection)
+                    target_cell.number_format = cell.number_format
+                    style_map[style_key] = copy(target_cell._style)
+                else:
+                    target_cell._style = copy(target_style)
+            if cell.hyperlink is not None:
+                target_cell.hyperlink = copy(cell.hyperlink)
+            if cell.comment is not None:
+                target_cell.comment = copy(cell.comment)
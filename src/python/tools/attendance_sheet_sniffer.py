@@ -0,0 +1,203 @@
+"""Read sheet names, states and header cells of xlsx workbooks without loading them."""
+
+from __future__ import annotations
+
+import posixpath
+import zipfile
+from pathlib import Path
+from typing import IO, Any, Iterable
+from xml.etree import ElementTree
+
+
+SPREADSHEET_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+PACKAGE_RELATIONSHIP_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+RELATIONSHIP_ID = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
+WORKSHEET_RELATIONSHIP = "/worksheet"
+SHARED_STRINGS_RELATIONSHIP = "/sharedStrings"
+
+_ROW = f"{SPREADSHEET_NS}row"
+_CELL = f"{SPREADSHEET_NS}c"
+_VALUE = f"{SPREADSHEET_NS}v"
+_FORMULA = f"{SPREADSHEET_NS}f"
+_INLINE_STRING = f"{SPREADSHEET_NS}is"
+_TEXT = f"{SPREADSHEET_NS}t"
+_PHONETIC_RUN = f"{SPREADSHEET_NS}rPh"
+_SHARED_STRING = f"{SPREADSHEET_NS}si"
+_SHEET_DATA = f"{SPREADSHEET_NS}sheetData"
+
+
+class SheetSniffError(ValueError):
+    """The workbook layout is not understood by the sniffer; load it fully instead."""
+
+
+def sniff_sheet_headers(
+    file_path: str | Path,
+    cell_references: Iterable[str] = ("B6", "B7"),
+) -> list[dict[str, Any]]:
+    """Return worksheets in workbook order with their state and requested cell values.
+
+    Only ``xl/workbook.xml``, its relationships, the sheet rows up to the last
+    requested cell and the referenced shared strings are parsed.
+    """
+    references = tuple(reference.upper() for reference in cell_references)
+    last_row = max((_row_number(reference) for reference in references), default=0)
+
+    with zipfile.ZipFile(file_path) as archive:
+        relationships = _read_workbook_relationships(archive)
+        workbook_xml = _read_xml(archive, "xl/workbook.xml")
+
+        sheets = []
+        for sheet in workbook_xml.iter(f"{SPREADSHEET_NS}sheet"):
+            relationship = relationships.get(sheet.get(RELATIONSHIP_ID))
+            if relationship is None:
+                raise SheetSniffError(f"Sheet {sheet.get('name')} has no workbook relationship")
+            relationship_type, member = relationship
+            # Chartsheets and dialog sheets are not worksheets and openpyxl skips them too.
+            if not relationship_type.endswith(WORKSHEET_RELATIONSHIP):
+                continue
+            try:
+                with archive.open(member) as stream:
+                    raw_cells = _stream_cells(stream, references, last_row)
+            except KeyError as exc:
+                raise SheetSniffError(f"Missing worksheet part {member}") from exc
+            sheets.append(
+                {
+                    "sheet_name": sheet.get("name"),
+                    "sheet_state": sheet.get("state") or "visible",
+                    "cells": raw_cells,
+                }
+            )
+
+        shared_indexes = {
+            int(value)
+            for sheet in sheets
+            for cell_type, value in sheet["cells"].values()
+            if cell_type == "s"
+        }
+        shared_strings = _read_shared_strings(
+            archive,
+            next(
+                (
+                    member
+                    for relationship_type, member in relationships.values()
+                    if relationship_type.endswith(SHARED_STRINGS_RELATIONSHIP)
+                ),
+                None,
+            ),
+            shared_indexes,
+        )
+
+    for sheet in sheets:
+        raw_cells = sheet["cells"]
+        values = {}
+        for reference in references:
+            cell_type, value = raw_cells.get(reference, (None, None))
+            if cell_type == "s":
+                value = shared_strings.get(int(value))
+            values[reference] = value
+        sheet["cells"] = values
+    return sheets
+
+
+def _row_number(reference: str) -> int:
+    digits = reference.lstrip("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+    if not digits.isdigit():
+        raise ValueError(f"Invalid cell reference: {reference}")
+    return int(digits)
+
+
+def _read_xml(archive: zipfile.ZipFile, member: str) -> ElementTree.Element:
+    try:
+        return ElementTree.fromstring(archive.read(member))
+    except KeyError as exc:
+        raise SheetSniffError(f"Missing workbook part {member}") from exc
+
+
+def _read_workbook_relationships(archive: zipfile.ZipFile) -> dict[str, tuple[str, str]]:
+    relationships = {}
+    rels_xml = _read_xml(archive, "xl/_rels/workbook.xml.rels")
+    for relationship in rels_xml.iter(f"{PACKAGE_RELATIONSHIP_NS}Relationship"):
+        target = relationship.get("Target", "")
+        member = target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join("xl", target))
+        relationships[relationship.get("Id")] = (relationship.get("Type", ""), member)
+    return relationships
+
+
+def _string_text(element: ElementTree.Element) -> str:
+    # Rich text splits a string into runs; phonetic guides are not part of the value.
+    parts = []
+    for child in element:
+        if child.tag == _TEXT:
+            parts.append(child.text or "")
+        elif child.tag != _PHONETIC_RUN:
+            parts.extend(text.text or "" for text in child.iter(_TEXT))
+    return "".join(parts)
+
+
+def _stream_cells(
+    stream: IO[bytes],
+    references: tuple[str, ...],
+    last_row: int,
+) -> dict[str, tuple[str | None, str | None]]:
+    cells: dict[str, tuple[str | None, str | None]] = {}
+    for event, element in ElementTree.iterparse(stream, events=("start", "end")):
+        if event == "start":
+            if element.tag == _ROW:
+                row_number = element.get("r")
+                if row_number is None:
+                    raise SheetSniffError("Sheet row without a row number")
+                if int(row_number) > last_row:
+                    break
+            continue
+
+        if element.tag == _CELL:
+            reference = element.get("r")
+            if reference is None:
+                raise SheetSniffError("Sheet cell without a reference")
+            if reference in references:
+                cells[reference] = _cell_value(element)
+            element.clear()
+        elif element.tag == _ROW:
+            element.clear()
+        elif element.tag == _SHEET_DATA:
+            break
+    return cells
+
+
+def _cell_value(element: ElementTree.Element) -> tuple[str | None, str | None]:
+    cell_type = element.get("t")
+    formula = element.find(_FORMULA)
+    if formula is not None and formula.text:
+        # Match openpyxl with data_only=False, which returns the formula, not its cached result.
+        return "f", f"={formula.text}"
+    if cell_type == "inlineStr":
+        inline = element.find(_INLINE_STRING)
+        return cell_type, None if inline is None else _string_text(inline)
+    value = element.find(_VALUE)
+    return cell_type, None if value is None else value.text
+
+
+def _read_shared_strings(
+    archive: zipfile.ZipFile,
+    member: str | None,
+    indexes: set[int],
+) -> dict[int, str]:
+    strings: dict[int, str] = {}
+    if not indexes:
+        return strings
+    if member is None:
+        raise SheetSniffError("Shared string referenced without a shared string table")
+
+    last_index = max(indexes)
+    index = -1
+    with archive.open(member) as stream:
+        for _event, element in ElementTree.iterparse(stream, events=("end",)):
+            if element.tag != _SHARED_STRING:
+                continue
+            index += 1
+            if index in indexes:
+                strings[index] = _string_text(element)
+            element.clear()
+            if index >= last_index:
+                break
+    return strings
@@ -3,14 +3,20 @@
 from __future__ import annotations
 
 import logging
-import platform
 import re
+import threading
 import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from pathlib import Path
 from typing import Any
+from xml.etree.ElementTree import ParseError
 
 from openpyxl import load_workbook
 
+from .attendance_sheet_copier import ExcelSheetCopier, OpenpyxlSheetCopier
+from .attendance_sheet_sniffer import SheetSniffError, sniff_sheet_headers
+
 
 class AttendanceSplitter:
     """Inspect and split workbooks containing multiple attendance sheets."""
@@ -18,10 +24,25 @@ class AttendanceSplitter:
     OUTPUT_DIRECTORY_NAME = "rozdelene_dochazky"
     OUTPUT_FILENAME_PREFIX = "dochazka_inovace"
     SUPPORTED_SUFFIXES = {".xlsx"}
+    BACKEND_OPENPYXL = "openpyxl"
+    BACKEND_EXCEL = "excel"
+    BACKENDS = (BACKEND_OPENPYXL, BACKEND_EXCEL)
+    DEFAULT_MAX_WORKERS = 2
 
-    def __init__(self, logger: logging.Logger | None = None, sheet_copier=None):
+    def __init__(
+        self,
+        logger: logging.Logger | None = None,
+        sheet_copier=None,
+        backend: str = BACKEND_OPENPYXL,
+        max_workers: int | None = None,
+    ):
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unsupported sheet copier backend: {backend}")
         self.logger = logger or logging.getLogger(self.__class__.__name__)
         self.sheet_copier = sheet_copier
+        self.backend = backend
+        self.max_workers = max_workers or self.DEFAULT_MAX_WORKERS
+        self._output_lock = threading.Lock()
 
     @staticmethod
     def _normalize_cell(value: Any) -> str:
@@ -33,9 +54,9 @@ class AttendanceSplitter:
         )
         return " ".join(without_diacritics.lower().split())
 
-    def _is_attendance_sheet(self, sheet) -> bool:
-        b6 = self._normalize_cell(sheet["B6"].value)
-        b7 = self._normalize_cell(sheet["B7"].value)
+    def _is_attendance_header(self, b6: Any, b7: Any) -> bool:
+        b6 = self._normalize_cell(b6)
+        b7 = self._normalize_cell(b7)
         return "datum aktivity" in b6 and (
             "cas zahajeni" in b7 or "forma vyuky" in b7
         )
@@ -50,28 +71,44 @@ class AttendanceSplitter:
             "skipped_sheets": [],
         }
 
-        workbook = load_workbook(path, read_only=False, data_only=False, keep_links=True)
         try:
-            for sheet in workbook.worksheets:
-                if sheet.sheet_state != "visible":
-                    result["skipped_sheets"].append(
-                        {"sheet_name": sheet.title, "reason": "Skrytý list"}
-                    )
-                elif self._is_attendance_sheet(sheet):
-                    result["attendance_sheets"].append(sheet.title)
-                else:
-                    result["skipped_sheets"].append(
-                        {
-                            "sheet_name": sheet.title,
-                            "reason": "List neodpovídá formátu docházky",
-                        }
-                    )
-        finally:
-            workbook.close()
+            sheets = [
+                (sheet["sheet_name"], sheet["sheet_state"], sheet["cells"]["B6"], sheet["cells"]["B7"])
+                for sheet in sniff_sheet_headers(path, ("B6", "B7"))
+            ]
+        except (SheetSniffError, ParseError) as exc:
+            self.logger.debug("Falling back to full load of %s: %s", path, exc)
+            sheets = self._read_sheet_headers_with_openpyxl(path)
+
+        for sheet_name, sheet_state, b6, b7 in sheets:
+            if sheet_state != "visible":
+                result["skipped_sheets"].append(
+                    {"sheet_name": sheet_name, "reason": "Skrytý list"}
+                )
+            elif self._is_attendance_header(b6, b7):
+                result["attendance_sheets"].append(sheet_name)
+            else:
+                result["skipped_sheets"].append(
+                    {
+                        "sheet_name": sheet_name,
+                        "reason": "List neodpovídá formátu docházky",
+                    }
+                )
 
         result["eligible"] = len(result["attendance_sheets"]) >= 2
         return result
 
+    @staticmethod
+    def _read_sheet_headers_with_openpyxl(path: Path) -> list[tuple[str, str, Any, Any]]:
+        workbook = load_workbook(path, read_only=False, data_only=False, keep_links=True)
+        try:
+            return [
+                (sheet.title, sheet.sheet_state, sheet["B6"].value, sheet["B7"].value)
+                for sheet in workbook.worksheets
+            ]
+        finally:
+            workbook.close()
+
     def scan_folder(self, folder_path: str | Path) -> list[dict[str, Any]]:
         folder = Path(folder_path)
         matches = []
@@ -104,14 +141,19 @@ class AttendanceSplitter:
         safe_name = safe_name.strip("_").lower()
         return safe_name or "list"
 
-    def build_output_path(self, output_dir: str | Path, sheet_name: str) -> Path:
+    def build_output_path(
+        self,
+        output_dir: str | Path,
+        sheet_name: str,
+        reserved_paths: set[Path] | None = None,
+    ) -> Path:
         folder = Path(output_dir)
         normalized_name = self.normalize_sheet_name(sheet_name)
         base_name = f"{self.OUTPUT_FILENAME_PREFIX}_{normalized_name}"
         candidate = folder / f"{base_name}.xlsx"
         suffix = 2
 
-        while candidate.exists():
+        while candidate.exists() or (reserved_paths is not None and candidate in reserved_paths):
             candidate = folder / f"{base_name}_{suffix}.xlsx"
             suffix += 1
 
@@ -123,50 +165,83 @@ class AttendanceSplitter:
         options: dict[str, Any] | None = None,
     ) -> dict[str, Any]:
         del options
-        file_results = []
-        created_count = 0
-        failed_count = 0
-
-        for file_path in files:
-            source_path = Path(file_path)
-            file_result = {
-                "source": str(source_path),
-                "output_dir": str(source_path.parent / self.OUTPUT_DIRECTORY_NAME),
-                "status": "error",
-                "created_files": [],
-                "skipped_sheets": [],
-                "errors": [],
-            }
+        source_paths = [Path(file_path) for file_path in files]
+        # Sources sharing a folder also share the output folder, so names are claimed up front.
+        reserved_paths: set[Path] = set()
+
+        if len(source_paths) <= 1 or self.max_workers <= 1:
+            file_results = [
+                self._process_source(source_path, reserved_paths)
+                for source_path in source_paths
+            ]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(source_paths))) as executor:
+                file_results = list(
+                    executor.map(
+                        lambda source_path: self._process_source(source_path, reserved_paths),
+                        source_paths,
+                    )
+                )
 
-            try:
-                inspection = self.inspect_workbook(source_path)
-                file_result["skipped_sheets"] = inspection["skipped_sheets"]
-            except Exception as exc:
-                file_result["errors"].append(f"Soubor nelze načíst: {exc}")
-                failed_count += 1
-                file_results.append(file_result)
-                continue
+        created_count = sum(len(file_result["created_files"]) for file_result in file_results)
+        failed_count = sum(len(file_result["errors"]) for file_result in file_results)
 
-            if not inspection["eligible"]:
-                file_result["errors"].append(
-                    "Soubor neobsahuje alespoň dva vhodné listy docházky"
-                )
-                failed_count += 1
-                file_results.append(file_result)
-                continue
+        if created_count and failed_count:
+            status = "partial"
+        elif created_count:
+            status = "success"
+        else:
+            status = "error"
+
+        return {
+            "success": created_count > 0,
+            "status": status,
+            "data": {
+                "files": file_results,
+                "created_count": created_count,
+                "failed_count": failed_count,
+            },
+        }
+
+    def _process_source(self, source_path: Path, reserved_paths: set[Path]) -> dict[str, Any]:
+        file_result = {
+            "source": str(source_path),
+            "output_dir": str(source_path.parent / self.OUTPUT_DIRECTORY_NAME),
+            "status": "error",
+            "created_files": [],
+            "skipped_sheets": [],
+            "errors": [],
+        }
 
-            output_dir = Path(file_result["output_dir"])
-            output_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            inspection = self.inspect_workbook(source_path)
+            file_result["skipped_sheets"] = inspection["skipped_sheets"]
+        except Exception as exc:
+            file_result["errors"].append(f"Soubor nelze načíst: {exc}")
+            return file_result
+
+        if not inspection["eligible"]:
+            file_result["errors"].append(
+                "Soubor neobsahuje alespoň dva vhodné listy docházky"
+            )
+            return file_result
 
+        output_dir = Path(file_result["output_dir"])
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        # One copier session per source: the workbook is opened once for all of its sheets.
+        with self._open_copy_session() as copy_sheet:
             for sheet_name in inspection["attendance_sheets"]:
                 requested_filename = (
                     f"{self.OUTPUT_FILENAME_PREFIX}_"
                     f"{self.normalize_sheet_name(sheet_name)}.xlsx"
                 )
-                output_path = self.build_output_path(output_dir, sheet_name)
+                with self._output_lock:
+                    output_path = self.build_output_path(output_dir, sheet_name, reserved_paths)
+                    reserved_paths.add(output_path)
                 renamed_to_avoid_overwrite = output_path.name != requested_filename
                 try:
-                    self._copy_sheet(source_path, sheet_name, output_path)
+                    copy_sheet(source_path, sheet_name, output_path)
                     file_result["created_files"].append(
                         {
                             "sheet_name": sheet_name,
@@ -176,84 +251,20 @@ class AttendanceSplitter:
                             "renamed_to_avoid_overwrite": renamed_to_avoid_overwrite,
                         }
                     )
-                    created_count += 1
                 except Exception as exc:
                     if output_path.exists():
                         output_path.unlink()
                     file_result["errors"].append(f"{sheet_name}: {exc}")
-                    failed_count += 1
-
-            if file_result["created_files"] and file_result["errors"]:
-                file_result["status"] = "partial"
-            elif file_result["created_files"]:
-                file_result["status"] = "success"
 
-            file_results.append(file_result)
-
-        if created_count and failed_count:
-            status = "partial"
-        elif created_count:
-            status = "success"
-        else:
-            status = "error"
-
-        return {
-            "success": created_count > 0,
-            "status": status,
-            "data": {
-                "files": file_results,
-                "created_count": created_count,
-                "failed_count": failed_count,
-            },
-        }
+        if file_result["created_files"] and file_result["errors"]:
+            file_result["status"] = "partial"
+        elif file_result["created_files"]:
+            file_result["status"] = "success"
+        return file_result
 
-    def _copy_sheet(
-        self,
-        source_path: Path,
-        sheet_name: str,
-        output_path: Path,
-    ) -> None:
+    def _open_copy_session(self):
         if self.sheet_copier is not None:
-            self.sheet_copier(source_path, sheet_name, output_path)
-            return
-
-        self._copy_sheet_with_xlwings(source_path, sheet_name, output_path)
-
-    @staticmethod
-    def _copy_sheet_with_xlwings(
-        source_path: Path,
-        sheet_name: str,
-        output_path: Path,
-    ) -> None:
-        if platform.system() != "Windows":
-            raise RuntimeError(
-                "Rozdělení listů vyžaduje Windows s nainstalovaným Microsoft Excelem"
-            )
-
-        try:
-            import xlwings as xw
-        except ImportError as exc:
-            raise RuntimeError("Knihovna xlwings není dostupná") from exc
-
-        app = None
-        source_book = None
-        output_book = None
-        try:
-            app = xw.App(visible=False, add_book=False)
-            app.display_alerts = False
-            app.screen_updating = False
-            source_book = app.books.open(
-                str(source_path.resolve()),
-                update_links=False,
-                read_only=True,
-            )
-            source_book.sheets[sheet_name].api.Copy()
-            output_book = app.books.active
-            output_book.save(str(output_path.resolve()))
-        finally:
-            if output_book is not None:
-                output_book.close()
-            if source_book is not None:
-                source_book.close()
-            if app is not None:
-                app.quit()
+            return nullcontext(self.sheet_copier)
+        if self.backend == self.BACKEND_EXCEL:
+            return ExcelSheetCopier(self.logger)
+        return OpenpyxlSheetCopier(self.logger)
@@ -1,27 +1,75 @@
 from __future__ import annotations
 
+import math
+import time
 from dataclasses import asdict
 from pathlib import Path
 from typing import Any, Dict, List
 
-from dvpp_cert_extraction import collect_input_files, validate_input_file
-from dvpp_certificates.domain import ExtractionBatch, RecordOrigin, WorkingRecord
+from dvpp_cert_extraction import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_MAX_RETRIES,
+    FileExtractionOutcome,
+    collect_input_files,
+    validate_input_file,
+)
+from dvpp_certificates.batch_store import BatchNotFoundError, CertificateBatchStore
+from dvpp_certificates.domain import ExtractionBatch, RecordOrigin, RecordTable
 from dvpp_certificates.exporters import (
     export_records_to_esf_csv,
     export_records_to_excel,
     export_records_to_tsv,
 )
 from dvpp_certificates.importers import GeminiCertificateImporter
-from dvpp_certificates.normalization import normalize_certificate_fields
-from dvpp_certificates.raw_text_parser import parse_raw_text_batch
+from dvpp_certificates.normalization import normalize_many
+from dvpp_certificates.raw_text_parser import RawTextParseError, parse_raw_text_batch
 
 from .base_tool import BaseTool
 
 
+METRIC_PERCENTILES = (50, 90, 99)
+
+
+def _percentiles(values: list[float]) -> dict[str, float]:
+    if not values:
+        return {}
+    ordered = sorted(values)
+    summary = {
+        f"p{percentile}": ordered[max(0, math.ceil(percentile / 100 * len(ordered)) - 1)]
+        for percentile in METRIC_PERCENTILES
+    }
+    summary["max"] = ordered[-1]
+    return summary
+
+
+def _positive_option(value: Any, cast: type, *, allow_zero: bool = False) -> int | float | None:
+    if value is None or value == "":
+        return None
+    try:
+        number = cast(value)
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError(value) from None
+    if not math.isfinite(number) or number < 0 or (number == 0 and not allow_zero):
+        raise ValueError(value)
+    return number
+
+
 class DvppCertificateProcessor(BaseTool):
-    def __init__(self, logger=None, importer: GeminiCertificateImporter | None = None):
+    def __init__(
+        self,
+        logger=None,
+        importer: GeminiCertificateImporter | None = None,
+        batch_store: CertificateBatchStore | None = None,
+    ):
         super().__init__(logger)
         self.importer = importer or GeminiCertificateImporter()
+        self.batch_store = batch_store
+
+    def close(self) -> None:
+        close_importer = getattr(self.importer, "close", None)
+        if close_importer is not None:
+            close_importer()
 
     def scan_folder(self, folder_path: str) -> list[dict[str, str]]:
         folder = Path(str(folder_path)).expanduser()
@@ -62,6 +110,30 @@ class DvppCertificateProcessor(BaseTool):
             self.add_error("Nebyl zvolen Gemini model")
             return False
 
+        try:
+            _positive_option(options.get("max_concurrency"), int)
+        except ValueError:
+            self.add_error("Počet souběžných požadavků musí být kladné celé číslo")
+            return False
+
+        try:
+            _positive_option(options.get("requests_per_minute"), float)
+        except ValueError:
+            self.add_error("Počet požadavků za minutu musí být kladné číslo")
+            return False
+
+        try:
+            _positive_option(options.get("max_retries"), int, allow_zero=True)
+        except ValueError:
+            self.add_error("Počet opakování požadavku musí být nezáporné celé číslo")
+            return False
+
+        try:
+            _positive_option(options.get("batch_size"), int)
+        except ValueError:
+            self.add_error("Počet souborů v jednom požadavku musí být kladné celé číslo")
+            return False
+
         try:
             if files:
                 for file_path in files:
@@ -86,65 +158,59 @@ class DvppCertificateProcessor(BaseTool):
         batch = ExtractionBatch(input_mode="gemini", source_folder=folder_path)
         diagnostics: list[dict[str, Any]] = []
 
-        for file_path in resolved_files:
+        outcomes = self._import_files(resolved_files, model_name, api_key, options)
+        for outcome in outcomes:
+            file_path = outcome.source_file
             try:
-                result = self.importer.import_file(
-                    file_path,
-                    model_name=model_name,
-                    api_key=api_key,
-                )
-                for index, certificate in enumerate(result.certificates, start=1):
-                    origin = RecordOrigin(
-                        source_mode="gemini",
+                if outcome.result is None:
+                    raise ValueError(outcome.error or "Extraction failed")
+                result = outcome.result
+                origins = [
+                    RecordOrigin(
+                        source_mode="text_layer" if outcome.text_layer else "gemini",
                         source_file=file_path,
-                        model_name=model_name,
+                        model_name="" if outcome.text_layer else model_name,
                         source_index=index,
                     )
-                    normalized = normalize_certificate_fields(
-                        asdict(certificate),
-                        origin=origin,
-                    )
-                    batch.records.append(WorkingRecord(extracted_record=normalized))
-
-                diagnostics.append(
-                    {
-                        "source_file": file_path,
-                        "success": True,
-                        "record_count": len(result.certificates),
-                        "warnings": [],
-                        "errors": [],
-                    }
-                )
+                    for index in range(1, len(result.certificates) + 1)
+                ]
+                for normalized in normalize_many(
+                    (asdict(certificate) for certificate in result.certificates),
+                    origins,
+                ):
+                    batch.records.append(normalized)
+
+                diagnostics.append(self._build_diagnostic(outcome, len(result.certificates)))
             except Exception as exc:
                 error_message = str(exc)
                 batch.errors.append(f"{Path(file_path).name}: {error_message}")
-                diagnostics.append(
-                    {
-                        "source_file": file_path,
-                        "success": False,
-                        "record_count": 0,
-                        "warnings": [],
-                        "errors": [error_message],
-                    }
-                )
+                diagnostics.append(self._build_diagnostic(outcome, 0, error_message))
 
         successful_files = sum(1 for item in diagnostics if item["success"])
         failed_files = len(diagnostics) - successful_files
+        cached_files = sum(1 for item in diagnostics if item["cache_hit"])
+        text_layer_files = sum(1 for item in diagnostics if item["text_layer"])
 
         if failed_files:
             self.add_warning(
                 f"Nepodařilo se zpracovat {failed_files} z {len(diagnostics)} souborů"
             )
 
+        batch_id = self._store_batch(batch)
+        duplicates = self._batch_duplicates(batch_id)
         batch.warnings.extend(self.warnings)
 
         data = {
-            "batch": self._serialize_batch(batch),
+            "batch": self._serialize_batch(batch, batch_id),
             "diagnostics": diagnostics,
             "processedFiles": len(diagnostics),
             "successfulFiles": successful_files,
             "failedFiles": failed_files,
+            "cachedFiles": cached_files,
+            "textLayerFiles": text_layer_files,
             "modelName": model_name,
+            "metrics": self._summarize_metrics(diagnostics),
+            "duplicates": duplicates,
         }
 
         if not batch.records:
@@ -157,22 +223,123 @@ class DvppCertificateProcessor(BaseTool):
 
         return self.get_result(True, data)
 
+    def _import_files(
+        self,
+        file_paths: list[str],
+        model_name: str,
+        api_key: str | None,
+        options: Dict[str, Any],
+    ) -> list[FileExtractionOutcome]:
+        import_files = getattr(self.importer, "import_files", None)
+        if import_files is not None:
+            max_retries = _positive_option(options.get("max_retries"), int, allow_zero=True)
+            return import_files(
+                file_paths,
+                model_name=model_name,
+                api_key=api_key,
+                max_concurrency=_positive_option(options.get("max_concurrency"), int) or DEFAULT_MAX_CONCURRENCY,
+                requests_per_minute=_positive_option(options.get("requests_per_minute"), float),
+                max_retries=DEFAULT_MAX_RETRIES if max_retries is None else max_retries,
+                bypass_cache=bool(options.get("bypass_cache")),
+                batch_size=_positive_option(options.get("batch_size"), int) or DEFAULT_BATCH_SIZE,
+                use_text_layer=options.get("use_text_layer", True) is not False,
+            )
+
+        outcomes: list[FileExtractionOutcome] = []
+        for file_path in file_paths:
+            outcome = FileExtractionOutcome(source_file=file_path, attempts=1)
+            started_at = time.perf_counter()
+            try:
+                outcome.result = self.importer.import_file(
+                    file_path,
+                    model_name=model_name,
+                    api_key=api_key,
+                )
+            except Exception as exc:
+                outcome.error = str(exc)
+            outcome.wall_time_ms = (time.perf_counter() - started_at) * 1000
+            outcomes.append(outcome)
+        return outcomes
+
+    def _build_diagnostic(
+        self,
+        outcome: FileExtractionOutcome,
+        record_count: int,
+        error_message: str | None = None,
+    ) -> dict[str, Any]:
+        return {
+            "source_file": outcome.source_file,
+            "file_type": Path(outcome.source_file).suffix.lower().lstrip("."),
+            "success": error_message is None,
+            "record_count": record_count,
+            "cache_hit": outcome.cache_hit,
+            "text_layer": outcome.text_layer,
+            "wall_time_ms": round(outcome.wall_time_ms, 1),
+            "queue_wait_ms": round(outcome.queue_wait_ms, 1),
+            "retries": outcome.retries,
+            **asdict(outcome.usage),
+            "warnings": [],
+            "errors": [] if error_message is None else [error_message],
+        }
+
+    def _summarize_metrics(self, diagnostics: list[dict[str, Any]]) -> dict[str, Any]:
+        wall_times_by_type: dict[str, list[float]] = {}
+        for item in diagnostics:
+            wall_times_by_type.setdefault(item["file_type"], []).append(item["wall_time_ms"])
+
+        return {
+            "wallTimeMs": _percentiles([item["wall_time_ms"] for item in diagnostics]),
+            "wallTimeMsByFileType": {
+                file_type: _percentiles(values) for file_type, values in sorted(wall_times_by_type.items())
+            },
+            "queueWaitMs": _percentiles([item["queue_wait_ms"] for item in diagnostics]),
+            "retries": sum(item["retries"] for item in diagnostics),
+            "requestBytes": sum(item["request_bytes"] for item in diagnostics),
+            "responseBytes": sum(item["response_bytes"] for item in diagnostics),
+            "inputTokens": sum(item["input_tokens"] for item in diagnostics),
+            "outputTokens": sum(item["output_tokens"] for item in diagnostics),
+        }
+
     def _resolve_files(self, files: List[str], folder_path: str) -> list[str]:
         if files:
             return [str(validate_input_file(file_path)) for file_path in files]
         return [str(path) for path in collect_input_files(folder_path)]
 
-    def _serialize_batch(self, batch: ExtractionBatch) -> dict[str, Any]:
+    def _store_batch(self, batch: ExtractionBatch) -> str | None:
+        if self.batch_store is None or not batch.records:
+            return None
+        return self.batch_store.add(batch)
+
+    def _batch_duplicates(self, batch_id: str | None) -> list[dict[str, Any]]:
+        if batch_id is None:
+            return []
+        duplicates = self.batch_store.duplicates(batch_id)
+        repeated = sum(1 for item in duplicates if item["scope"] != "person")
+        if repeated:
+            self.add_warning(f"Nalezeno {repeated} certifikátů, které už byly načteny dříve nebo se v dávce opakují")
+        return duplicates
+
+    def _resolve_records(
+        self,
+        records_payload: list[dict[str, Any]] | None,
+        batch_id: str | None,
+    ) -> RecordTable | list[dict[str, Any]]:
+        if not batch_id:
+            return records_payload or []
+        if self.batch_store is None:
+            raise BatchNotFoundError(batch_id)
+        return self.batch_store.get(batch_id).records
+
+    def _missing_batch_result(self) -> Dict[str, Any]:
+        self.add_error("Dávka certifikátů už není k dispozici, načtěte certifikáty znovu")
+        return self.get_result(False, {"batchMissing": True})
+
+    def _serialize_batch(self, batch: ExtractionBatch, batch_id: str | None = None) -> dict[str, Any]:
         return {
+            "batch_id": batch_id,
             "input_mode": batch.input_mode,
             "source_folder": batch.source_folder,
-            "records": [
-                {
-                    "extracted_record": asdict(record.extracted_record),
-                    "working_record": asdict(record.working_record),
-                }
-                for record in batch.records
-            ],
+            "records": batch.records.to_payload(),
             "warnings": batch.warnings.copy(),
             "errors": batch.errors.copy(),
             "export_metadata": asdict(batch.export_metadata),
@@ -180,33 +347,42 @@ class DvppCertificateProcessor(BaseTool):
 
     def export_tsv(
         self,
-        records_payload: list[dict[str, Any]],
+        records_payload: list[dict[str, Any]] | None,
         *,
         output_path: str | None = None,
+        batch_id: str | None = None,
     ) -> Dict[str, Any]:
         self.clear_messages()
         try:
-            data = export_records_to_tsv(records_payload, output_path=output_path)
+            data = export_records_to_tsv(
+                self._resolve_records(records_payload, batch_id),
+                output_path=output_path,
+            )
             return self.get_result(True, data)
+        except BatchNotFoundError:
+            return self._missing_batch_result()
         except Exception as exc:
             self.add_error(str(exc))
             return self.get_result(False)
 
     def export_excel(
         self,
-        records_payload: list[dict[str, Any]],
+        records_payload: list[dict[str, Any]] | None,
         export_metadata_payload: dict[str, Any],
         *,
         template_path: str | None = None,
         output_path: str | None = None,
+        batch_id: str | None = None,
+        workbook_writer: str | None = None,
     ) -> Dict[str, Any]:
         self.clear_messages()
         try:
             exported_path = export_records_to_excel(
-                records_payload,
+                self._resolve_records(records_payload, batch_id),
                 export_metadata_payload,
                 template_path=template_path,
                 output_path=output_path,
+                workbook_writer=workbook_writer,
             )
             return self.get_result(
                 True,
@@ -215,25 +391,30 @@ class DvppCertificateProcessor(BaseTool):
                     "template_path": template_path,
                 },
             )
+        except BatchNotFoundError:
+            return self._missing_batch_result()
         except Exception as exc:
             self.add_error(str(exc))
             return self.get_result(False)
 
     def export_esf(
         self,
-        records_payload: list[dict[str, Any]],
+        records_payload: list[dict[str, Any]] | None,
         *,
         export_metadata_payload: dict[str, Any] | None = None,
         output_path: str | None = None,
+        batch_id: str | None = None,
     ) -> Dict[str, Any]:
         self.clear_messages()
         try:
             data = export_records_to_esf_csv(
-                records_payload,
+                self._resolve_records(records_payload, batch_id),
                 export_metadata=export_metadata_payload,
                 output_path=output_path,
             )
             return self.get_result(True, data)
+        except BatchNotFoundError:
+            return self._missing_batch_result()
         except Exception as exc:
             self.add_error(str(exc))
             return self.get_result(False)
@@ -242,13 +423,49 @@ class DvppCertificateProcessor(BaseTool):
         self.clear_messages()
         try:
             batch = parse_raw_text_batch(raw_text)
+            batch_id = self._store_batch(batch)
+            duplicates = self._batch_duplicates(batch_id)
+            batch.warnings.extend(self.warnings)
             return self.get_result(
                 True,
                 {
-                    "batch": self._serialize_batch(batch),
+                    "batch": self._serialize_batch(batch, batch_id),
                     "processedRows": len(batch.records),
+                    "duplicates": duplicates,
                 },
             )
+        except RawTextParseError as exc:
+            for line_error in exc.line_errors:
+                self.add_error(str(line_error))
+            return self.get_result(False, {"invalidRows": len(exc.line_errors)})
         except Exception as exc:
             self.add_error(str(exc))
             return self.get_result(False)
+
+    def update_batch(self, batch_id: str, edits: list[dict[str, Any]]) -> Dict[str, Any]:
+        self.clear_messages()
+        if self.batch_store is None:
+            return self._missing_batch_result()
+        try:
+            return self.get_result(True, self.batch_store.apply_edits(batch_id, edits))
+        except BatchNotFoundError:
+            return self._missing_batch_result()
+        except Exception as exc:
+            self.add_error(str(exc))
+            return self.get_result(False)
+
+    def find_duplicates(self, batch_id: str) -> Dict[str, Any]:
+        self.clear_messages()
+        if self.batch_store is None:
+            return self._missing_batch_result()
+        try:
+            duplicates = self.batch_store.duplicates(batch_id)
+        except BatchNotFoundError:
+            return self._missing_batch_result()
+        return self.get_result(True, {"batch_id": batch_id, "duplicates": duplicates})
+
+    def discard_batch(self, batch_id: str) -> Dict[str, Any]:
+        self.clear_messages()
+        if self.batch_store is None or not self.batch_store.discard(batch_id):
+            self.add_warning("Dávka certifikátů nebyla nalezena")
+        return self.get_result(True, {"batch_id": batch_id})
@@ -1,15 +1,21 @@
 from __future__ import annotations
 
+import json
 import os
 import platform
 import re
+import threading
 import unicodedata
 import zipfile
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
+from itertools import chain, islice
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Sequence, TypeVar
 from xml.etree import ElementTree
 
+import numpy as np
 import pandas as pd
 from jinja2 import Environment, FileSystemLoader
 from openpyxl import load_workbook
@@ -21,6 +27,49 @@ SUPPORTED_SUFFIXES = {".xlsx", ".xlsm", ".xltx", ".xltm"}
 TEMP_FILE_PREFIX = "~$"
 WORKBOOK_NS = {"main": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
 REQUIRED_SCAN_SHEETS = {"postup vyplnovani", "podpory"}
+DATA_COLUMNS = ("first_name", "last_name", "support_hours", "sablona", "theme")
+HEADER_SCAN_ROWS = 40
+HEADER_SCAN_COLUMNS = 25
+METADATA_SCAN_ROWS = 15
+METADATA_SCAN_COLUMNS = 15
+WHITESPACE_RE = re.compile(r"\s+")
+DEFAULT_SCAN_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+DEFAULT_BATCH_WORKERS = 4
+MAX_BATCH_WORKERS = 16
+TEMPLATES_DIR = Path(__file__).resolve().parents[1] / "templates"
+REPORT_TEMPLATE_NAME = "dvpp_report_template.html"
+LAZY_TABLES_THRESHOLD = 1000
+SCAN_CACHE_FILENAME = "dvpp_scan_cache.json"
+SCAN_CACHE_VERSION = 1
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+
+@lru_cache(maxsize=4096)
+def _normalize_cell_text(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text.strip().lower())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return WHITESPACE_RE.sub(" ", text)
+
+
+def _row_value(row: Sequence[Any], col_index: int) -> Any:
+    return row[col_index - 1] if col_index <= len(row) else None
+
+
+@lru_cache(maxsize=1)
+def load_report_template():
+    """Compile the report template once and share it across renders and threads."""
+    env = Environment(loader=FileSystemLoader(str(TEMPLATES_DIR)))
+    env.policies["json.dumps_kwargs"] = {"ensure_ascii": False, "separators": (",", ":")}
+    return env.get_template(REPORT_TEMPLATE_NAME)
+
+
+def _table_payload(frame: pd.DataFrame | None) -> Dict[str, Any] | None:
+    if frame is None:
+        return None
+    values = frame.astype(object).where(frame.notna(), "")
+    return {"columns": [str(column) for column in frame.columns], "rows": values.values.tolist()}
 
 
 @dataclass(frozen=True)
@@ -35,9 +84,90 @@ class WorkbookMatch:
     modified_time: float
 
 
+@dataclass(frozen=True)
+class WorkbookExtraction:
+    match: WorkbookMatch
+    columns: Dict[str, List[Any]] = field(default_factory=dict)
+
+
+class DvppScanCache:
+    """On-disk cache of scan results keyed by workbook path, mtime and size."""
+
+    def __init__(self, cache_dir: str | Path):
+        self.cache_path = Path(cache_dir) / SCAN_CACHE_FILENAME
+        self._entries: Dict[str, Dict[str, Any]] | None = None
+        self._lock = threading.Lock()
+
+    def lookup(self, file_path: Path, project_dir: Path) -> tuple[bool, WorkbookMatch | None]:
+        """Return ``(hit, match)``; a hit with ``None`` marks a known non-DVPP workbook."""
+        stat = file_path.stat()
+        with self._lock:
+            entry = self._load().get(str(file_path))
+        if entry is None or entry.get("modified_time") != stat.st_mtime or entry.get("size") != stat.st_size:
+            return False, None
+        payload = entry.get("match")
+        if payload is None:
+            return True, None
+        return True, WorkbookMatch(
+            file_path=file_path,
+            relative_path=file_path.relative_to(project_dir).as_posix(),
+            modified_time=stat.st_mtime,
+            **payload,
+        )
+
+    def store(self, file_path: Path, match: WorkbookMatch | None) -> None:
+        stat = file_path.stat()
+        payload = None
+        if match is not None:
+            payload = asdict(match)
+            for key in ("file_path", "relative_path", "modified_time"):
+                payload.pop(key)
+        with self._lock:
+            self._load()[str(file_path)] = {
+                "modified_time": stat.st_mtime,
+                "size": stat.st_size,
+                "match": payload,
+            }
+
+    def prune(self, project_dir: Path, seen_paths: Iterable[Path]) -> None:
+        """Drop entries below ``project_dir`` whose workbooks no longer exist."""
+        prefix = str(project_dir).rstrip("\\/") + os.sep
+        keep = {str(path) for path in seen_paths}
+        with self._lock:
+            entries = self._load()
+            for key in [key for key in entries if key.startswith(prefix) and key not in keep]:
+                del entries[key]
+
+    def save(self) -> None:
+        with self._lock:
+            if self._entries is None:
+                return
+            payload = json.dumps({"version": SCAN_CACHE_VERSION, "entries": self._entries}, ensure_ascii=False)
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.cache_path.with_name(f"{self.cache_path.name}.{os.getpid()}.tmp")
+            temp_path.write_text(payload, encoding="utf-8")
+            os.replace(temp_path, self.cache_path)
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is None:
+            self._entries = {}
+            try:
+                raw_data = json.loads(self.cache_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                raw_data = {}
+            if isinstance(raw_data, dict) and raw_data.get("version") == SCAN_CACHE_VERSION:
+                self._entries = dict(raw_data.get("entries") or {})
+        return self._entries
+
+
 class DvppReportProcessor(BaseTool):
     """Scan project workbooks and generate a DVPP HTML summary report."""
 
+    def __init__(self, logger=None, scan_cache: DvppScanCache | None = None, max_workers: int | None = None):
+        super().__init__(logger)
+        self.scan_cache = scan_cache
+        self.max_workers = max_workers or DEFAULT_SCAN_WORKERS
+
     def validate_inputs(self, files: List[str], options: Dict[str, Any]) -> bool:
         self.clear_messages()
 
@@ -68,7 +198,8 @@ class DvppReportProcessor(BaseTool):
             return self.get_result(False)
 
         project_dir = self.normalize_input_path(str(options["project_dir"]))
-        selected_matches = self._build_matches_from_paths(project_dir, files)
+        extractions = self._build_extractions_from_paths(project_dir, files)
+        selected_matches = [extraction.match for extraction in extractions]
 
         if not selected_matches:
             self.add_error("Vybrané soubory neodpovídají DVPP struktuře")
@@ -78,7 +209,9 @@ class DvppReportProcessor(BaseTool):
         report_path = project_dir / report_filename
         title = f"Souhrnný report podpory DVPP - {project_dir.name}"
 
-        unique_persons = self.render_html_report(selected_matches, title, report_path)
+        unique_persons = self.render_html_report(
+            extractions, title, report_path, lazy_tables=options.get("lazy_tables")
+        )
 
         processed_data = {
             "files_processed": len(selected_matches),
@@ -92,21 +225,85 @@ class DvppReportProcessor(BaseTool):
         self.add_info(f"DVPP report uložen: {report_path}||{report_filename}")
         return self.get_result(True, processed_data)
 
+    def process_batch(self, projects: List[str | Mapping[str, Any]], max_workers: int | None = None) -> List[Dict[str, Any]]:
+        """Generate reports for several projects and return results in input order."""
+        results = list(self.iter_batch(projects, max_workers=max_workers))
+        results.sort(key=lambda item: item["index"])
+        return results
+
+    def iter_batch(self, projects: List[str | Mapping[str, Any]], max_workers: int | None = None) -> Iterator[Dict[str, Any]]:
+        """Generate reports for several projects concurrently, yielding each result as it completes.
+
+        Each project is either a project directory or a mapping with ``project_dir`` and
+        optional ``files``. Without ``files`` the whole project directory is scanned.
+        """
+        if not projects:
+            return
+        worker_count = min(max_workers or DEFAULT_BATCH_WORKERS, len(projects))
+        with ThreadPoolExecutor(max_workers=worker_count) as executor:
+            futures = {
+                executor.submit(self._process_batch_project, project): index
+                for index, project in enumerate(projects)
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                project = projects[index]
+                project_dir = project if isinstance(project, str) else project.get("project_dir")
+                try:
+                    result = future.result()
+                except Exception as exc:
+                    self.logger.error(f"DVPP report pro {project_dir} selhal: {exc}")
+                    result = {"success": False, "errors": [str(exc)], "warnings": [], "info": []}
+                yield {"index": index, "project_dir": str(project_dir or ""), **result}
+
+    def _process_batch_project(self, project: str | Mapping[str, Any]) -> Dict[str, Any]:
+        if isinstance(project, str):
+            project = {"project_dir": project}
+        project_dir = project.get("project_dir")
+        files = list(project.get("files") or [])
+
+        worker = DvppReportProcessor(self.logger, scan_cache=self.scan_cache, max_workers=1)
+        scan_warnings: List[str] = []
+        if not files and project_dir and worker.normalize_input_path(str(project_dir)).is_dir():
+            files = [match["file_path"] for match in worker.scan_project_directory(project_dir)]
+            scan_warnings = worker.warnings.copy()
+
+        result = worker.process(files, {"project_dir": project_dir, "lazy_tables": project.get("lazy_tables")})
+        result["warnings"] = scan_warnings + result["warnings"]
+        return result
+
     def scan_project_directory(self, project_dir: str | Path) -> List[Dict[str, Any]]:
         root = self.normalize_input_path(str(project_dir))
+        excel_files = self.iter_excel_files(root)
         matches: List[WorkbookMatch] = []
+        pending: List[Path] = []
+
+        for file_path in excel_files:
+            if self.scan_cache is not None:
+                hit, cached_match = self.scan_cache.lookup(file_path, root)
+                if hit:
+                    if cached_match is not None:
+                        matches.append(cached_match)
+                    continue
+            pending.append(file_path)
 
-        for file_path in self.iter_excel_files(root):
-            if not self.has_required_sheet_names(file_path):
-                continue
-            try:
-                match = self.inspect_workbook(file_path, root, strict_headers=False)
-            except Exception as exc:
-                self.add_warning(f"Soubor {file_path.name} nelze zpracovat: {exc}")
+        outcomes = self._map_parallel(lambda path: self._scan_workbook(path, root), pending)
+        for file_path, (match, error) in zip(pending, outcomes):
+            if error is not None:
+                self.add_warning(f"Soubor {file_path.name} nelze zpracovat: {error}")
                 continue
+            if self.scan_cache is not None:
+                self.scan_cache.store(file_path, match)
             if match is not None:
                 matches.append(match)
 
+        if self.scan_cache is not None:
+            self.scan_cache.prune(root, excel_files)
+            try:
+                self.scan_cache.save()
+            except OSError as exc:
+                self.logger.warning(f"DVPP scan cache nelze uložit: {exc}")
+
         matches.sort(key=lambda item: item.relative_path.lower())
         return [self._serialize_match(match) for match in matches]
 
@@ -121,11 +318,7 @@ class DvppReportProcessor(BaseTool):
     def normalize_text(self, value: object) -> str:
         if value is None:
             return ""
-        text = str(value).strip().lower()
-        text = unicodedata.normalize("NFKD", text)
-        text = "".join(char for char in text if not unicodedata.combining(char))
-        text = re.sub(r"\s+", " ", text)
-        return text
+        return _normalize_cell_text(str(value))
 
     def iter_excel_files(self, project_dir: Path) -> List[Path]:
         files: List[Path] = []
@@ -151,11 +344,15 @@ class DvppReportProcessor(BaseTool):
             normalized_names.add(self.normalize_text(sheet.attrib.get("name", "")))
         return REQUIRED_SCAN_SHEETS.issubset(normalized_names)
 
-    def find_header_mapping(self, sheet) -> tuple[int, dict[str, int]] | None:
-        for row_index in range(1, min(sheet.max_row, 40) + 1):
+    def read_sheet_head(self, sheet) -> tuple[List[Sequence[Any]], Iterable[Sequence[Any]]]:
+        rows = sheet.iter_rows(max_col=HEADER_SCAN_COLUMNS, values_only=True)
+        return list(islice(rows, HEADER_SCAN_ROWS)), rows
+
+    def find_header_mapping(self, head_rows: Sequence[Sequence[Any]]) -> tuple[int, dict[str, int]] | None:
+        for row_index, row in enumerate(head_rows[:HEADER_SCAN_ROWS], start=1):
             headers: dict[str, int] = {}
-            for col_index in range(1, min(sheet.max_column, 25) + 1):
-                cell_text = self.normalize_text(sheet.cell(row_index, col_index).value)
+            for col_index, value in enumerate(row[:HEADER_SCAN_COLUMNS], start=1):
+                cell_text = self.normalize_text(value)
                 if not cell_text:
                     continue
                 if cell_text == "jmeno":
@@ -166,27 +363,31 @@ class DvppReportProcessor(BaseTool):
                     headers["support_hours"] = col_index
                 elif "datum narozeni" in cell_text or "datum nar" in cell_text:
                     headers["birth_date"] = col_index
+                elif cell_text == "sablona":
+                    headers["sablona"] = col_index
+                elif cell_text == "tema" or cell_text.startswith("tema "):
+                    headers["theme"] = col_index
             if {"first_name", "last_name", "support_hours"}.issubset(headers):
                 return row_index, headers
         return None
 
-    def extract_metadata(self, sheet) -> tuple[str, int | None]:
+    def extract_metadata(self, head_rows: Sequence[Sequence[Any]]) -> tuple[str, int | None]:
         project_number = ""
         report_number = None
 
-        for row_index in range(1, min(sheet.max_row, 15) + 1):
-            for col_index in range(1, min(sheet.max_column, 15) + 1):
-                cell_text = self.normalize_text(sheet.cell(row_index, col_index).value)
+        for row in head_rows[:METADATA_SCAN_ROWS]:
+            for col_index, value in enumerate(row[:METADATA_SCAN_COLUMNS], start=1):
+                cell_text = self.normalize_text(value)
                 if not cell_text:
                     continue
 
-                if "registracni cislo projektu" in cell_text and col_index + 2 <= sheet.max_column:
-                    raw_value = sheet.cell(row_index, col_index + 2).value
+                if "registracni cislo projektu" in cell_text:
+                    raw_value = _row_value(row, col_index + 2)
                     if raw_value:
                         project_number = str(raw_value).strip()
 
-                if "zprava o realizaci c." in cell_text and col_index + 1 <= sheet.max_column:
-                    raw_value = sheet.cell(row_index, col_index + 1).value
+                if "zprava o realizaci c." in cell_text:
+                    raw_value = _row_value(row, col_index + 1)
                     if raw_value is not None:
                         try:
                             report_number = int(raw_value)
@@ -195,16 +396,25 @@ class DvppReportProcessor(BaseTool):
 
         return project_number, report_number
 
-    def count_participant_rows(self, sheet, header_row: int, headers: dict[str, int]) -> int:
-        count = 0
-        for row_index in range(header_row + 1, sheet.max_row + 1):
-            first_name = sheet.cell(row_index, headers["first_name"]).value
-            last_name = sheet.cell(row_index, headers["last_name"]).value
-            if first_name and last_name:
-                count += 1
-        return count
-
-    def inspect_workbook(self, file_path: Path, project_dir: Path, strict_headers: bool = True) -> WorkbookMatch | None:
+    def read_data_columns(self, rows: Iterable[Sequence[Any]], headers: dict[str, int]) -> Dict[str, List[Any]]:
+        tracked = {key: headers[key] for key in DATA_COLUMNS if key in headers}
+        columns: Dict[str, List[Any]] = {key: [] for key in tracked}
+        for row in rows:
+            values = {key: _row_value(row, col_index) for key, col_index in tracked.items()}
+            if all(value is None for value in values.values()):
+                continue
+            for key, value in values.items():
+                columns[key].append(value)
+        return columns
+
+    def count_participant_rows(self, columns: Dict[str, List[Any]]) -> int:
+        if "first_name" not in columns or "last_name" not in columns:
+            return 0
+        first_present = np.array(columns["first_name"], dtype=object).astype(bool)
+        last_present = np.array(columns["last_name"], dtype=object).astype(bool)
+        return int(np.count_nonzero(first_present & last_present))
+
+    def extract_workbook(self, file_path: Path, project_dir: Path, strict_headers: bool = True) -> WorkbookExtraction | None:
         workbook = load_workbook(file_path, data_only=True, read_only=True)
         try:
             for sheet_name in workbook.sheetnames:
@@ -212,8 +422,8 @@ class DvppReportProcessor(BaseTool):
                 if not strict_headers and normalized_sheet_name != "podpory":
                     continue
 
-                sheet = workbook[sheet_name]
-                header_info = self.find_header_mapping(sheet)
+                head_rows, remaining_rows = self.read_sheet_head(workbook[sheet_name])
+                header_info = self.find_header_mapping(head_rows)
                 if header_info is None and strict_headers:
                     continue
 
@@ -222,61 +432,62 @@ class DvppReportProcessor(BaseTool):
                 if header_info is not None:
                     header_row, headers = header_info
 
-                project_number, report_number = self.extract_metadata(sheet)
-                participant_count = self.count_participant_rows(sheet, header_row, headers) if header_info is not None else 0
-                return WorkbookMatch(
+                project_number, report_number = self.extract_metadata(head_rows)
+                columns = (
+                    self.read_data_columns(chain(head_rows[header_row:], remaining_rows), headers)
+                    if header_info is not None
+                    else {}
+                )
+                match = WorkbookMatch(
                     file_path=file_path,
                     relative_path=file_path.relative_to(project_dir).as_posix(),
                     sheet_name=sheet_name,
                     header_row=header_row,
                     project_number=project_number,
                     report_number=report_number,
-                    participant_count=participant_count,
+                    participant_count=self.count_participant_rows(columns),
                     modified_time=file_path.stat().st_mtime,
                 )
+                return WorkbookExtraction(match=match, columns=columns)
         finally:
             workbook.close()
         return None
 
-    def extract_participants_from_match(self, match: WorkbookMatch) -> List[Dict[str, Any]]:
-        workbook = load_workbook(match.file_path, data_only=True, read_only=True)
-        try:
-            sheet = workbook[match.sheet_name]
-            header_info = self.find_header_mapping(sheet)
-            if header_info is None:
-                return []
-            header_row, headers = header_info
-
-            participants: List[Dict[str, Any]] = []
-            for row_index in range(header_row + 1, sheet.max_row + 1):
-                first_name = sheet.cell(row_index, headers["first_name"]).value
-                last_name = sheet.cell(row_index, headers["last_name"]).value
-                if not first_name or not last_name:
-                    continue
+    def inspect_workbook(self, file_path: Path, project_dir: Path, strict_headers: bool = True) -> WorkbookMatch | None:
+        extraction = self.extract_workbook(file_path, project_dir, strict_headers=strict_headers)
+        return extraction.match if extraction is not None else None
+
+    def extract_participants(self, extraction: WorkbookExtraction) -> List[Dict[str, Any]]:
+        columns = extraction.columns
+        if "first_name" not in columns or "last_name" not in columns:
+            return []
+
+        raw_hours_column = columns.get("support_hours", [None] * len(columns["first_name"]))
+        participants: List[Dict[str, Any]] = []
+        for first_name, last_name, raw_hours in zip(columns["first_name"], columns["last_name"], raw_hours_column):
+            if not first_name or not last_name:
+                continue
 
-                raw_hours = sheet.cell(row_index, headers["support_hours"]).value
-                try:
-                    support_hours = float(raw_hours or 0)
-                except (TypeError, ValueError):
-                    support_hours = 0.0
-
-                participants.append(
-                    {
-                        "first_name": str(first_name).strip(),
-                        "last_name": str(last_name).strip(),
-                        "support_hours": support_hours,
-                    }
-                )
+            try:
+                support_hours = float(raw_hours or 0)
+            except (TypeError, ValueError):
+                support_hours = 0.0
 
-            return participants
-        finally:
-            workbook.close()
+            participants.append(
+                {
+                    "first_name": str(first_name).strip(),
+                    "last_name": str(last_name).strip(),
+                    "support_hours": support_hours,
+                }
+            )
+
+        return participants
 
-    def aggregate_participants(self, matches: List[WorkbookMatch]) -> List[Dict[str, Any]]:
+    def aggregate_participants(self, extractions: List[WorkbookExtraction]) -> List[Dict[str, Any]]:
         aggregated: Dict[tuple[str, str], Dict[str, Any]] = {}
 
-        for match in matches:
-            for participant in self.extract_participants_from_match(match):
+        for extraction in extractions:
+            for participant in self.extract_participants(extraction):
                 key = (
                     participant["first_name"].strip().lower(),
                     participant["last_name"].strip().lower(),
@@ -293,32 +504,28 @@ class DvppReportProcessor(BaseTool):
         rows.sort(key=lambda row: (str(row["last_name"]).lower(), str(row["first_name"]).lower()))
         return rows
 
-    def build_combined_dataframe(self, matches: List[WorkbookMatch]) -> pd.DataFrame:
+    def build_combined_dataframe(self, extractions: List[WorkbookExtraction]) -> pd.DataFrame:
         frames: List[pd.DataFrame] = []
-        for match in matches:
-            frame = pd.read_excel(match.file_path, sheet_name=match.sheet_name, header=match.header_row - 1)
+        for extraction in extractions:
+            if not extraction.columns:
+                continue
+            frame = pd.DataFrame({key: pd.Series(values, dtype=object) for key, values in extraction.columns.items()})
             frames.append(frame)
         if not frames:
             return pd.DataFrame()
-        return pd.concat(frames, ignore_index=True)
+        combined = pd.concat(frames, ignore_index=True)
+        return combined.where(combined.notna(), np.nan)
 
-    def build_summary_tables(self, matches: List[WorkbookMatch]) -> tuple[pd.DataFrame | None, pd.DataFrame | None, List[str]]:
-        full_combined_df = self.build_combined_dataframe(matches)
+    def build_summary_tables(
+        self, extractions: List[WorkbookExtraction]
+    ) -> tuple[pd.DataFrame | None, pd.DataFrame | None, List[str]]:
+        full_combined_df = self.build_combined_dataframe(extractions)
         if full_combined_df.empty:
             return None, None, []
 
-        sablona_col = "Šablona"
-        tema_long_col = (
-            'Téma\nZvolíte-li ve sloupci „Forma“ kteroukoliv z variant „mentoring“, '
-            '„supervize“ „koučink“ nebo „kvalifikační studium DVPP“ nechte pole Téma prázdné.'
-        )
-        jmeno_col = "Jméno"
-        prijmeni_col = "Příjmení"
-        hodiny_col = "Počet  hodin podpory"
-
         final_themes_df = None
-        if sablona_col in full_combined_df.columns and tema_long_col in full_combined_df.columns:
-            df_themes = full_combined_df[[sablona_col, tema_long_col]].copy().rename(columns={tema_long_col: "Téma"})
+        if {"sablona", "theme"}.issubset(full_combined_df.columns):
+            df_themes = full_combined_df[["sablona", "theme"]].copy().rename(columns={"sablona": "Šablona", "theme": "Téma"})
             df_themes.dropna(how="all", inplace=True)
             df_themes["Šablona"] = df_themes["Šablona"].astype(str).str.strip()
             df_themes["Téma"] = df_themes["Téma"].astype(str).str.strip()
@@ -327,60 +534,95 @@ class DvppReportProcessor(BaseTool):
             final_themes_df = pd.DataFrame(dict([(key, pd.Series(value)) for key, value in grouped_themes.items()]))
 
         person_hours_df = None
-        required_cols = [jmeno_col, prijmeni_col, hodiny_col]
+        required_cols = ["first_name", "last_name", "support_hours"]
         if all(col in full_combined_df.columns for col in required_cols):
             df_persons = full_combined_df[required_cols].copy()
-            df_persons.dropna(subset=[jmeno_col, prijmeni_col], how="all", inplace=True)
-            df_persons[hodiny_col] = pd.to_numeric(df_persons[hodiny_col], errors="coerce").fillna(0)
+            df_persons.dropna(subset=["first_name", "last_name"], how="all", inplace=True)
+            df_persons["support_hours"] = pd.to_numeric(df_persons["support_hours"], errors="coerce").fillna(0)
             df_persons["Celé Jméno"] = (
-                df_persons[jmeno_col].astype(str).str.strip() + " " + df_persons[prijmeni_col].astype(str).str.strip()
+                df_persons["first_name"].astype(str).str.strip() + " " + df_persons["last_name"].astype(str).str.strip()
             ).str.strip()
-            person_hours_df = df_persons.groupby("Celé Jméno", as_index=False)[hodiny_col].sum()
-            person_hours_df.rename(columns={hodiny_col: "Celkem hodin"}, inplace=True)
+            person_hours_df = df_persons.groupby("Celé Jméno", as_index=False)["support_hours"].sum()
+            person_hours_df.rename(columns={"support_hours": "Celkem hodin"}, inplace=True)
             person_hours_df = person_hours_df.sort_values(by="Celkem hodin", ascending=False)
 
         names_list = person_hours_df["Celé Jméno"].tolist() if person_hours_df is not None else []
         return final_themes_df, person_hours_df, names_list
 
-    def render_html_report(self, matches: List[WorkbookMatch], title: str, output_path: Path) -> int:
-        final_themes_df, person_hours_df, names_list = self.build_summary_tables(matches)
-
-        templates_dir = Path(__file__).resolve().parents[1] / "templates"
-        env = Environment(loader=FileSystemLoader(str(templates_dir)))
-        template = env.get_template("dvpp_report_template.html")
-
-        themes_html = (
-            final_themes_df.to_html(classes="table table-bordered table-striped", na_rep="", justify="left")
-            if final_themes_df is not None
-            else "<p>Tabulku témat se nepodařilo vygenerovat.</p>"
-        )
-        persons_html = (
-            person_hours_df.to_html(index=False, classes="table table-hover table-striped", na_rep="")
-            if person_hours_df is not None
-            else "<p>Tabulku hodin se nepodařilo vygenerovat.</p>"
-        )
-
-        html_content = template.render(
-            title=title,
-            table1=themes_html,
-            table2=persons_html,
-            unique_persons_count=len(person_hours_df) if person_hours_df is not None else 0,
-            names_list=names_list,
-        )
+    def render_html_report(
+        self,
+        extractions: List[WorkbookExtraction],
+        title: str,
+        output_path: Path,
+        lazy_tables: bool | None = None,
+    ) -> int:
+        """Render the report; ``lazy_tables`` embeds table data as JSON rendered page by page.
+
+        With ``lazy_tables=None`` the JSON payload is used only for more than
+        ``LAZY_TABLES_THRESHOLD`` participants.
+        """
+        final_themes_df, person_hours_df, names_list = self.build_summary_tables(extractions)
+        template = load_report_template()
+        unique_persons_count = len(person_hours_df) if person_hours_df is not None else 0
+        if lazy_tables is None:
+            lazy_tables = unique_persons_count > LAZY_TABLES_THRESHOLD
+
+        if lazy_tables:
+            html_content = template.render(
+                title=title,
+                lazy_tables=True,
+                report_data={
+                    "themes": _table_payload(final_themes_df),
+                    "persons": _table_payload(person_hours_df),
+                },
+                unique_persons_count=unique_persons_count,
+            )
+        else:
+            themes_html = (
+                final_themes_df.to_html(classes="table table-bordered table-striped", na_rep="", justify="left")
+                if final_themes_df is not None
+                else "<p>Tabulku témat se nepodařilo vygenerovat.</p>"
+            )
+            persons_html = (
+                person_hours_df.to_html(index=False, classes="table table-hover table-striped", na_rep="")
+                if person_hours_df is not None
+                else "<p>Tabulku hodin se nepodařilo vygenerovat.</p>"
+            )
+            html_content = template.render(
+                title=title,
+                table1=themes_html,
+                table2=persons_html,
+                unique_persons_count=unique_persons_count,
+                names_list=names_list,
+            )
 
         output_path.parent.mkdir(parents=True, exist_ok=True)
         output_path.write_text(html_content, encoding="utf-8")
-        return len(person_hours_df) if person_hours_df is not None else 0
+        return unique_persons_count
 
-    def _build_matches_from_paths(self, project_dir: Path, files: List[str]) -> List[WorkbookMatch]:
-        matches: List[WorkbookMatch] = []
-        for file_path in files:
-            normalized = self.normalize_input_path(str(file_path))
-            match = self.inspect_workbook(normalized, project_dir, strict_headers=True)
-            if match is not None:
-                matches.append(match)
-        matches.sort(key=lambda item: item.relative_path.lower())
-        return matches
+    def _build_extractions_from_paths(self, project_dir: Path, files: List[str]) -> List[WorkbookExtraction]:
+        normalized_paths = [self.normalize_input_path(str(file_path)) for file_path in files]
+        results = self._map_parallel(
+            lambda path: self.extract_workbook(path, project_dir, strict_headers=True),
+            normalized_paths,
+        )
+        extractions = [extraction for extraction in results if extraction is not None]
+        extractions.sort(key=lambda item: item.match.relative_path.lower())
+        return extractions
+
+    def _scan_workbook(self, file_path: Path, project_dir: Path) -> tuple[WorkbookMatch | None, Exception | None]:
+        if not self.has_required_sheet_names(file_path):
+            return None, None
+        try:
+            return self.inspect_workbook(file_path, project_dir, strict_headers=False), None
+        except Exception as exc:
+            return None, exc
+
+    def _map_parallel(self, func: Callable[[_T], _R], items: List[_T]) -> List[_R]:
+        if len(items) <= 1 or self.max_workers <= 1:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(items))) as executor:
+            return list(executor.map(func, items))
 
     def _serialize_match(self, match: WorkbookMatch) -> Dict[str, Any]:
         return {
@@ -9,24 +9,54 @@ Based on: /root/vyvoj_sw/plakat_gen backend functionality
 Author: Generated with Claude Code
 """
 
+import logging
 import requests
-import time
 import os
 import tempfile
-import base64
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any, Optional, Tuple
+from plakat.checkpoint import PosterCheckpoint, batch_fingerprint
+from plakat.form_tokens import extract_form_token, extract_step_progress
+from plakat.local_renderer import render_poster
+from plakat.poster_cache import PosterCache
+from plakat.scheduler import DEFAULT_PER_HOST_LIMIT, DEFAULT_REQUESTS_PER_SECOND, PoliteScheduler
 from .base_tool import BaseTool
 
 
+DEFAULT_SERVICE_BASE_URL = "https://publicita.dotaceeu.cz/gen"
+DEFAULT_MAX_CONCURRENCY = 3
+DEFAULT_RETRY_ROUNDS = 2
+DEFAULT_RETRY_BACKOFF_SECONDS = 10.0
+# Bump when the request sequence or form values change so cached posters are regenerated
+REMOTE_GENERATOR_VERSION = "publicita-gen-1"
+RENDERER_REMOTE = "remote"
+RENDERER_LOCAL = "local"
+POSTER_RENDERERS = (RENDERER_REMOTE, RENDERER_LOCAL)
+
+
 class PlakatGenerator(BaseTool):
     """Generator for PDF posters using direct HTTP requests to external service"""
     
-    def __init__(self, logger=None):
+    def __init__(
+        self,
+        logger=None,
+        base_url: Optional[str] = None,
+        scheduler: Optional[PoliteScheduler] = None,
+        poster_cache: Optional[PosterCache] = None
+    ):
         super().__init__(logger)
-        self.external_service_url = "https://publicita.dotaceeu.cz/gen/krok1"
+        self.base_url = (base_url or DEFAULT_SERVICE_BASE_URL).rstrip('/')
+        self.external_service_url = f"{self.base_url}/krok1"
         self.user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/136.0.0.0 Safari/537.36"
-        self.step_delay = 500  # milliseconds
         self.timeout = 60000  # milliseconds
+        self.max_concurrency = DEFAULT_MAX_CONCURRENCY
+        self.retry_rounds = DEFAULT_RETRY_ROUNDS
+        self.retry_backoff = DEFAULT_RETRY_BACKOFF_SECONDS  # seconds, doubled every round
+        # Shared by all worker sessions so pacing and backoff apply to the whole batch
+        self.scheduler = scheduler
+        self.poster_cache = poster_cache
+        self.generator_version = REMOTE_GENERATOR_VERSION
         
     def validate_inputs(self, files: List[str], options: Dict[str, Any]) -> bool:
         """Validate input options for plakat generation"""
@@ -57,35 +87,58 @@ class PlakatGenerator(BaseTool):
             self.errors.append("Společný text musí být string s max. 255 znaky")
             return False
         
+        for key in ['max_concurrency', 'per_host_limit']:
+            value = options.get(key)
+            if value is not None and (isinstance(value, bool) or not isinstance(value, int) or value < 1):
+                self.errors.append(f"Parametr {key} musí být kladné celé číslo")
+                return False
+        
+        retry_rounds = options.get('retry_rounds')
+        if retry_rounds is not None and (isinstance(retry_rounds, bool) or not isinstance(retry_rounds, int) or retry_rounds < 0):
+            self.errors.append("Parametr retry_rounds musí být nezáporné celé číslo")
+            return False
+        
+        renderer = options.get('renderer', RENDERER_REMOTE)
+        if renderer not in POSTER_RENDERERS:
+            self.errors.append(f"Nepodporovaný způsob generování: {renderer}")
+            return False
+        
+        requests_per_second = options.get('requests_per_second')
+        if requests_per_second is not None and (
+            isinstance(requests_per_second, bool)
+            or not isinstance(requests_per_second, (int, float))
+            or requests_per_second <= 0
+        ):
+            self.errors.append("Parametr requests_per_second musí být kladné číslo")
+            return False
+        
         return True
     
-    def _delay(self, ms: int):
-        """Wait for specified milliseconds"""
-        time.sleep(ms / 1000.0)
+    def _request(self, session: requests.Session, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request through the shared politeness scheduler"""
+        if self.scheduler is None:
+            self.scheduler = PoliteScheduler()
+        return self.scheduler.request(session, method, url, **kwargs)
     
-    def _debug_step_progress(self, soup, context: str):
-        """Debug step progress by checking classes"""
-        steps = soup.find('ul', {'id': 'steps'})
-        if steps:
-            step_items = steps.find_all('li')
-            status = []
-            for i, item in enumerate(step_items, 1):
-                classes = item.get('class', [])
-                if 'done' in classes:
-                    status.append(f"Step{i}:DONE")
-                elif 'active' in classes:
-                    status.append(f"Step{i}:ACTIVE")
-                else:
-                    status.append(f"Step{i}:PENDING")
-            self.logger.info(f"{context} - Progress: {' | '.join(status)}")
+    def _debug_step_progress(self, html: str, context: str):
+        """Debug step progress by checking classes (parsed only when debug logging is on)"""
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+        
+        progress = extract_step_progress(html)
+        if progress is not None:
+            status = [f"Step{i}:{state}" for i, state in enumerate(progress, 1)]
+            self.logger.debug(f"{context} - Progress: {' | '.join(status)}")
         else:
-            self.logger.warning(f"{context} - No steps element found")
+            self.logger.debug(f"{context} - No steps element found")
     
     def _step1_initialize_session(self, session: requests.Session) -> Dict[str, str]:
         """Initialize session and get initial tokens"""
         self.logger.info("Step 1: Initializing session")
         
-        response = session.get(
+        response = self._request(
+            session,
+            'GET',
             self.external_service_url,
             headers={'User-Agent': self.user_agent},
             timeout=self.timeout / 1000
@@ -97,19 +150,14 @@ class PlakatGenerator(BaseTool):
         if not phpsessid:
             raise Exception("Failed to get PHPSESSID")
         
-        # Extract form token from HTML
-        from bs4 import BeautifulSoup
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
         # Debug: Check initial step progress
-        self._debug_step_progress(soup, "After step 1 (init)")
+        self._debug_step_progress(response.text, "After step 1 (init)")
         
-        token_input = soup.find('input', {'name': 'form[_token]'})
-        if not token_input:
+        # Extract form token from HTML
+        current_token = extract_form_token(response.text)
+        if current_token is None:
             raise Exception("Failed to get initial token")
         
-        current_token = token_input.get('value')
-        
         return {
             'phpsessid': phpsessid,
             'current_token': current_token
@@ -126,7 +174,9 @@ class PlakatGenerator(BaseTool):
             'form[format]': format_value
         }
         
-        response = session.post(
+        response = self._request(
+            session,
+            'POST',
             self.external_service_url,  # POST back to krok1
             data=form_data,
             headers={'User-Agent': self.user_agent},
@@ -134,16 +184,13 @@ class PlakatGenerator(BaseTool):
         )
         response.raise_for_status()
         
-        # Update token from response and check progress
-        from bs4 import BeautifulSoup
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
         # Debug: Check step progress after format selection
-        self._debug_step_progress(soup, "After step 2 (format)")
+        self._debug_step_progress(response.text, "After step 2 (format)")
         
-        token_input = soup.find('input', {'name': 'form[_token]'})
-        if token_input:
-            session_data['current_token'] = token_input.get('value')
+        # Update token from response
+        current_token = extract_form_token(response.text)
+        if current_token is not None:
+            session_data['current_token'] = current_token
     
     def _step3_send_project_data(self, session: requests.Session, session_data: Dict[str, str], 
                                 project: Dict[str, str], common_text: str):
@@ -174,24 +221,23 @@ class PlakatGenerator(BaseTool):
             'Connection': 'keep-alive'
         }
         
-        response = session.post(
-            "https://publicita.dotaceeu.cz/gen/krok2",
+        response = self._request(
+            session,
+            'POST',
+            f"{self.base_url}/krok2",
             data=form_data,
             headers=headers,
             timeout=self.timeout / 1000
         )
         response.raise_for_status()
         
-        # Update token from response and check progress
-        from bs4 import BeautifulSoup
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
         # Debug: Check step progress after project data
-        self._debug_step_progress(soup, "After step 3 (project data)")
+        self._debug_step_progress(response.text, "After step 3 (project data)")
         
-        token_input = soup.find('input', {'name': 'form[_token]'})
-        if token_input:
-            session_data['current_token'] = token_input.get('value')
+        # Update token from response
+        current_token = extract_form_token(response.text)
+        if current_token is not None:
+            session_data['current_token'] = current_token
     
     def _step4_finalize(self, session: requests.Session, session_data: Dict[str, str]):
         """Finalize generation (set cropmarks)"""
@@ -205,32 +251,33 @@ class PlakatGenerator(BaseTool):
             'cropmarks': '0'  # Try simple name
         }
         
-        response = session.post(
-            "https://publicita.dotaceeu.cz/gen/krok3",
+        response = self._request(
+            session,
+            'POST',
+            f"{self.base_url}/krok3",
             data=form_data,
             headers={'User-Agent': self.user_agent},
             timeout=self.timeout / 1000
         )
         response.raise_for_status()
         
-        # Update token from response and check progress
-        from bs4 import BeautifulSoup
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
         # Debug: Check step progress after cropmarks
-        self._debug_step_progress(soup, "After step 4 (cropmarks)")
+        self._debug_step_progress(response.text, "After step 4 (cropmarks)")
         
-        token_input = soup.find('input', {'name': 'form[_token]'})
-        if token_input:
-            session_data['current_token'] = token_input.get('value')
+        # Update token from response
+        current_token = extract_form_token(response.text)
+        if current_token is not None:
+            session_data['current_token'] = current_token
     
     def _step5_download_pdf(self, session: requests.Session, session_data: Dict[str, str]) -> bytes:
         """Download the generated PDF"""
         self.logger.info("Step 5: Downloading PDF from /gen/nahled")
         
         # Direct GET to nahled - server should return PDF
-        response = session.get(
-            "https://publicita.dotaceeu.cz/gen/nahled",
+        response = self._request(
+            session,
+            'GET',
+            f"{self.base_url}/nahled",
             headers={
                 'User-Agent': self.user_agent,
                 'Connection': 'keep-alive',
@@ -258,31 +305,19 @@ class PlakatGenerator(BaseTool):
         try:
             self.logger.info(f"Generating poster for project: {project['id']}")
             
-            # Create session with cookies
-            session = requests.Session()
-            session.headers.update({
-                'User-Agent': self.user_agent,
-                'Connection': 'keep-alive'
-            })
-            
-            # Step 1: Initialize session
-            session_data = self._step1_initialize_session(session)
-            
-            # Step 2: Set format
-            self._delay(self.step_delay)
-            self._step2_set_format(session, session_data, orientation)
-            
-            # Step 3: Send project data
-            self._delay(self.step_delay)
-            self._step3_send_project_data(session, session_data, project, common_text)
-            
-            # Step 4: Finalize
-            self._delay(self.step_delay)
-            self._step4_finalize(session, session_data)
-            
-            # Step 5: Download PDF
-            self._delay(self.step_delay)
-            pdf_content = self._step5_download_pdf(session, session_data)
+            # Each project needs its own cookie jar because the service keeps wizard state in PHPSESSID
+            with requests.Session() as session:
+                session.headers.update({
+                    'User-Agent': self.user_agent,
+                    'Connection': 'keep-alive'
+                })
+                
+                # Steps are paced by the scheduler instead of fixed sleeps
+                session_data = self._step1_initialize_session(session)
+                self._step2_set_format(session, session_data, orientation)
+                self._step3_send_project_data(session, session_data, project, common_text)
+                self._step4_finalize(session, session_data)
+                pdf_content = self._step5_download_pdf(session, session_data)
             
             # Generate filename
             filename = self._generate_filename(project['id'])
@@ -294,6 +329,43 @@ class PlakatGenerator(BaseTool):
             self.logger.error(f"Failed to generate poster for project {project['id']}: {str(e)}")
             return False, None, str(e)
     
+    def _render_poster_locally(self, project: Dict[str, str], orientation: str, common_text: str) -> Tuple[bool, Optional[bytes], Optional[str]]:
+        """Render poster offline with reportlab"""
+        try:
+            pdf_content = render_poster(project['name'], orientation, common_text)
+            return True, pdf_content, self._generate_filename(project['id'])
+        except Exception as e:
+            self.logger.warning(f"Local rendering failed for project {project['id']}: {str(e)}")
+            return False, None, str(e)
+    
+    def _load_or_generate_poster(self, project: Dict[str, str], orientation: str, common_text: str,
+                                 bypass_cache: bool = False,
+                                 renderer: str = RENDERER_REMOTE) -> Tuple[bool, Optional[bytes], Optional[str], str]:
+        """Render locally, serve from the on-disk cache or generate remotely; returns the poster source as last item"""
+        if renderer == RENDERER_LOCAL:
+            success, pdf_content, filename_or_error = self._render_poster_locally(project, orientation, common_text)
+            if success:
+                return success, pdf_content, filename_or_error, RENDERER_LOCAL
+            # The remote service stays available as a fallback, e.g. when no suitable font is installed
+        
+        if self.poster_cache is None:
+            return (*self._generate_poster_for_project(project, orientation, common_text), RENDERER_REMOTE)
+        
+        cache_key = self.poster_cache.key_for(project['name'], orientation, common_text, self.generator_version)
+        if not bypass_cache:
+            cached_content = self.poster_cache.get(cache_key)
+            if cached_content is not None:
+                self.logger.info(f"Using cached poster for project: {project['id']}")
+                return True, cached_content, self._generate_filename(project['id']), 'cache'
+        
+        success, pdf_content, filename_or_error = self._generate_poster_for_project(project, orientation, common_text)
+        if success and pdf_content:
+            try:
+                self.poster_cache.put(cache_key, pdf_content)
+            except OSError as e:
+                self.logger.warning(f"Failed to cache poster for project {project['id']}: {str(e)}")
+        return success, pdf_content, filename_or_error, RENDERER_REMOTE
+    
     def _generate_filename(self, project_id: str) -> str:
         """Generate filename from project ID - extract last part after final slash"""
         # Split by / and get the last part
@@ -324,47 +396,104 @@ class PlakatGenerator(BaseTool):
             orientation = options['orientation']
             common_text = options['common_text']
             output_dir = options.get('output_dir', tempfile.mkdtemp())
+            bypass_cache = bool(options.get('bypass_cache', False))
+            renderer = options.get('renderer', RENDERER_REMOTE)
+            resume = bool(options.get('resume', False))
+            retry_rounds = options.get('retry_rounds')
+            if retry_rounds is None:
+                retry_rounds = self.retry_rounds
             
-            self.logger.info(f"Starting poster generation for {len(projects)} projects")
+            max_concurrency = options.get('max_concurrency') or self.max_concurrency
+            if self.scheduler is None:
+                self.scheduler = PoliteScheduler(
+                    requests_per_second=options.get('requests_per_second') or DEFAULT_REQUESTS_PER_SECOND,
+                    per_host_limit=options.get('per_host_limit') or DEFAULT_PER_HOST_LIMIT,
+                )
             
-            successful_projects = 0
-            failed_projects = 0
-            saved_files = []
+            self.logger.info(
+                f"Starting poster generation for {len(projects)} projects ({max_concurrency} concurrent)"
+            )
             
-            # Process each project
+            cached_projects = 0
+            local_projects = 0
+            resumed_projects = 0
+            saved_by_index: Dict[int, str] = {}
+            
+            # The manifest lets a later run with resume=True skip projects that already have their PDF
+            checkpoint = PosterCheckpoint(output_dir, batch_fingerprint(orientation, common_text, renderer))
+            if not resume:
+                checkpoint.reset()
+            
+            pending = []
             for i, project in enumerate(projects):
-                self.logger.info(f"Processing project {i+1}/{len(projects)}: {project['id']}")
-                
-                try:
-                    success, pdf_content, filename_or_error = self._generate_poster_for_project(
-                        project, orientation, common_text
+                completed_file = checkpoint.completed_file(project['id'], project['name']) if resume else None
+                if completed_file is not None:
+                    saved_by_index[i] = str(completed_file)
+                    resumed_projects += 1
+                else:
+                    pending.append(i)
+            if resumed_projects:
+                self.info_messages.append(f"Převzato z předchozího běhu: {resumed_projects}")
+            
+            failures: Dict[int, str] = {}
+            with ThreadPoolExecutor(
+                max_workers=max(1, min(max_concurrency, len(pending))),
+                thread_name_prefix="plakat"
+            ) as executor:
+                for attempt in range(retry_rounds + 1):
+                    if not pending:
+                        break
+                    if attempt > 0:
+                        delay = self.retry_backoff * (2 ** (attempt - 1))
+                        self.logger.info(
+                            f"Retrying {len(pending)} failed projects (round {attempt}/{retry_rounds}) in {delay:.0f}s"
+                        )
+                        time.sleep(delay)
+                    
+                    failures = {}
+                    outcomes = executor.map(
+                        lambda i: self._load_or_generate_poster(
+                            projects[i], orientation, common_text, bypass_cache, renderer
+                        ),
+                        pending
                     )
                     
-                    if success and pdf_content:
-                        # Save PDF file
-                        file_path = os.path.join(output_dir, filename_or_error)
-                        with open(file_path, 'wb') as f:
-                            f.write(pdf_content)
-                        
-                        saved_files.append(file_path)
-                        successful_projects += 1
-                        self.info_messages.append(f"Saved: {filename_or_error}")
+                    # Results arrive in input order; files and messages are only touched from this thread
+                    for i, outcome in zip(pending, outcomes):
+                        project = projects[i]
+                        self.logger.info(f"Finished project {i+1}/{len(projects)}: {project['id']}")
                         
-                    else:
-                        failed_projects += 1
-                        error_msg = f"Project {project['id']}: {filename_or_error}"
-                        self.errors.append(error_msg)
+                        try:
+                            success, pdf_content, filename_or_error, source = outcome
+                            
+                            if success and pdf_content:
+                                # Save PDF file
+                                file_path = os.path.join(output_dir, filename_or_error)
+                                with open(file_path, 'wb') as f:
+                                    f.write(pdf_content)
+                                checkpoint.record(project['id'], project['name'], filename_or_error)
+                                
+                                saved_by_index[i] = file_path
+                                cached_projects += int(source == 'cache')
+                                local_projects += int(source == RENDERER_LOCAL)
+                                if renderer == RENDERER_LOCAL and source != RENDERER_LOCAL:
+                                    self.warnings.append(
+                                        f"Project {project['id']}: lokální vykreslení selhalo, plakát vygenerovala služba"
+                                    )
+                                self.info_messages.append(f"Saved: {filename_or_error}")
+                                
+                            else:
+                                failures[i] = f"Project {project['id']}: {filename_or_error}"
+                                
+                        except Exception as e:
+                            failures[i] = f"Project {project['id']}: Unexpected error - {str(e)}"
                     
-                    # Delay between projects (except for the last one)
-                    if i < len(projects) - 1:
-                        delay_ms = 3000 + (2000 * (i % 3))  # Varying delays
-                        self.logger.info(f"Waiting {delay_ms}ms before next project...")
-                        self._delay(delay_ms)
-                        
-                except Exception as e:
-                    failed_projects += 1
-                    error_msg = f"Project {project['id']}: Unexpected error - {str(e)}"
-                    self.errors.append(error_msg)
+                    pending = list(failures)
+            
+            self.errors.extend(failures.values())
+            saved_files = [saved_by_index[i] for i in sorted(saved_by_index)]
+            successful_projects = len(saved_files)
+            failed_projects = len(failures)
             
             # Generate summary
             total_projects = len(projects)
@@ -372,6 +501,16 @@ class PlakatGenerator(BaseTool):
                 summary = f"Vygenerováno {successful_projects} plakátů z {total_projects}"
                 if failed_projects > 0:
                     summary += f" ({failed_projects} selhalo)"
+                if cached_projects > 0:
+                    summary += f", {cached_projects} z mezipaměti"
+                if resumed_projects > 0:
+                    summary += f", {resumed_projects} z předchozího běhu"
+                if local_projects > 0:
+                    summary += f", {local_projects} jako neoficiální náhled"
+                    self.warnings.append(
+                        f"{local_projects} plakátů je jen neoficiální náhled vykreslený lokálně; "
+                        "pro zveřejnění je vygenerujte službou publicita.dotaceeu.cz"
+                    )
                 
                 return {
                     'success': True,
@@ -380,6 +519,9 @@ class PlakatGenerator(BaseTool):
                         'successful_projects': successful_projects,
                         'failed_projects': failed_projects,
                         'total_projects': total_projects,
+                        'cached_projects': cached_projects,
+                        'local_projects': local_projects,
+                        'resumed_projects': resumed_projects,
                         'output_files': saved_files
                     },
                     'errors': self.errors,
@@ -394,6 +536,9 @@ class PlakatGenerator(BaseTool):
                         'successful_projects': 0,
                         'failed_projects': failed_projects,
                         'total_projects': total_projects,
+                        'cached_projects': 0,
+                        'local_projects': 0,
+                        'resumed_projects': 0,
                         'output_files': []
                     },
                     'errors': self.errors,
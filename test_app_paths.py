@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "src" / "python"))
+
+from app_paths import CACHE_DIR_ENV, resolve_cache_dir
+
+
+class AppPathsTests(unittest.TestCase):
+    def test_resolve_cache_dir_prefers_env_override(self) -> None:
+        cache_dir = resolve_cache_dir("dvpp", {CACHE_DIR_ENV: "/tmp/opjak-cache"})
+
+        self.assertEqual(Path("/tmp/opjak-cache") / "dvpp", cache_dir)
+
+    def test_resolve_cache_dir_uses_appdata_on_windows(self) -> None:
+        with patch("sys.platform", "win32"):
+            cache_dir = resolve_cache_dir("dvpp", {"APPDATA": r"C:\\Users\\test\\AppData\\Roaming"})
+
+        self.assertEqual(
+            Path(r"C:\\Users\\test\\AppData\\Roaming") / "NastrojeOPJAK" / "cache" / "dvpp",
+            cache_dir,
+        )
+
+    def test_resolve_cache_dir_uses_home_directory_elsewhere(self) -> None:
+        with patch("sys.platform", "linux"):
+            cache_dir = resolve_cache_dir("dvpp", {})
+
+        self.assertEqual(Path.home() / ".nastroje-opjak" / "cache" / "dvpp", cache_dir)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,15 +1,26 @@
 #!/usr/bin/env python3
 
+import platform
 import sys
 import tempfile
+import threading
 import unittest
+import zipfile
 from pathlib import Path
+from unittest import mock
 
-from openpyxl import Workbook
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell.rich_text import CellRichText, TextBlock
+from openpyxl.cell.text import InlineFont
+from openpyxl.styles import Font, PatternFill
+from openpyxl.workbook.defined_name import DefinedName
+from openpyxl.worksheet.datavalidation import DataValidation
 
 REPO_ROOT = Path(__file__).resolve().parent
 sys.path.insert(0, str(REPO_ROOT / "src" / "python"))
 
+from tools.attendance_sheet_copier import ExcelSheetCopier, OpenpyxlSheetCopier
+from tools.attendance_sheet_sniffer import SheetSniffError, sniff_sheet_headers
 from tools.attendance_splitter import AttendanceSplitter
 
 
@@ -130,6 +141,134 @@ class AttendanceSplitterInspectionTests(unittest.TestCase):
             self.assertEqual(["1. ročník", "2. ročník"], matches[0]["attendance_sheets"])
 
 
+SNIFFER_WORKBOOK_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+ xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">
+<sheets>
+<sheet name="Inline" sheetId="1" r:id="rId1"/>
+<sheet name="Graf" sheetId="2" r:id="rId2"/>
+</sheets>
+</workbook>"""
+
+SNIFFER_WORKBOOK_RELS = """<?xml version="1.0" encoding="UTF-8"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="/xl/worksheets/sheet1.xml"/>
+<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/chartsheet" Target="chartsheets/sheet1.xml"/>
+</Relationships>"""
+
+
+def inline_string_sheet_xml(tail: str) -> str:
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+        '<row r="6"><c r="B6" t="inlineStr"><is><t>Datum aktivity</t></is></c></row>'
+        '<row r="7"><c r="B7" t="inlineStr"><is><r><t>Forma </t></r><r><t>výuky</t></r></is></c></row>'
+        + tail
+    )
+
+
+class AttendanceSheetSnifferTests(unittest.TestCase):
+    def test_sniffer_matches_full_load_for_shared_and_rich_strings(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            workbook_path = Path(temp_dir) / "combined.xlsx"
+
+            def create_sheets(workbook):
+                add_16h_attendance_sheet(workbook, "1. ročník")
+                add_32h_attendance_sheet(workbook, "2. a 3. ročník")
+                add_16h_attendance_sheet(workbook, "Skrytá docházka", hidden=True)
+                rich_sheet = workbook.create_sheet("Formátovaná")
+                rich_sheet["B6"] = CellRichText(
+                    "Datum ", TextBlock(InlineFont(b=True), "aktivity")
+                )
+                rich_sheet["B7"] = 42
+                very_hidden = workbook.create_sheet("Data")
+                very_hidden.sheet_state = "veryHidden"
+                very_hidden["B6"] = "=1+1"
+
+            build_workbook(workbook_path, create_sheets)
+
+            sniffed = sniff_sheet_headers(workbook_path, ("B6", "B7"))
+            workbook = load_workbook(workbook_path, rich_text=False)
+            expected = [
+                {
+                    "sheet_name": sheet.title,
+                    "sheet_state": sheet.sheet_state,
+                    "cells": {
+                        "B6": None if sheet["B6"].value is None else str(sheet["B6"].value),
+                        "B7": None if sheet["B7"].value is None else str(sheet["B7"].value),
+                    },
+                }
+                for sheet in workbook.worksheets
+            ]
+            workbook.close()
+
+            self.assertEqual(expected, sniffed)
+
+    def test_sniffer_stops_after_header_rows_and_skips_chartsheets(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            workbook_path = Path(temp_dir) / "large.xlsx"
+            filler = "".join(
+                f'<row r="{row}"><c r="B{row}" t="inlineStr"><is><t>{"x" * 200}</t></is></c></row>'
+                for row in range(8, 2000)
+            )
+            with zipfile.ZipFile(workbook_path, "w") as archive:
+                archive.writestr("xl/workbook.xml", SNIFFER_WORKBOOK_XML)
+                archive.writestr("xl/_rels/workbook.xml.rels", SNIFFER_WORKBOOK_RELS)
+                # The sheet part is cut off mid-document; a full parse would fail.
+                archive.writestr("xl/worksheets/sheet1.xml", inline_string_sheet_xml(filler + '<row r="2000"><c'))
+
+            sniffed = sniff_sheet_headers(workbook_path)
+
+            self.assertEqual(
+                [
+                    {
+                        "sheet_name": "Inline",
+                        "sheet_state": "visible",
+                        "cells": {"B6": "Datum aktivity", "B7": "Forma výuky"},
+                    }
+                ],
+                sniffed,
+            )
+
+    def test_sniffer_rejects_cells_without_references(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            workbook_path = Path(temp_dir) / "unreferenced.xlsx"
+            with zipfile.ZipFile(workbook_path, "w") as archive:
+                archive.writestr("xl/workbook.xml", SNIFFER_WORKBOOK_XML)
+                archive.writestr("xl/_rels/workbook.xml.rels", SNIFFER_WORKBOOK_RELS)
+                archive.writestr(
+                    "xl/worksheets/sheet1.xml",
+                    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                    '<sheetData><row r="1"><c><v>1</v></c></row></sheetData></worksheet>',
+                )
+
+            with self.assertRaises(SheetSniffError):
+                sniff_sheet_headers(workbook_path)
+
+    def test_inspect_workbook_falls_back_to_full_load(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            workbook_path = Path(temp_dir) / "combined.xlsx"
+            build_workbook(
+                workbook_path,
+                lambda workbook: (
+                    add_16h_attendance_sheet(workbook, "1. ročník"),
+                    add_32h_attendance_sheet(workbook, "2. ročník"),
+                    add_16h_attendance_sheet(workbook, "Skrytá", hidden=True),
+                ),
+            )
+
+            splitter = AttendanceSplitter()
+            sniffed = splitter.inspect_workbook(workbook_path)
+            with mock.patch(
+                "tools.attendance_splitter.sniff_sheet_headers",
+                side_effect=SheetSniffError("unsupported layout"),
+            ):
+                loaded = splitter.inspect_workbook(workbook_path)
+
+            self.assertEqual(sniffed, loaded)
+            self.assertEqual(["1. ročník", "2. ročník"], loaded["attendance_sheets"])
+
+
 class AttendanceSplitterProcessingTests(unittest.TestCase):
     def test_process_creates_outputs_in_dedicated_subfolder(self) -> None:
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -249,5 +388,181 @@ class AttendanceSplitterProcessingTests(unittest.TestCase):
             )
 
 
+
+def add_formatted_attendance_sheet(workbook: Workbook, title: str):
+    sheet = add_16h_attendance_sheet(workbook, title)
+    sheet["B2"] = f"Docházka {title}"
+    sheet["B2"].font = Font(bold=True, size=14)
+    sheet["B2"].fill = PatternFill("solid", fgColor="FFFF00")
+    sheet["C12"] = 4
+    sheet["C12"].number_format = "0.00"
+    sheet["C13"] = "=SUM(C12:C12)"
+    sheet.merge_cells("B2:F2")
+    sheet.column_dimensions["B"].width = 42
+    sheet.row_dimensions[2].height = 30
+    sheet.freeze_panes = "C12"
+    validation = DataValidation(type="list", formula1='"ano,ne"')
+    validation.add("D12:D40")
+    sheet.add_data_validation(validation)
+    return sheet
+
+
+class OpenpyxlSheetCopierTests(unittest.TestCase):
+    def test_copies_styles_layout_validations_and_sheet_names(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source_path = Path(temp_dir) / "combined.xlsx"
+
+            def create_sheets(workbook):
+                add_formatted_attendance_sheet(workbook, "1. ročník")
+                second = add_formatted_attendance_sheet(workbook, "2. ročník")
+                second["B2"].font = Font(italic=True)
+                workbook.defined_names["ucastnici"] = DefinedName(
+                    "ucastnici", attr_text="'1. ročník'!$B$12:$B$40"
+                )
+                workbook.defined_names["druhy"] = DefinedName(
+                    "druhy", attr_text="'2. ročník'!$B$12:$B$40"
+                )
+                workbook.defined_names["sazba"] = DefinedName("sazba", attr_text="0.5")
+
+            build_workbook(source_path, create_sheets)
+            output_path = Path(temp_dir) / "first.xlsx"
+
+            with OpenpyxlSheetCopier() as copier:
+                copier(source_path, "1. ročník", output_path)
+
+            workbook = load_workbook(output_path)
+            sheet = workbook.active
+            self.assertEqual(["1. ročník"], workbook.sheetnames)
+            self.assertEqual("Docházka 1. ročník", sheet["B2"].value)
+            self.assertTrue(sheet["B2"].font.bold)
+            self.assertEqual(14, sheet["B2"].font.size)
+            self.assertEqual("00FFFF00", sheet["B2"].fill.fgColor.rgb)
+            self.assertEqual("0.00", sheet["C12"].number_format)
+            self.assertEqual("=SUM(C12:C12)", sheet["C13"].value)
+            self.assertEqual(["B2:F2"], [str(cell_range) for cell_range in sheet.merged_cells.ranges])
+            self.assertEqual(42, sheet.column_dimensions["B"].width)
+            self.assertEqual(30, sheet.row_dimensions[2].height)
+            self.assertEqual("C12", sheet.freeze_panes)
+            self.assertEqual(
+                ["D12:D40"],
+                [str(validation.sqref) for validation in sheet.data_validations.dataValidation],
+            )
+            self.assertEqual(["sazba", "ucastnici"], sorted(workbook.defined_names))
+
+    def test_splitter_uses_openpyxl_copier_by_default(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source_path = Path(temp_dir) / "combined.xlsx"
+            build_workbook(
+                source_path,
+                lambda workbook: (
+                    add_formatted_attendance_sheet(workbook, "1. ročník"),
+                    add_formatted_attendance_sheet(workbook, "2. ročník"),
+                ),
+            )
+
+            result = AttendanceSplitter().process([source_path])
+
+            self.assertEqual("success", result["status"])
+            created = [Path(item["path"]) for item in result["data"]["files"][0]["created_files"]]
+            self.assertEqual(
+                ["Docházka 1. ročník", "Docházka 2. ročník"],
+                [load_workbook(path).active["B2"].value for path in created],
+            )
+
+    def test_rejects_unknown_backend(self) -> None:
+        with self.assertRaises(ValueError):
+            AttendanceSplitter(backend="libreoffice")
+
+
+class RecordingExcelSession:
+    sessions: list["RecordingExcelSession"] = []
+    lock = threading.Lock()
+
+    def __init__(self, logger=None):
+        self.copies = []
+        self.closed = False
+        with self.lock:
+            self.sessions.append(self)
+
+    def __call__(self, source_path, sheet_name, output_path):
+        self.copies.append((Path(source_path).name, sheet_name))
+        Path(output_path).write_bytes(b"xlsx")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.closed = True
+
+
+class AttendanceSplitterSessionTests(unittest.TestCase):
+    def setUp(self) -> None:
+        RecordingExcelSession.sessions = []
+
+    def test_excel_backend_opens_one_session_per_source_workbook(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            sources = []
+            for name in ("a.xlsx", "b.xlsx"):
+                source_path = Path(temp_dir) / name
+                build_workbook(
+                    source_path,
+                    lambda workbook: [
+                        add_16h_attendance_sheet(workbook, f"{index}. ročník")
+                        for index in range(1, 4)
+                    ],
+                )
+                sources.append(source_path)
+
+            with mock.patch("tools.attendance_splitter.ExcelSheetCopier", RecordingExcelSession):
+                result = AttendanceSplitter(backend=AttendanceSplitter.BACKEND_EXCEL).process(sources)
+
+            self.assertEqual("success", result["status"])
+            self.assertEqual(6, result["data"]["created_count"])
+            self.assertEqual(2, len(RecordingExcelSession.sessions))
+            self.assertTrue(all(session.closed for session in RecordingExcelSession.sessions))
+            self.assertEqual(
+                [
+                    [(name, f"{index}. ročník") for index in range(1, 4)]
+                    for name in ("a.xlsx", "b.xlsx")
+                ],
+                sorted(session.copies for session in RecordingExcelSession.sessions),
+            )
+
+    def test_parallel_sources_in_one_folder_get_distinct_outputs(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            sources = []
+            for name in ("a.xlsx", "b.xlsx", "c.xlsx"):
+                source_path = Path(temp_dir) / name
+                build_workbook(
+                    source_path,
+                    lambda workbook: (
+                        add_16h_attendance_sheet(workbook, "1. ročník"),
+                        add_16h_attendance_sheet(workbook, "2. ročník"),
+                    ),
+                )
+                sources.append(source_path)
+
+            result = AttendanceSplitter(max_workers=3).process(sources)
+
+            self.assertEqual("success", result["status"])
+            self.assertEqual(
+                [str(path) for path in sources],
+                [file_result["source"] for file_result in result["data"]["files"]],
+            )
+            created = [
+                Path(item["path"])
+                for file_result in result["data"]["files"]
+                for item in file_result["created_files"]
+            ]
+            self.assertEqual(6, len(set(created)))
+            self.assertTrue(all(path.is_file() for path in created))
+
+    @unittest.skipIf(platform.system() == "Windows", "Excel is available on Windows")
+    def test_excel_copier_requires_windows(self) -> None:
+        with ExcelSheetCopier() as copier:
+            with self.assertRaises(RuntimeError):
+                copier("source.xlsx", "1. ročník", "output.xlsx")
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -31,6 +31,14 @@ class AttendanceSplitterServerTests(unittest.TestCase):
     def setUp(self) -> None:
         self.client = server.app.test_client()
 
+    def patch_splitter(self):
+        return patch.object(
+            server,
+            "AttendanceSplitter",
+            BACKEND_OPENPYXL=server.AttendanceSplitter.BACKEND_OPENPYXL,
+            BACKENDS=server.AttendanceSplitter.BACKENDS,
+        )
+
     def test_scan_endpoint_finds_candidates_in_folder(self) -> None:
         with tempfile.TemporaryDirectory() as temp_dir:
             workbook_path = Path(temp_dir) / "combined.xlsx"
@@ -79,7 +87,7 @@ class AttendanceSplitterServerTests(unittest.TestCase):
             },
         }
 
-        with patch.object(server, "AttendanceSplitter") as splitter_class:
+        with self.patch_splitter() as splitter_class:
             splitter_class.return_value.process.return_value = processor_result
             response = self.client.post(
                 "/api/attendance-splitter/process",
@@ -89,6 +97,29 @@ class AttendanceSplitterServerTests(unittest.TestCase):
         self.assertEqual(200, response.status_code)
         self.assertEqual(processor_result, response.get_json())
         splitter_class.return_value.process.assert_called_once()
+        self.assertEqual("openpyxl", splitter_class.call_args.kwargs["backend"])
+
+    def test_process_endpoint_passes_requested_backend(self) -> None:
+        with self.patch_splitter() as splitter_class:
+            splitter_class.return_value.process.return_value = {"success": True}
+            response = self.client.post(
+                "/api/attendance-splitter/process",
+                json={"filePaths": [r"D:\dochazky\combined.xlsx"], "backend": "excel"},
+            )
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual("excel", splitter_class.call_args.kwargs["backend"])
+
+    def test_process_endpoint_rejects_unknown_backend(self) -> None:
+        with self.patch_splitter() as splitter_class:
+            response = self.client.post(
+                "/api/attendance-splitter/process",
+                json={"filePaths": [r"D:\dochazky\combined.xlsx"], "backend": "libreoffice"},
+            )
+
+        self.assertEqual(400, response.status_code)
+        self.assertFalse(response.get_json()["success"])
+        splitter_class.assert_not_called()
 
     def test_process_endpoint_rejects_missing_files(self) -> None:
         response = self.client.post("/api/attendance-splitter/process", json={})
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 
+import asyncio
 import importlib.util
 import io
 import sys
@@ -14,9 +15,12 @@ sys.path.insert(0, str(Path(__file__).resolve().parent / "src" / "python"))
 from dvpp_cert_extraction import (
     CertificateRecord,
     ExtractionResult,
+    ExtractionSession,
     build_extraction_prompt,
     collect_input_files,
+    TokenBucket,
     extract_certificates,
+    extract_many,
     format_tsv_row,
     load_api_key,
     normalize_date,
@@ -351,6 +355,597 @@ class DvppCertExtractionTests(unittest.TestCase):
                     binary_content_factory=lambda _path: "BINARY_CONTENT",
                 )
 
+    def test_extract_many_runs_concurrently_and_keeps_input_order(self) -> None:
+        in_flight = 0
+        peak_in_flight = 0
+
+        class FakeAgent:
+            async def run(self, payload):
+                nonlocal in_flight, peak_in_flight
+                in_flight += 1
+                peak_in_flight = max(peak_in_flight, in_flight)
+                stem = payload[1]
+                await asyncio.sleep(0.02 if stem == "a" else 0)
+                in_flight -= 1
+                return SimpleNamespace(
+                    output={
+                        "certificates": [
+                            {
+                                "surname": f"Surname {stem}",
+                                "name": "Jana",
+                                "birth_date": "05.09.1980",
+                                "course_name": "Kurz AI",
+                                "completion_date": "14.03.2024",
+                                "hours": "8",
+                            }
+                        ]
+                    }
+                )
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = []
+            for stem in ("a", "b", "c", "d", "e"):
+                path = Path(temp_dir) / f"{stem}.pdf"
+                path.write_bytes(b"%PDF-1.4")
+                paths.append(path)
+
+            outcomes = extract_many(
+                paths,
+                "gemini-3-flash-preview",
+                api_key="gemini-secret",
+                agent_factory=lambda **_kwargs: FakeAgent(),
+                binary_content_factory=lambda path: path.stem,
+                max_concurrency=2,
+            )
+
+        self.assertEqual(2, peak_in_flight)
+        self.assertEqual([str(path) for path in paths], [outcome.source_file for outcome in outcomes])
+        self.assertEqual(
+            ["Surname a", "Surname b", "Surname c", "Surname d", "Surname e"],
+            [outcome.result.certificates[0].surname for outcome in outcomes],
+        )
+
+    def test_extract_many_retries_failures_with_exponential_backoff(self) -> None:
+        attempts = {"flaky": 0, "broken": 0}
+        sleeps = []
+
+        class FakeAgent:
+            def run_sync(self, payload):
+                stem = payload[1]
+                attempts[stem] += 1
+                if stem == "broken" or attempts[stem] < 2:
+                    raise ConnectionError(f"{stem} unavailable")
+                return SimpleNamespace(output={"certificates": []})
+
+        async def fake_sleep(delay: float) -> None:
+            sleeps.append(delay)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = []
+            for stem in ("flaky", "broken"):
+                path = Path(temp_dir) / f"{stem}.pdf"
+                path.write_bytes(b"%PDF-1.4")
+                paths.append(path)
+
+            outcomes = extract_many(
+                paths,
+                "gemini-3-flash-preview",
+                api_key="gemini-secret",
+                agent_factory=lambda **_kwargs: FakeAgent(),
+                binary_content_factory=lambda path: path.stem,
+                max_concurrency=1,
+                max_retries=2,
+                retry_backoff=1.0,
+                sleep=fake_sleep,
+            )
+
+        self.assertTrue(outcomes[0].success)
+        self.assertEqual(2, outcomes[0].attempts)
+        self.assertFalse(outcomes[1].success)
+        self.assertEqual(3, outcomes[1].attempts)
+        self.assertEqual("broken unavailable", outcomes[1].error)
+        self.assertEqual([1.0, 1.0, 2.0], sorted(sleeps))
+
+    def test_extract_many_fails_fast_on_permanent_errors(self) -> None:
+        attempts = []
+        sleeps = []
+
+        class RateLimited(Exception):
+            status_code = 429
+
+        class Unauthorized(Exception):
+            status_code = 401
+
+        class FakeAgent:
+            def run_sync(self, payload):
+                stem = payload[1]
+                attempts.append(stem)
+                if stem == "invalid-key":
+                    raise Unauthorized("API key not valid")
+                if stem == "invalid-output":
+                    raise ValueError("Malformed extraction response: missing certificates")
+                if attempts.count(stem) < 2:
+                    raise RateLimited("Resource exhausted")
+                return SimpleNamespace(output={"certificates": []})
+
+        async def fake_sleep(delay: float) -> None:
+            sleeps.append(delay)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = []
+            for stem in ("invalid-key", "invalid-output", "throttled"):
+                path = Path(temp_dir) / f"{stem}.pdf"
+                path.write_bytes(b"%PDF-1.4")
+                paths.append(path)
+
+            outcomes = extract_many(
+                paths,
+                "gemini-3-flash-preview",
+                api_key="gemini-secret",
+                agent_factory=lambda **_kwargs: FakeAgent(),
+                binary_content_factory=lambda path: path.stem,
+                max_concurrency=1,
+                max_retries=3,
+                retry_backoff=1.0,
+                sleep=fake_sleep,
+            )
+
+        self.assertEqual([1, 1, 2], [outcome.attempts for outcome in outcomes])
+        self.assertEqual("API key not valid", outcomes[0].error)
+        self.assertFalse(outcomes[1].success)
+        self.assertTrue(outcomes[2].success)
+        self.assertEqual([1.0], sleeps)
+
+    def test_extract_many_batches_small_files_and_maps_records_to_sources(self) -> None:
+        requests = []
+
+        def certificate(stem, origin=None):
+            item = {
+                "surname": f"Surname {stem}",
+                "name": "Jana",
+                "birth_date": "05.09.1980",
+                "course_name": "Kurz AI",
+                "completion_date": "14.03.2024",
+                "hours": "8",
+            }
+            if origin is not None:
+                item["origin"] = origin
+            return item
+
+        class FakeAgent:
+            async def run(self, payload):
+                stems = payload[2::2]
+                requests.append(stems)
+                if len(payload) == 2:
+                    return SimpleNamespace(output={"certificates": [certificate(payload[1])]})
+                certificates = []
+                for index, (label, stem) in enumerate(zip(payload[1::2], stems), start=1):
+                    self.test.assertEqual(f"Soubor {index}: {stem}.pdf", label)
+                    if index % 2:
+                        certificates.append(certificate(stem, {"source_index": index}))
+                    else:
+                        certificates.append(certificate(stem, {"source_file": f"{stem}.pdf"}))
+                        certificates.append(certificate(f"{stem}-2", {"source_file": f"{stem}.pdf"}))
+                return SimpleNamespace(output={"certificates": list(reversed(certificates))})
+
+        agent = FakeAgent()
+        agent.test = self
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = []
+            for stem in ("a", "b", "c", "d", "e"):
+                path = Path(temp_dir) / f"{stem}.pdf"
+                path.write_bytes(b"%PDF-1.4")
+                paths.append(path)
+
+            outcomes = extract_many(
+                paths,
+                "gemini-3-flash-preview",
+                api_key="gemini-secret",
+                agent_factory=lambda **_kwargs: agent,
+                binary_content_factory=lambda path: path.stem,
+                batch_size=3,
+            )
+
+        self.assertEqual([["a", "b", "c"], ["d", "e"]], sorted(requests))
+        self.assertEqual(
+            [["Surname a"], ["Surname b-2", "Surname b"], ["Surname c"], ["Surname d"], ["Surname e-2", "Surname e"]],
+            [[record.surname for record in outcome.result.certificates] for outcome in outcomes],
+        )
+        self.assertTrue(all(record.origin is None for outcome in outcomes for record in outcome.result.certificates))
+
+    def test_extract_many_splits_batch_on_malformed_response(self) -> None:
+        requests = []
+
+        class FakeAgent:
+            async def run(self, payload):
+                stems = payload[2::2]
+                requests.append(tuple(stems))
+                if len(payload) > 2 and "bad" in stems:
+                    return SimpleNamespace(output={"certificates": [{"surname": "Bez zdroje"}]})
+                return SimpleNamespace(
+                    output={
+                        "certificates": [
+                            {
+                                "surname": f"Surname {stem}",
+                                "name": "Jana",
+                                "birth_date": "05.09.1980",
+                                "course_name": "Kurz AI",
+                                "completion_date": "14.03.2024",
+                                "hours": "8",
+                                "origin": {"source_index": index},
+                            }
+                            for index, stem in enumerate(stems, start=1)
+                        ]
+                    }
+                )
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = []
+            for stem in ("a", "bad", "c", "d"):
+                path = Path(temp_dir) / f"{stem}.png"
+                path.write_bytes(b"png")
+                paths.append(path)
+            large_path = Path(temp_dir) / "large.pdf"
+            large_path.write_bytes(b"%PDF" * 64)
+            paths.append(large_path)
+
+            outcomes = extract_many(
+                paths,
+                "gemini-3-flash-preview",
+                api_key="gemini-secret",
+                agent_factory=lambda **_kwargs: FakeAgent(),
+                binary_content_factory=lambda path: path.stem,
+                batch_size=8,
+                max_batch_bytes=64,
+            )
+
+        self.assertTrue(all(outcome.success for outcome in outcomes))
+        self.assertEqual([3, 3, 2, 2, 1], [outcome.attempts for outcome in outcomes])
+        self.assertCountEqual(
+            [("a", "bad", "c", "d"), ("a", "bad"), ("c", "d"), (), (), ()],
+            requests,
+        )
+
+    def test_extract_many_does_not_split_batch_on_rejected_or_throttled_requests(self) -> None:
+        class Unauthorized(Exception):
+            status_code = 401
+
+        class RateLimited(Exception):
+            status_code = 429
+
+        def run_batch(error_type, failures):
+            requests = []
+            sleeps = []
+
+            class FakeAgent:
+                async def run(self, payload):
+                    stems = tuple(payload[2::2]) or (payload[1],)
+                    requests.append(stems)
+                    if len(requests) <= failures:
+                        raise error_type("request refused")
+                    return SimpleNamespace(
+                        output={
+                            "certificates": [
+                                {
+                                    "surname": f"Surname {stem}",
+                                    "name": "Jana",
+                                    "birth_date": "05.09.1980",
+                                    "course_name": "Kurz AI",
+                                    "completion_date": "14.03.2024",
+                                    "hours": "8",
+                                    "origin": {"source_index": index},
+                                }
+                                for index, stem in enumerate(stems, start=1)
+                            ]
+                        }
+                    )
+
+            async def fake_sleep(delay: float) -> None:
+                sleeps.append(delay)
+
+            with tempfile.TemporaryDirectory() as temp_dir:
+                paths = []
+                for index in range(8):
+                    path = Path(temp_dir) / f"file{index}.png"
+                    path.write_bytes(b"png")
+                    paths.append(path)
+
+                outcomes = extract_many(
+                    paths,
+                    "gemini-3-flash-preview",
+                    api_key="gemini-secret",
+                    agent_factory=lambda **_kwargs: FakeAgent(),
+                    binary_content_factory=lambda path: path.stem,
+                    batch_size=8,
+                    max_retries=2,
+                    retry_backoff=1.0,
+                    sleep=fake_sleep,
+                )
+            return outcomes, requests, sleeps
+
+        outcomes, requests, sleeps = run_batch(Unauthorized, failures=99)
+        self.assertEqual(1, len(requests))
+        self.assertEqual([], sleeps)
+        self.assertFalse(any(outcome.success for outcome in outcomes))
+        self.assertEqual({"request refused"}, {outcome.error for outcome in outcomes})
+        self.assertEqual({1}, {outcome.attempts for outcome in outcomes})
+
+        outcomes, requests, sleeps = run_batch(RateLimited, failures=1)
+        self.assertEqual(2, len(requests))
+        self.assertEqual({8}, {len(stems) for stems in requests})
+        self.assertEqual([1.0], sleeps)
+        self.assertTrue(all(outcome.success for outcome in outcomes))
+        self.assertEqual({2}, {outcome.attempts for outcome in outcomes})
+
+    def test_extract_many_retries_files_missing_from_batch_alone_without_caching_batch_gap(self) -> None:
+        requests = []
+        cached = {}
+
+        def certificate(stem, index):
+            return {
+                "surname": f"Surname {stem}",
+                "name": "Jana",
+                "birth_date": "05.09.1980",
+                "course_name": "Kurz AI",
+                "completion_date": "14.03.2024",
+                "hours": "8",
+                "origin": {"source_index": index},
+            }
+
+        class FakeAgent:
+            async def run(self, payload):
+                stems = tuple(payload[2::2]) or (payload[1],)
+                requests.append(stems)
+                if len(stems) > 1:
+                    # The model drops "skipped" from the shared answer.
+                    return SimpleNamespace(
+                        output={
+                            "certificates": [
+                                certificate(stem, index)
+                                for index, stem in enumerate(stems, start=1)
+                                if stem != "skipped"
+                            ]
+                        }
+                    )
+                return SimpleNamespace(output={"certificates": [certificate(stems[0], 1)]})
+
+        class RecordingCache:
+            def key_for(self, path, model_name):
+                return Path(path).stem
+
+            def get(self, key):
+                return None
+
+            def put(self, key, result):
+                cached[key] = [record.surname for record in result.certificates]
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = []
+            for stem in ("a", "skipped"):
+                path = Path(temp_dir) / f"{stem}.png"
+                path.write_bytes(b"png")
+                paths.append(path)
+
+            outcomes = extract_many(
+                paths,
+                "gemini-3-flash-preview",
+                api_key="gemini-secret",
+                agent_factory=lambda **_kwargs: FakeAgent(),
+                binary_content_factory=lambda path: path.stem,
+                batch_size=2,
+                cache=RecordingCache(),
+            )
+
+        self.assertCountEqual([("a", "skipped"), ("a",), ("skipped",)], requests)
+        self.assertEqual(["Surname skipped"], [record.surname for record in outcomes[1].result.certificates])
+        self.assertEqual({"a": ["Surname a"], "skipped": ["Surname skipped"]}, cached)
+
+    def test_extract_many_records_timing_bytes_and_token_usage(self) -> None:
+        class FakeAgent:
+            async def run(self, payload):
+                await asyncio.sleep(0.02)
+                return SimpleNamespace(
+                    output={"certificates": []},
+                    usage=lambda: SimpleNamespace(input_tokens=1200, output_tokens=30),
+                )
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = []
+            for stem in ("a", "b"):
+                path = Path(temp_dir) / f"{stem}.pdf"
+                path.write_bytes(b"%PDF-1.4")
+                paths.append(path)
+
+            outcomes = extract_many(
+                paths,
+                "gemini-3-flash-preview",
+                api_key="gemini-secret",
+                agent_factory=lambda **_kwargs: FakeAgent(),
+                binary_content_factory=lambda path: SimpleNamespace(data=path.read_bytes()),
+                max_concurrency=1,
+            )
+
+        prompt_bytes = len(ExtractionSession(
+            "gemini-3-flash-preview",
+            api_key="gemini-secret",
+            agent_factory=lambda **_kwargs: FakeAgent(),
+        ).prompt.encode("utf-8"))
+        for outcome in outcomes:
+            self.assertEqual(prompt_bytes + len(b"%PDF-1.4"), outcome.usage.request_bytes)
+            self.assertEqual(len(b'{"certificates": []}'), outcome.usage.response_bytes)
+            self.assertEqual((1200, 30), (outcome.usage.input_tokens, outcome.usage.output_tokens))
+            self.assertEqual(0, outcome.retries)
+            self.assertGreaterEqual(outcome.wall_time_ms, 20)
+        self.assertGreaterEqual(max(outcome.queue_wait_ms for outcome in outcomes), 15)
+
+    def test_extract_many_wall_time_excludes_queue_position(self) -> None:
+        class FakeAgent:
+            async def run(self, payload):
+                await asyncio.sleep(0.05)
+                return SimpleNamespace(output={"certificates": []})
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = []
+            for stem in ("a", "b", "c", "d", "e"):
+                path = Path(temp_dir) / f"{stem}.pdf"
+                path.write_bytes(b"%PDF-1.4")
+                paths.append(path)
+
+            outcomes = extract_many(
+                paths,
+                "gemini-3-flash-preview",
+                api_key="gemini-secret",
+                agent_factory=lambda **_kwargs: FakeAgent(),
+                binary_content_factory=lambda path: path.stem,
+                use_text_layer=False,
+                max_concurrency=1,
+            )
+
+        wall_times = [outcome.wall_time_ms for outcome in outcomes]
+        for wall_time in wall_times:
+            self.assertGreaterEqual(wall_time, 45)
+            self.assertLess(wall_time, 150)
+        self.assertLess(max(wall_times) - min(wall_times), 60)
+        self.assertGreaterEqual(max(outcome.queue_wait_ms for outcome in outcomes), 150)
+
+    def test_token_bucket_spaces_requests_after_burst(self) -> None:
+        now = [0.0]
+        waits = []
+
+        async def fake_sleep(delay: float) -> None:
+            waits.append(round(delay, 6))
+            now[0] += delay
+
+        async def acquire_four() -> None:
+            bucket = TokenBucket(2.0, capacity=2, clock=lambda: now[0], sleep=fake_sleep)
+            for _ in range(4):
+                await bucket.acquire()
+
+        asyncio.run(acquire_four())
+
+        self.assertEqual([0.5, 0.5], waits)
+        self.assertEqual(1.0, now[0])
+
+    def test_extraction_session_builds_agent_and_prompt_once(self) -> None:
+        factory_calls = []
+        payloads = []
+
+        class FakeAgent:
+            def run_sync(self, payload):
+                payloads.append(payload)
+                return SimpleNamespace(output={"certificates": []})
+
+        def fake_agent_factory(*, model_name: str, api_key: str):
+            factory_calls.append((model_name, api_key))
+            return FakeAgent()
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = []
+            for stem in ("a", "b", "c"):
+                path = Path(temp_dir) / f"{stem}.pdf"
+                path.write_bytes(b"%PDF-1.4")
+                paths.append(path)
+
+            session = ExtractionSession(
+                "gemini-3-flash-preview",
+                api_key=" gemini-secret ",
+                agent_factory=fake_agent_factory,
+                binary_content_factory=lambda path: path.stem,
+            )
+            with patch("dvpp_cert_extraction.build_extraction_prompt") as mocked_prompt:
+                for path in paths:
+                    extract_certificates(path, "gemini-3-flash-preview", session=session)
+                outcomes = extract_many(paths, "gemini-3-flash-preview", session=session)
+
+        mocked_prompt.assert_not_called()
+        self.assertEqual([("gemini-3-flash-preview", "gemini-secret")], factory_calls)
+        self.assertEqual(["a", "b", "c"] * 2, [payload[1] for payload in payloads])
+        self.assertTrue(all(payload[0] is session.prompt for payload in payloads))
+        self.assertTrue(all(outcome.success for outcome in outcomes))
+
+    def test_extraction_session_pools_http_client_for_default_agent(self) -> None:
+        with patch("dvpp_cert_extraction.create_agent") as mocked_create_agent:
+            session = ExtractionSession("gemini-3-flash-preview", api_key="gemini-secret", max_connections=3)
+
+        mocked_create_agent.assert_called_once_with(
+            model_name="gemini-3-flash-preview",
+            api_key="gemini-secret",
+            http_client=session.http_client,
+        )
+        asyncio.run(session.aclose())
+        self.assertTrue(session.http_client.is_closed)
+
+    def test_gemini_importer_reuses_session_per_model_and_key(self) -> None:
+        from dvpp_certificates.importers import GeminiCertificateImporter
+
+        created_sessions = []
+        extractor_calls = []
+
+        def session_factory(model_name, *, api_key=None, env=None):
+            session = SimpleNamespace(model_name=model_name, api_key=api_key)
+            created_sessions.append(session)
+            return session
+
+        def fake_extractor(file_path, model_name, *, session):
+            extractor_calls.append((file_path, session))
+            return ExtractionResult(certificates=[])
+
+        importer = GeminiCertificateImporter(extractor=fake_extractor, session_factory=session_factory)
+        importer.import_file("a.pdf", model_name="gemini-3-flash-preview", api_key="key-1")
+        importer.import_file("b.pdf", model_name="gemini-3-flash-preview", api_key="key-1")
+        importer.import_file("c.pdf", model_name="gemini-3.1-pro-preview", api_key="key-1")
+
+        self.assertEqual(2, len(created_sessions))
+        self.assertIs(extractor_calls[0][1], extractor_calls[1][1])
+        self.assertEqual("gemini-3.1-pro-preview", extractor_calls[2][1].model_name)
+
+    def test_extract_certificates_closes_session_it_creates(self) -> None:
+        clients = []
+
+        class FakeAgent:
+            def run_sync(self, payload):
+                return SimpleNamespace(output={"certificates": []})
+
+        def fake_create_agent(*, model_name, api_key, http_client):
+            clients.append(http_client)
+            return FakeAgent()
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "a.pdf"
+            path.write_bytes(b"%PDF-1.4")
+            with patch("dvpp_cert_extraction.create_agent", side_effect=fake_create_agent):
+                extract_certificates(
+                    path,
+                    "gemini-3-flash-preview",
+                    api_key="gemini-secret",
+                    binary_content_factory=lambda path: path.stem,
+                )
+
+        self.assertEqual(1, len(clients))
+        self.assertTrue(clients[0].is_closed)
+
+    def test_gemini_importer_close_closes_cached_sessions(self) -> None:
+        from dvpp_certificates.importers import GeminiCertificateImporter
+
+        closed = []
+
+        def session_factory(model_name, *, api_key=None, env=None):
+            return SimpleNamespace(close=lambda: closed.append((model_name, api_key)))
+
+        importer = GeminiCertificateImporter(
+            extractor=lambda file_path, model_name, *, session: ExtractionResult(certificates=[]),
+            session_factory=session_factory,
+        )
+        importer.import_file("a.pdf", model_name="gemini-3-flash-preview", api_key="key-1")
+        importer.import_file("b.pdf", model_name="gemini-3.1-pro-preview", api_key="key-1")
+        importer.close()
+        importer.close()
+
+        self.assertCountEqual(
+            [("gemini-3-flash-preview", "key-1"), ("gemini-3.1-pro-preview", "key-1")],
+            closed,
+        )
+
     def test_cli_parse_args_supports_required_and_optional_arguments(self) -> None:
         cli_module = self._load_cli_module()
 
@@ -505,6 +1100,7 @@ class DvppCertExtractionTests(unittest.TestCase):
                     "extract_certificates",
                     side_effect=[first_result, second_result],
                 ) as mocked_extract,
+                patch.object(cli_module, "ExtractionSession") as mocked_session,
                 patch.object(sys, "stdout", new_callable=io.StringIO) as stdout,
             ):
                 exit_code = cli_module.main(
@@ -524,9 +1120,51 @@ class DvppCertExtractionTests(unittest.TestCase):
             ],
             [call.args for call in mocked_extract.call_args_list],
         )
+        mocked_session.assert_called_once_with("gemini-3-flash-preview")
+        self.assertEqual(
+            [mocked_session.return_value, mocked_session.return_value],
+            [call.kwargs["session"] for call in mocked_extract.call_args_list],
+        )
+        mocked_session.return_value.close.assert_called_once_with()
         self.assertIn("Novakova\tJana\t05.09.1980", stdout.getvalue())
         self.assertIn("Svobodova\tMarie\t24.07.2000", stdout.getvalue())
 
+    def test_cli_main_skips_session_when_every_file_has_text_layer(self) -> None:
+        cli_module = self._load_cli_module()
+        text_layer_result = ExtractionResult(
+            certificates=[
+                CertificateRecord(
+                    surname="Novakova",
+                    name="Jana",
+                    birth_date="05.09.1980",
+                    course_name="Kurz AI",
+                    completion_date="14.03.2024",
+                    hours="8",
+                    topic="umela inteligence",
+                )
+            ]
+        )
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            batch_dir = Path(temp_dir) / "batch"
+            batch_dir.mkdir()
+            (batch_dir / "a.pdf").write_bytes(b"%PDF-1.4")
+            (batch_dir / "b.pdf").write_bytes(b"%PDF-1.4")
+
+            with (
+                patch.object(cli_module, "extract_text_layer", return_value=text_layer_result),
+                patch.object(cli_module, "extract_certificates") as mocked_extract,
+                patch.object(cli_module, "ExtractionSession") as mocked_session,
+                patch.object(sys, "stdout", new_callable=io.StringIO),
+            ):
+                exit_code = cli_module.main(
+                    ["--input-dir", str(batch_dir), "--model", "gemini-3-flash-preview"]
+                )
+
+        self.assertEqual(0, exit_code)
+        mocked_session.assert_not_called()
+        mocked_extract.assert_not_called()
+
     def test_cli_main_exits_cleanly_on_unexpected_extraction_error(self) -> None:
         cli_module = self._load_cli_module()
 
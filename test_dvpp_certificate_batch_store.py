@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "src" / "python"))
+
+import server
+
+from dvpp_certificates.batch_store import BatchNotFoundError, CertificateBatchStore
+from dvpp_certificates.domain import CertificateRecord, ExtractionBatch
+from tools.dvpp_certificate_processor import DvppCertificateProcessor
+
+
+RAW_TEXT = "\n".join(
+    [
+        "Novakova\tJana\t05.09.1980\t\tKurz AI ve vyuce\t14.03.2024\t8\t\t",
+        "Dvorak\tPetr\t24.07.1975\t\tKurz AI ve vyuce\t14.03.2024\t8\t\t",
+    ]
+)
+
+
+def build_batch(*surnames: str) -> ExtractionBatch:
+    return ExtractionBatch(
+        input_mode="raw_text",
+        records=[
+            CertificateRecord(
+                surname=surname,
+                name="Jana",
+                birth_date="05.09.1980",
+                course_name="Kurz AI ve vyuce",
+                completion_date="14.03.2024",
+                hours="8",
+            )
+            for surname in surnames
+        ],
+    )
+
+
+class CertificateBatchStoreTests(unittest.TestCase):
+    def test_apply_edits_updates_working_values_and_revision(self) -> None:
+        store = CertificateBatchStore()
+        batch_id = store.add(build_batch("Novakova", "Dvorak", "Svobodova"))
+
+        result = store.apply_edits(
+            batch_id,
+            [
+                {"op": "set", "index": 0, "field": "completion_date", "value": "2024-03-15"},
+                {"op": "delete", "index": 1},
+                {"op": "set_all", "field": "forma", "value": "stáž"},
+            ],
+        )
+
+        records = store.get(batch_id).records
+        self.assertEqual(1, result["revision"])
+        self.assertEqual(2, result["record_count"])
+        self.assertEqual("15.03.2024", result["applied"][0]["value"])
+        self.assertEqual(["Novakova", "Svobodova"], [record.working_record.surname for record in records])
+        self.assertEqual("15.03.2024", records[0].working_record.completion_date)
+        self.assertEqual("14.03.2024", records[0].extracted_record.completion_date)
+        self.assertEqual(["stáž", "stáž"], [record.working_record.forma for record in records])
+
+    def test_invalid_edit_leaves_batch_unchanged(self) -> None:
+        store = CertificateBatchStore()
+        batch_id = store.add(build_batch("Novakova", "Dvorak"))
+
+        for edits in (
+            [{"op": "set", "index": 0, "field": "hours", "value": "16"}, {"op": "set", "index": 5, "field": "hours", "value": "16"}],
+            [{"op": "delete", "index": 1}, {"op": "set", "index": 1, "field": "hours", "value": "16"}],
+            [{"op": "set", "index": 0, "field": "birth_date", "value": "31.02.1980"}],
+            [{"op": "set", "index": 0, "field": "unknown", "value": "x"}],
+            [{"op": "rename", "index": 0}],
+        ):
+            with self.assertRaises((TypeError, ValueError)):
+                store.apply_edits(batch_id, edits)
+
+        records = store.get(batch_id).records
+        self.assertEqual(2, len(records))
+        self.assertEqual(["8", "8"], [record.working_record.hours for record in records])
+        self.assertEqual(0, store.revision(batch_id))
+
+    def test_oldest_batch_is_evicted_over_capacity(self) -> None:
+        store = CertificateBatchStore(max_batches=2)
+        first = store.add(build_batch("Novakova"))
+        second = store.add(build_batch("Dvorak"))
+        store.get(first)
+
+        third = store.add(build_batch("Svobodova"))
+
+        self.assertEqual(2, len(store))
+        self.assertIsNotNone(store.get(first))
+        self.assertIsNotNone(store.get(third))
+        with self.assertRaises(BatchNotFoundError):
+            store.get(second)
+
+    def test_processor_exports_stored_batch_by_id(self) -> None:
+        processor = DvppCertificateProcessor(batch_store=CertificateBatchStore())
+        imported = processor.import_raw_text(RAW_TEXT)
+        batch_id = imported["data"]["batch"]["batch_id"]
+
+        updated = processor.update_batch(batch_id, [{"op": "set", "index": 1, "field": "hours", "value": "12"}])
+        result = processor.export_tsv(None, batch_id=batch_id)
+
+        self.assertTrue(updated["success"])
+        self.assertTrue(result["success"])
+        self.assertEqual(
+            [
+                "Novakova\tJana\t05.09.1980\t\tKurz AI ve vyuce\t14.03.2024\t8\t\t",
+                "Dvorak\tPetr\t24.07.1975\t\tKurz AI ve vyuce\t14.03.2024\t12\t\t",
+            ],
+            result["data"]["content"].splitlines(),
+        )
+
+    def test_processor_reports_missing_batch(self) -> None:
+        processor = DvppCertificateProcessor(batch_store=CertificateBatchStore())
+
+        result = processor.export_esf(None, batch_id="missing")
+
+        self.assertFalse(result["success"])
+        self.assertTrue(result["data"]["batchMissing"])
+        self.assertFalse(processor.update_batch("missing", [])["success"])
+
+    def test_processor_reports_exporter_failure_for_existing_batch(self) -> None:
+        processor = DvppCertificateProcessor(batch_store=CertificateBatchStore())
+        batch_id = processor.import_raw_text(RAW_TEXT)["data"]["batch"]["batch_id"]
+
+        with patch(
+            "tools.dvpp_certificate_processor.export_records_to_excel",
+            side_effect=KeyError("Worksheet podpory does not exist."),
+        ):
+            result = processor.export_excel(None, {}, batch_id=batch_id)
+
+        self.assertFalse(result["success"])
+        self.assertNotIn("batchMissing", result.get("data") or {})
+        self.assertEqual(["'Worksheet podpory does not exist.'"], result["errors"])
+
+    def test_server_applies_edits_and_exports_by_batch_id(self) -> None:
+        client = server.app.test_client()
+        with patch.object(server, "DVPP_CERTIFICATE_BATCHES", CertificateBatchStore()):
+            imported = client.post("/api/dvpp-certificates/import/raw-text", json={"rawText": RAW_TEXT})
+            batch_id = imported.get_json()["data"]["batch"]["batch_id"]
+
+            edited = client.post(
+                f"/api/dvpp-certificates/batches/{batch_id}/edits",
+                json={"edits": [{"op": "delete", "index": 0}]},
+            )
+            exported = client.post("/api/dvpp-certificates/export/tsv", json={"batchId": batch_id})
+            discarded = client.delete(f"/api/dvpp-certificates/batches/{batch_id}")
+            missing = client.post("/api/dvpp-certificates/export/tsv", json={"batchId": batch_id})
+
+        self.assertEqual(200, edited.status_code)
+        self.assertEqual(1, edited.get_json()["data"]["record_count"])
+        self.assertEqual(200, exported.status_code)
+        self.assertTrue(exported.get_json()["data"]["content"].startswith("Dvorak\tPetr"))
+        self.assertEqual(200, discarded.status_code)
+        self.assertEqual(400, missing.status_code)
+        self.assertTrue(missing.get_json()["data"]["batchMissing"])
+
+
+if __name__ == "__main__":
+    unittest.main()
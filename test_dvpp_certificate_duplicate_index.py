@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "src" / "python"))
+
+import server
+
+from dvpp_certificates.batch_store import CertificateBatchStore
+from dvpp_certificates.domain import CertificateRecord, ExtractionBatch, RecordOrigin, RecordTable
+from dvpp_certificates.duplicate_index import CertificateDuplicateIndex, certificate_key, person_key
+from tools.dvpp_certificate_processor import DvppCertificateProcessor
+
+
+def build_table(*rows: tuple[str, str, str]) -> RecordTable:
+    return RecordTable(
+        CertificateRecord(
+            surname=surname,
+            name="Jana",
+            birth_date="05.09.1980",
+            course_name=course_name,
+            completion_date=completion_date,
+            hours="8",
+            origin=RecordOrigin(source_mode="gemini", source_file=f"{surname}.pdf"),
+        )
+        for surname, course_name, completion_date in rows
+    )
+
+
+def build_table_batch(*rows: tuple[str, str, str]) -> ExtractionBatch:
+    return ExtractionBatch(input_mode="gemini", records=build_table(*rows))
+
+
+class CertificateDuplicateIndexTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.cache_dir = Path(self.temp_dir.name)
+
+    def test_keys_ignore_case_diacritics_and_spacing(self) -> None:
+        self.assertEqual(
+            person_key("Nováková", "Jana", "05.09.1980"),
+            person_key(" NOVAKOVA ", "jana", "05.09.1980"),
+        )
+        self.assertNotEqual(
+            certificate_key("Novakova", "Jana", "05.09.1980", "Kurz A", "14.03.2024"),
+            certificate_key("Novakova", "Jana", "05.09.1980", "Kurz A", "15.03.2024"),
+        )
+
+    def test_flags_repeats_within_batch_and_across_persisted_imports(self) -> None:
+        index = CertificateDuplicateIndex(self.cache_dir)
+        first = build_table(("Novakova", "Kurz A", "14.03.2024"), ("Dvorakova", "Kurz A", "14.03.2024"))
+        index.register("first", first)
+
+        reopened = CertificateDuplicateIndex(self.cache_dir)
+        second = build_table(
+            ("Nováková", "Kurz A", "14.03.2024"),
+            ("Svobodova", "Kurz B", "20.04.2024"),
+            ("Svobodova", "Kurz B", "20.04.2024"),
+            ("Dvorakova", "Kurz B", "20.04.2024"),
+        )
+        reopened.register("second", second)
+
+        duplicates = reopened.find_duplicates("second", second)
+
+        self.assertEqual(
+            [(0, "history"), (2, "batch"), (3, "person")],
+            [(item["index"], item["scope"]) for item in duplicates],
+        )
+        self.assertEqual("first", duplicates[0]["duplicate_of"]["batch_id"])
+        self.assertEqual("Novakova.pdf", duplicates[0]["duplicate_of"]["source_file"])
+        self.assertEqual({"index": 1}, duplicates[1]["duplicate_of"])
+        self.assertEqual([], reopened.find_duplicates("first", first))
+        persisted = index.index_path.read_text(encoding="utf-8")
+        self.assertNotIn("05.09.1980", persisted)
+        self.assertNotIn("Kurz A", persisted)
+
+    def test_records_with_blank_identity_fields_are_not_matched(self) -> None:
+        self.assertIsNone(person_key("Novakova", "Jana", ""))
+        self.assertIsNone(certificate_key("Novakova", "Jana", " ", "Kurz A", "14.03.2024"))
+
+        class BlankBirthDateTable:
+            def __init__(self, *surnames):
+                self.rows = [
+                    SimpleNamespace(
+                        surname=surname,
+                        name="Jana",
+                        birth_date="",
+                        course_name="Kurz A",
+                        completion_date="14.03.2024",
+                    )
+                    for surname in surnames
+                ]
+
+            def working_rows(self):
+                return iter(self.rows)
+
+            def origin(self, index):
+                return None
+
+        index = CertificateDuplicateIndex(self.cache_dir)
+        first = BlankBirthDateTable("Novakova")
+        self.assertEqual(0, index.register("first", first))
+
+        second = BlankBirthDateTable("Novakova", "Novakova")
+        index.register("second", second)
+
+        self.assertEqual([], index.find_duplicates("second", second))
+
+    def test_oldest_entries_are_evicted_over_cap(self) -> None:
+        index = CertificateDuplicateIndex(self.cache_dir, max_certificates=2)
+        index.register("first", build_table(("Novakova", "Kurz A", "14.03.2024")))
+        index.register("second", build_table(("Dvorakova", "Kurz A", "14.03.2024"), ("Svobodova", "Kurz A", "14.03.2024")))
+
+        duplicates = index.find_duplicates("third", build_table(("Novakova", "Kurz A", "14.03.2024")))
+
+        self.assertEqual([], duplicates)
+
+    def test_batch_store_reports_duplicates_for_current_working_values(self) -> None:
+        store = CertificateBatchStore(duplicate_index=CertificateDuplicateIndex(self.cache_dir))
+        store.add(build_table_batch(("Novakova", "Kurz A", "14.03.2024")))
+        batch_id = store.add(build_table_batch(("Novakova", "Kurz A", "14.03.2024")))
+
+        self.assertEqual(["history"], [item["scope"] for item in store.duplicates(batch_id)])
+        store.apply_edits(batch_id, [{"op": "set", "index": 0, "field": "completion_date", "value": "15.03.2024"}])
+        self.assertEqual(["person"], [item["scope"] for item in store.duplicates(batch_id)])
+
+    def test_repeated_raw_text_import_is_flagged_and_queryable(self) -> None:
+        raw_text = "Novakova\tJana\t05.09.1980\t\tKurz AI ve vyuce\t14.03.2024\t8\t\t"
+        store = CertificateBatchStore(duplicate_index=CertificateDuplicateIndex(self.cache_dir))
+
+        first = DvppCertificateProcessor(batch_store=store).import_raw_text(raw_text)
+        second = DvppCertificateProcessor(batch_store=store).import_raw_text(raw_text)
+
+        self.assertEqual([], first["data"]["duplicates"])
+        self.assertEqual([], first["warnings"])
+        self.assertEqual(1, len(second["data"]["duplicates"]))
+        self.assertEqual(1, len(second["warnings"]))
+
+        with patch.object(server, "DVPP_CERTIFICATE_BATCHES", store):
+            response = server.app.test_client().get(
+                f"/api/dvpp-certificates/batches/{second['data']['batch']['batch_id']}/duplicates"
+            )
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual("history", response.get_json()["data"]["duplicates"][0]["scope"])
+
+
+if __name__ == "__main__":
+    unittest.main()
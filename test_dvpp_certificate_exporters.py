@@ -4,14 +4,19 @@ import sys
 import tempfile
 import unittest
 from dataclasses import asdict
+from datetime import datetime
 from pathlib import Path
 from unittest.mock import patch
 
+from openpyxl import Workbook, load_workbook
+from openpyxl.styles import Font
+from openpyxl.worksheet.datavalidation import DataValidation
+
 sys.path.insert(0, str(Path(__file__).resolve().parent / "src" / "python"))
 
 import server
 
-from dvpp_certificates.domain import CertificateRecord, ExportMetadata
+from dvpp_certificates.domain import CertificateRecord, ExportMetadata, RecordTable
 from dvpp_certificates.exporters import (
     DEFAULT_EXCEL_TEMPLATE_PATH,
     _write_records_to_sheet,
@@ -78,6 +83,21 @@ def build_working_record_payload() -> dict:
     }
 
 
+def write_podpory_template(path: Path) -> None:
+    workbook = Workbook()
+    workbook.active.title = "Pokyny"
+    sheet = workbook.create_sheet("podpory")
+    sheet["B10"] = "Příjmení"
+    for row in range(11, 501):
+        for column in range(2, 11):
+            sheet.cell(row=row, column=column).font = Font(name="Arial", size=9)
+    sheet["C20"] = "stara hodnota"
+    validation = DataValidation(type="list", formula1='"stáž,mentoring"', allow_blank=True)
+    validation.add("H11:H500")
+    sheet.add_data_validation(validation)
+    workbook.save(path)
+
+
 def build_export_metadata(**overrides) -> ExportMetadata:
     payload = {
         "project_number": "CZ.00/00/00/00000",
@@ -288,6 +308,88 @@ class DvppCertificateExportersTests(unittest.TestCase):
         self.assertEqual(1, len(writer_calls))
         self.assertEqual(output_path, writer_calls[0][0])
 
+    def test_openpyxl_writer_fills_podpory_sheet_and_keeps_template_formatting(self) -> None:
+        table = RecordTable.from_payload([build_working_record_payload()] * 600)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            template_path = Path(temp_dir) / "template.xlsx"
+            write_podpory_template(template_path)
+
+            output_path = export_records_to_excel(
+                table,
+                build_export_metadata(),
+                template_path=str(template_path),
+                output_path=str(Path(temp_dir) / "out.xlsx"),
+                workbook_writer="openpyxl",
+            )
+
+            workbook = load_workbook(output_path)
+            sheet = workbook["podpory"]
+            self.assertEqual(["Pokyny", "podpory"], workbook.sheetnames)
+            self.assertEqual("CZ.00/00/00/00000", sheet["D6"].value)
+            self.assertEqual("Zakladni skola Test", sheet["D7"].value)
+            self.assertEqual("Příjmení", sheet["B10"].value)
+            self.assertEqual(
+                ["Novakova", "Jana", "vzdělávání ZŠ_2_II_4", "Kurz AI ve vyuce - upraveno"],
+                [sheet.cell(row=11, column=column).value for column in range(2, 6)],
+            )
+            self.assertEqual(datetime(2024, 3, 15), sheet["F11"].value)
+            self.assertEqual(16, sheet["G11"].value)
+            self.assertEqual("Novakova", sheet["B610"].value)
+            self.assertIsNone(sheet["B611"].value)
+            self.assertEqual("Jana", sheet["C20"].value)
+            self.assertEqual("Arial", sheet["B11"].font.name)
+            self.assertEqual("Arial", sheet["B610"].font.name)
+            self.assertEqual(["H11:H610"], [str(rng) for dv in sheet.data_validations.dataValidation for rng in dv.sqref.ranges])
+            workbook.close()
+
+    def test_openpyxl_writer_clears_previous_rows_when_exporting_fewer_records(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            template_path = Path(temp_dir) / "template.xlsx"
+            write_podpory_template(template_path)
+
+            output_path = export_records_to_excel(
+                [build_working_record_payload()],
+                build_export_metadata(fill_header=False, project_number="", recipient_name="", zor_number=""),
+                template_path=str(template_path),
+                workbook_writer="openpyxl",
+            )
+
+            workbook = load_workbook(output_path)
+            sheet = workbook["podpory"]
+            self.assertIsNone(sheet["C20"].value)
+            self.assertIsNone(sheet["D6"].value)
+            self.assertEqual("Novakova", sheet["B11"].value)
+            self.assertIsNone(sheet["J11"].value)
+            workbook.close()
+
+    def test_export_records_to_excel_defaults_to_xlwings_writer(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            template_path = Path(temp_dir) / "template.xlsx"
+            write_podpory_template(template_path)
+
+            with patch("dvpp_certificates.exporters._write_records_with_xlwings") as xlwings_writer:
+                export_records_to_excel(
+                    [build_working_record_payload()],
+                    build_export_metadata(),
+                    template_path=str(template_path),
+                )
+
+        xlwings_writer.assert_called_once()
+
+    def test_export_records_to_excel_rejects_unknown_writer_name(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            template_path = Path(temp_dir) / "template.xlsx"
+            write_podpory_template(template_path)
+
+            with self.assertRaises(ValueError):
+                export_records_to_excel(
+                    [build_working_record_payload()],
+                    build_export_metadata(),
+                    template_path=str(template_path),
+                    workbook_writer="calc",
+                )
+
     def test_export_records_to_esf_csv_writes_header_and_keeps_all_columns(self) -> None:
         record = build_working_record_payload()
 
@@ -376,10 +478,10 @@ class DvppCertificateExportersTests(unittest.TestCase):
 
     def test_server_tsv_export_endpoint_returns_processor_payload(self) -> None:
         class FakeProcessor:
-            def __init__(self, logger, importer=None) -> None:
+            def __init__(self, logger, importer=None, batch_store=None) -> None:
                 self.logger = logger
 
-            def export_tsv(self, records_payload, output_path=None):
+            def export_tsv(self, records_payload, output_path=None, batch_id=None):
                 return {
                     "success": True,
                     "data": {
@@ -407,10 +509,10 @@ class DvppCertificateExportersTests(unittest.TestCase):
 
     def test_server_excel_export_endpoint_returns_processor_payload(self) -> None:
         class FakeProcessor:
-            def __init__(self, logger, importer=None) -> None:
+            def __init__(self, logger, importer=None, batch_store=None) -> None:
                 self.logger = logger
 
-            def export_excel(self, records_payload, export_metadata_payload, template_path=None, output_path=None):
+            def export_excel(self, records_payload, export_metadata_payload, template_path=None, output_path=None, batch_id=None, workbook_writer=None):
                 return {
                     "success": True,
                     "data": {
@@ -440,10 +542,10 @@ class DvppCertificateExportersTests(unittest.TestCase):
 
     def test_server_excel_export_endpoint_prefers_specific_processor_error(self) -> None:
         class FakeProcessor:
-            def __init__(self, logger, importer=None) -> None:
+            def __init__(self, logger, importer=None, batch_store=None) -> None:
                 self.logger = logger
 
-            def export_excel(self, records_payload, export_metadata_payload, template_path=None, output_path=None):
+            def export_excel(self, records_payload, export_metadata_payload, template_path=None, output_path=None, batch_id=None, workbook_writer=None):
                 return {
                     "success": False,
                     "data": None,
@@ -473,10 +575,10 @@ class DvppCertificateExportersTests(unittest.TestCase):
 
     def test_server_esf_export_endpoint_returns_processor_payload(self) -> None:
         class FakeProcessor:
-            def __init__(self, logger, importer=None) -> None:
+            def __init__(self, logger, importer=None, batch_store=None) -> None:
                 self.logger = logger
 
-            def export_esf(self, records_payload, export_metadata_payload=None, output_path=None):
+            def export_esf(self, records_payload, export_metadata_payload=None, output_path=None, batch_id=None):
                 return {
                     "success": True,
                     "data": {
@@ -504,10 +606,10 @@ class DvppCertificateExportersTests(unittest.TestCase):
 
     def test_server_esf_export_endpoint_prefers_specific_processor_error(self) -> None:
         class FakeProcessor:
-            def __init__(self, logger, importer=None) -> None:
+            def __init__(self, logger, importer=None, batch_store=None) -> None:
                 self.logger = logger
 
-            def export_esf(self, records_payload, export_metadata_payload=None, output_path=None):
+            def export_esf(self, records_payload, export_metadata_payload=None, output_path=None, batch_id=None):
                 return {
                     "success": False,
                     "data": None,
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "src" / "python"))
+
+from dvpp_cert_extraction import ExtractionResult, extract_many
+from dvpp_certificates.domain import CertificateRecord
+from dvpp_certificates.extraction_cache import CertificateExtractionCache, prompt_fingerprint
+from dvpp_certificates.importers import GeminiCertificateImporter
+from tools.dvpp_certificate_processor import DvppCertificateProcessor
+
+
+def build_certificate(surname: str) -> CertificateRecord:
+    return CertificateRecord(
+        surname=surname,
+        name="Jana",
+        birth_date="05.09.1980",
+        course_name="Kurz AI ve vyuce",
+        completion_date="14.03.2024",
+        hours="8",
+        topic="umela inteligence",
+    )
+
+
+class CountingAgent:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    async def run(self, payload):
+        self.calls.append(payload[1])
+        return SimpleNamespace(output=ExtractionResult(certificates=[build_certificate(f"Surname {payload[1]}")]))
+
+
+class DvppCertificateExtractionCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.root = Path(self.temp_dir.name)
+        self.input_dir = self.root / "input"
+        self.input_dir.mkdir()
+        self.cache = CertificateExtractionCache(self.root / "cache")
+        self.agent = CountingAgent()
+
+    def write_input(self, name: str, content: bytes = b"%PDF-1.4") -> Path:
+        path = self.input_dir / name
+        path.write_bytes(content)
+        return path
+
+    def run_extraction(self, paths, *, model_name: str = "gemini-3-flash-preview", **kwargs):
+        return extract_many(
+            paths,
+            model_name,
+            api_key="test-key",
+            agent_factory=lambda **_kwargs: self.agent,
+            binary_content_factory=lambda path: path.stem,
+            cache=self.cache,
+            **kwargs,
+        )
+
+    def test_repeat_extraction_is_served_from_cache(self) -> None:
+        paths = [self.write_input("a.pdf", b"%PDF-a"), self.write_input("b.pdf", b"%PDF-b")]
+
+        first = self.run_extraction(paths)
+        second = self.run_extraction(paths)
+
+        self.assertEqual(["a", "b"], sorted(self.agent.calls))
+        self.assertEqual([False, False], [outcome.cache_hit for outcome in first])
+        self.assertEqual([True, True], [outcome.cache_hit for outcome in second])
+        self.assertEqual(
+            ["Surname a", "Surname b"],
+            [outcome.result.certificates[0].surname for outcome in second],
+        )
+
+    def test_cache_key_follows_file_bytes_and_model(self) -> None:
+        path = self.write_input("a.pdf", b"%PDF-a")
+        key = self.cache.key_for(path, "gemini-3-flash-preview")
+
+        self.assertNotEqual(key, self.cache.key_for(path, "gemini-3.1-pro-preview"))
+        renamed = path.rename(self.input_dir / "renamed.pdf")
+        self.assertEqual(key, self.cache.key_for(renamed, "gemini-3-flash-preview"))
+
+        prompt_fingerprint.cache_clear()
+        self.addCleanup(prompt_fingerprint.cache_clear)
+        with patch("dvpp_certificates.extraction_cache.build_extraction_prompt", return_value="jiny prompt"):
+            self.assertNotEqual(key, self.cache.key_for(renamed, "gemini-3-flash-preview"))
+
+        renamed.write_bytes(b"%PDF-changed")
+        self.assertNotEqual(key, self.cache.key_for(renamed, "gemini-3-flash-preview"))
+
+    def test_bypass_cache_re_extracts_and_refreshes_entry(self) -> None:
+        path = self.write_input("a.pdf")
+        self.run_extraction([path])
+
+        outcomes = self.run_extraction([path], bypass_cache=True)
+
+        self.assertEqual(["a", "a"], self.agent.calls)
+        self.assertFalse(outcomes[0].cache_hit)
+        self.assertTrue(self.run_extraction([path])[0].cache_hit)
+
+    def test_corrupt_entry_is_treated_as_miss(self) -> None:
+        path = self.write_input("a.pdf")
+        key = self.cache.key_for(path, "gemini-3-flash-preview")
+        self.cache.cache_dir.mkdir(parents=True)
+        (self.cache.cache_dir / f"{key}.json").write_text("{not json", encoding="utf-8")
+
+        outcomes = self.run_extraction([path])
+
+        self.assertFalse(outcomes[0].cache_hit)
+        self.assertEqual(["a"], self.agent.calls)
+        self.assertIsNotNone(self.cache.get(key))
+
+    def test_put_evicts_least_recently_used_entries_over_size_cap(self) -> None:
+        result = ExtractionResult(certificates=[build_certificate("Novakova")])
+        self.cache.put("first", result)
+        entry_size = (self.cache.cache_dir / "first.json").stat().st_size
+        self.cache.max_bytes = entry_size * 2
+        self.cache.put("second", result)
+        os.utime(self.cache.cache_dir / "first.json", (1, 1))
+        os.utime(self.cache.cache_dir / "second.json", (2, 2))
+
+        self.cache.put("third", result)
+
+        self.assertIsNone(self.cache.get("first"))
+        self.assertIsNotNone(self.cache.get("second"))
+        self.assertIsNotNone(self.cache.get("third"))
+
+    def test_processor_reports_cache_hits_in_diagnostics(self) -> None:
+        self.write_input("a.pdf", b"%PDF-a")
+        self.write_input("b.pdf", b"%PDF-b")
+
+        def batch_extractor(paths, model_name, **kwargs):
+            return extract_many(
+                paths,
+                model_name,
+                agent_factory=lambda **_kwargs: self.agent,
+                binary_content_factory=lambda path: path.stem,
+                **kwargs,
+            )
+
+        importer = GeminiCertificateImporter(batch_extractor=batch_extractor, cache=self.cache)
+        options = {
+            "folder_path": str(self.input_dir),
+            "model_name": "gemini-3-flash-preview",
+            "api_key": "test-key",
+        }
+        DvppCertificateProcessor(importer=importer).process([str(self.input_dir / "a.pdf")], options)
+
+        result = DvppCertificateProcessor(importer=importer).process([], options)
+
+        self.assertTrue(result["success"])
+        self.assertEqual(1, result["data"]["cachedFiles"])
+        self.assertEqual([True, False], [item["cache_hit"] for item in result["data"]["diagnostics"]])
+        self.assertEqual(["a", "b"], self.agent.calls)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -99,6 +99,62 @@ class DvppCertificateProcessorTests(unittest.TestCase):
             self.assertEqual(str(project_dir), result["data"]["batch"]["source_folder"])
             self.assertEqual(str(first.resolve()), result["data"]["batch"]["records"][0]["extracted_record"]["origin"]["source_file"])
 
+    def test_process_extracts_files_concurrently_through_gemini_importer(self) -> None:
+        from types import SimpleNamespace
+
+        from dvpp_cert_extraction import extract_many
+        from dvpp_certificates.importers import GeminiCertificateImporter
+
+        class FakeAgent:
+            async def run(self, payload):
+                if payload[1] == "bad":
+                    raise TimeoutError("Gemini request timed out")
+                return SimpleNamespace(
+                    output=ExtractionResult(certificates=[build_certificate(surname=f"Surname {payload[1]}", name="Jana")])
+                )
+
+        def batch_extractor(paths, model_name, **kwargs):
+            return extract_many(
+                paths,
+                model_name,
+                agent_factory=lambda **_kwargs: FakeAgent(),
+                binary_content_factory=lambda path: path.stem,
+                retry_backoff=0,
+                **kwargs,
+            )
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_dir = Path(temp_dir)
+            for stem in ("a", "bad", "c"):
+                (project_dir / f"{stem}.pdf").write_bytes(b"%PDF-1.4")
+
+            processor = DvppCertificateProcessor(importer=GeminiCertificateImporter(batch_extractor=batch_extractor))
+            result = processor.process(
+                [],
+                {
+                    "folder_path": str(project_dir),
+                    "model_name": "gemini-3-flash-preview",
+                    "api_key": "test-key",
+                    "max_concurrency": 3,
+                },
+            )
+
+        self.assertTrue(result["success"])
+        self.assertEqual(2, result["data"]["successfulFiles"])
+        self.assertEqual(1, result["data"]["failedFiles"])
+        self.assertEqual(
+            ["Surname a", "Surname c"],
+            [record["extracted_record"]["surname"] for record in result["data"]["batch"]["records"]],
+        )
+        self.assertEqual(["Gemini request timed out"], result["data"]["diagnostics"][1]["errors"])
+        self.assertEqual(2, result["data"]["diagnostics"][1]["retries"])
+        self.assertEqual("pdf", result["data"]["diagnostics"][0]["file_type"])
+        self.assertGreater(result["data"]["diagnostics"][0]["request_bytes"], 0)
+        metrics = result["data"]["metrics"]
+        self.assertEqual(["max", "p50", "p90", "p99"], sorted(metrics["wallTimeMs"]))
+        self.assertEqual(["pdf"], list(metrics["wallTimeMsByFileType"]))
+        self.assertEqual(2, metrics["retries"])
+
     def test_process_collects_per_file_errors_and_keeps_successful_rows(self) -> None:
         with tempfile.TemporaryDirectory() as temp_dir:
             project_dir = Path(temp_dir)
@@ -151,6 +207,102 @@ class DvppCertificateProcessorTests(unittest.TestCase):
             self.assertEqual(0, len(result["data"]["batch"]["records"]))
             self.assertIn("Nepodařilo se vytěžit žádné certifikáty", result["errors"])
 
+    def test_process_rejects_invalid_rate_and_concurrency_options(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_dir = Path(temp_dir)
+            (project_dir / "a.pdf").write_bytes(b"%PDF-1.4")
+
+            for option, value in (
+                ("requests_per_minute", 0),
+                ("requests_per_minute", -5),
+                ("requests_per_minute", "fast"),
+                ("requests_per_minute", "nan"),
+                ("max_concurrency", "2.5"),
+                ("max_concurrency", 0),
+                ("batch_size", "abc"),
+                ("batch_size", 0),
+                ("batch_size", -2),
+                ("max_retries", -1),
+                ("max_retries", "twice"),
+            ):
+                importer = RecordingImporter()
+                result = DvppCertificateProcessor(importer=importer).process(
+                    [],
+                    {
+                        "folder_path": str(project_dir),
+                        "model_name": "gemini-3-flash-preview",
+                        "api_key": "test-key",
+                        option: value,
+                    },
+                )
+
+                self.assertFalse(result["success"], (option, value))
+                self.assertEqual(1, len(result["errors"]))
+                self.assertEqual([], importer.calls)
+
+    def test_process_passes_validated_batch_and_retry_options_to_importer(self) -> None:
+        class BatchImporter:
+            def __init__(self) -> None:
+                self.kwargs = {}
+
+            def import_files(self, file_paths, **kwargs):
+                self.kwargs = kwargs
+                return []
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_dir = Path(temp_dir)
+            (project_dir / "a.pdf").write_bytes(b"%PDF-1.4")
+
+            importer = BatchImporter()
+            DvppCertificateProcessor(importer=importer).process(
+                [],
+                {
+                    "folder_path": str(project_dir),
+                    "model_name": "gemini-3-flash-preview",
+                    "api_key": "test-key",
+                    "batch_size": "4",
+                    "max_retries": 0,
+                },
+            )
+
+        self.assertEqual(4, importer.kwargs["batch_size"])
+        self.assertEqual(0, importer.kwargs["max_retries"])
+
+    def test_server_import_endpoint_rejects_invalid_batch_size(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_dir = Path(temp_dir)
+            (project_dir / "a.pdf").write_bytes(b"%PDF-1.4")
+
+            response = server.app.test_client().post(
+                "/api/dvpp-certificates/import/gemini",
+                json={
+                    "folderPath": str(project_dir),
+                    "modelName": "gemini-3-flash-preview",
+                    "apiKey": "test-key",
+                    "batchSize": "abc",
+                },
+            )
+
+        self.assertEqual(400, response.status_code)
+        self.assertIn("Počet souborů v jednom požadavku", response.get_json()["message"])
+
+    def test_server_import_endpoint_closes_processor_sessions(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_dir = Path(temp_dir)
+            (project_dir / "a.pdf").write_bytes(b"%PDF-1.4")
+
+            with patch.object(DvppCertificateProcessor, "close") as close:
+                server.app.test_client().post(
+                    "/api/dvpp-certificates/import/gemini",
+                    json={
+                        "folderPath": str(project_dir),
+                        "modelName": "gemini-3-flash-preview",
+                        "requestsPerMinute": -1,
+                    },
+                )
+
+        close.assert_called_once_with()
+
     def test_export_esf_writes_csv_file(self) -> None:
         processor = DvppCertificateProcessor(importer=RecordingImporter())
 
@@ -186,9 +338,12 @@ class DvppCertificateProcessorTests(unittest.TestCase):
 
     def test_server_endpoint_returns_processor_payload(self) -> None:
         class FakeProcessor:
-            def __init__(self, logger, importer=None) -> None:
+            def __init__(self, logger, importer=None, batch_store=None) -> None:
                 self.logger = logger
 
+            def close(self) -> None:
+                pass
+
             def process(self, files, options):
                 return {
                     "success": True,
@@ -236,9 +391,12 @@ class DvppCertificateProcessorTests(unittest.TestCase):
 
     def test_server_scan_endpoint_returns_matches(self) -> None:
         class FakeProcessor:
-            def __init__(self, logger, importer=None) -> None:
+            def __init__(self, logger, importer=None, batch_store=None) -> None:
                 self.logger = logger
 
+            def close(self) -> None:
+                pass
+
             def scan_folder(self, folder_path):
                 return [
                     {
@@ -263,9 +421,12 @@ class DvppCertificateProcessorTests(unittest.TestCase):
 
     def test_server_endpoint_surfaces_first_processing_error_message(self) -> None:
         class FakeProcessor:
-            def __init__(self, logger, importer=None) -> None:
+            def __init__(self, logger, importer=None, batch_store=None) -> None:
                 self.logger = logger
 
+            def close(self) -> None:
+                pass
+
             def process(self, files, options):
                 return {
                     "success": False,
@@ -299,9 +460,12 @@ class DvppCertificateProcessorTests(unittest.TestCase):
 
     def test_server_endpoint_prefers_first_batch_error_when_processor_only_has_generic_error(self) -> None:
         class FakeProcessor:
-            def __init__(self, logger, importer=None) -> None:
+            def __init__(self, logger, importer=None, batch_store=None) -> None:
                 self.logger = logger
 
+            def close(self) -> None:
+                pass
+
             def process(self, files, options):
                 return {
                     "success": False,
@@ -373,9 +537,12 @@ class DvppCertificateProcessorTests(unittest.TestCase):
 
     def test_server_raw_text_endpoint_returns_processor_payload(self) -> None:
         class FakeProcessor:
-            def __init__(self, logger, importer=None) -> None:
+            def __init__(self, logger, importer=None, batch_store=None) -> None:
                 self.logger = logger
 
+            def close(self) -> None:
+                pass
+
             def import_raw_text(self, raw_text):
                 return {
                     "success": True,
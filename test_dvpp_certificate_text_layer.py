@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "src" / "python"))
+
+from dvpp_cert_extraction import extract_many
+from dvpp_certificates.importers import GeminiCertificateImporter
+from dvpp_certificates.text_layer import (
+    TEXT_LAYER_NOTE,
+    TEXT_LAYER_PARSERS,
+    extract_text_layer_certificates,
+    fold_diacritics,
+    parse_labelled_certificate,
+    parse_text_layer_pages,
+)
+from tools.dvpp_certificate_processor import DvppCertificateProcessor
+
+
+LABELLED_PAGE = """OSVĚDČENÍ
+Jméno a příjmení: Mgr. Jana Nováková
+Datum narození: 5. 9. 1980
+Název vzdělávacího programu: Kurz AI ve výuce
+Datum konání: 12. 3. – 14. 3. 2024
+v rozsahu 8 hodin
+Téma: umělá inteligence
+"""
+
+
+def write_text_pdf(path: Path, pages: list[list[str]]) -> None:
+    pdf = canvas.Canvas(str(path), pagesize=A4)
+    for lines in pages:
+        y = 780
+        for line in lines:
+            pdf.drawString(72, y, line)
+            y -= 20
+        pdf.showPage()
+    pdf.save()
+
+
+def ascii_certificate_lines(full_name: str) -> list[str]:
+    return [
+        "OSVEDCENI",
+        f"Jmeno a prijmeni: {full_name}",
+        "Datum narozeni: 05.09.1980",
+        "Nazev kurzu: Kurz AI ve vyuce",
+        "Datum konani: 14.03.2024",
+        "Pocet hodin: 8",
+    ]
+
+
+class DvppCertificateTextLayerTests(unittest.TestCase):
+    def test_fold_diacritics_keeps_character_offsets(self) -> None:
+        self.assertEqual("Jmeno a prijmeni", fold_diacritics("Jméno a příjmení"))
+        self.assertEqual(len(LABELLED_PAGE), len(fold_diacritics(LABELLED_PAGE)))
+
+    def test_labelled_parser_reads_fields_from_czech_certificate_text(self) -> None:
+        fields = parse_labelled_certificate(LABELLED_PAGE)
+
+        self.assertEqual(
+            {
+                "surname": "Nováková",
+                "name": "Jana",
+                "birth_date": "05.09.1980",
+                "course_name": "Kurz AI ve výuce",
+                "completion_date": "14.03.2024",
+                "hours": "8",
+                "topic": "umělá inteligence",
+                "uncertainty_notes": TEXT_LAYER_NOTE,
+            },
+            fields,
+        )
+        certificates = parse_text_layer_pages([LABELLED_PAGE], [parse_labelled_certificate])
+        self.assertEqual(
+            "mediální gramotnost, prevence kyberšikany, chování na sociálních sítích, umělá inteligence",
+            certificates[0].topic,
+        )
+
+    def test_labelled_parser_keeps_decimal_hours(self) -> None:
+        fields = parse_labelled_certificate(LABELLED_PAGE.replace("v rozsahu 8 hodin", "v rozsahu 7,5 hodin"))
+
+        self.assertEqual("7,5", fields["hours"])
+
+    def test_labelled_parser_takes_capitalised_word_as_surname(self) -> None:
+        fields = parse_labelled_certificate(
+            LABELLED_PAGE.replace("Mgr. Jana Nováková", "NOVÁKOVÁ Jana")
+        )
+
+        self.assertEqual(("NOVÁKOVÁ", "Jana"), (fields["surname"], fields["name"]))
+
+    def test_labelled_parser_rejects_ambiguous_name_order(self) -> None:
+        for line in (
+            "Jméno a příjmení: Jana Marie Nováková",
+            "Účastník: Jana Nováková",
+            "Jméno a příjmení: NOVÁKOVÁ Jana DVOŘÁKOVÁ",
+        ):
+            with self.subTest(line=line):
+                page = LABELLED_PAGE.replace("Jméno a příjmení: Mgr. Jana Nováková", line)
+                self.assertIsNone(parse_labelled_certificate(page))
+
+    def test_generic_parser_is_not_registered_by_default(self) -> None:
+        self.assertNotIn(parse_labelled_certificate, TEXT_LAYER_PARSERS)
+        self.assertIsNone(parse_text_layer_pages([LABELLED_PAGE]))
+
+    def test_unparsed_page_sends_whole_document_to_fallback(self) -> None:
+        parsers = [parse_labelled_certificate]
+        self.assertIsNone(parse_text_layer_pages([LABELLED_PAGE, "Naskenovany obrazek bez textu"], parsers))
+        self.assertIsNone(parse_text_layer_pages(["", "  "], parsers))
+        self.assertEqual(1, len(parse_text_layer_pages([LABELLED_PAGE, ""], parsers)))
+
+    def test_custom_provider_parser_is_tried_before_fallback(self) -> None:
+        def provider_parser(page_text: str):
+            if not page_text.startswith("NIDV"):
+                return None
+            surname, name, birth_date, completion_date = page_text.split("|")[1:5]
+            return {
+                "surname": surname,
+                "name": name,
+                "birth_date": birth_date,
+                "course_name": "Kurz NIDV",
+                "completion_date": completion_date,
+                "hours": "16",
+            }
+
+        certificates = parse_text_layer_pages(
+            ["NIDV|Svobodova|Marie|24.07.2000|2025-03-24"],
+            [parse_labelled_certificate, provider_parser],
+        )
+
+        self.assertEqual("Svobodova", certificates[0].surname)
+        self.assertEqual("24.03.2025", certificates[0].completion_date)
+
+    def test_extracts_one_certificate_per_pdf_page(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            pdf_path = Path(temp_dir) / "certifikaty.pdf"
+            write_text_pdf(
+                pdf_path,
+                [ascii_certificate_lines("Jana Novakova"), ascii_certificate_lines("Mgr. Petr Dvorak, Ph.D.")],
+            )
+
+            certificates = extract_text_layer_certificates(pdf_path, [parse_labelled_certificate])
+
+        self.assertEqual(
+            [("Novakova", "Jana"), ("Dvorak", "Petr")],
+            [(certificate.surname, certificate.name) for certificate in certificates],
+        )
+        self.assertEqual("14.03.2024", certificates[1].completion_date)
+
+    def test_only_unparsed_files_are_sent_to_gemini(self) -> None:
+        sent_files = []
+
+        class FakeAgent:
+            async def run(self, payload):
+                sent_files.append(payload[1])
+                return SimpleNamespace(output={"certificates": []})
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_dir = Path(temp_dir)
+            write_text_pdf(project_dir / "digital.pdf", [ascii_certificate_lines("Jana Novakova")])
+            (project_dir / "scan.pdf").write_bytes(b"%PDF-1.4")
+
+            def batch_extractor(paths, model_name, **kwargs):
+                return extract_many(
+                    paths,
+                    model_name,
+                    agent_factory=lambda **_kwargs: FakeAgent(),
+                    binary_content_factory=lambda path: path.stem,
+                    text_layer_parsers=[parse_labelled_certificate],
+                    **kwargs,
+                )
+
+            processor = DvppCertificateProcessor(importer=GeminiCertificateImporter(batch_extractor=batch_extractor))
+            result = processor.process(
+                [],
+                {
+                    "folder_path": str(project_dir),
+                    "model_name": "gemini-3-flash-preview",
+                    "api_key": "test-key",
+                },
+            )
+
+        self.assertEqual(["scan"], sent_files)
+        self.assertEqual(1, result["data"]["textLayerFiles"])
+        self.assertEqual([True, False], [item["text_layer"] for item in result["data"]["diagnostics"]])
+        record = result["data"]["batch"]["records"][0]["extracted_record"]
+        self.assertEqual("Novakova", record["surname"])
+        self.assertEqual("text_layer", record["origin"]["source_mode"])
+
+
+if __name__ == "__main__":
+    unittest.main()
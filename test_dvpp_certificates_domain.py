@@ -1,7 +1,10 @@
 #!/usr/bin/env python3
 
+import json
 import sys
+import tempfile
 import unittest
+from dataclasses import asdict
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent / "src" / "python"))
@@ -11,8 +14,10 @@ from dvpp_certificates.domain import (
     ExportMetadata,
     ExtractionBatch,
     RecordOrigin,
+    RecordTable,
     WorkingRecord,
 )
+from dvpp_certificates.exporters import export_records_to_tsv
 
 
 class DvppCertificatesDomainTests(unittest.TestCase):
@@ -237,5 +242,75 @@ class DvppCertificatesDomainTests(unittest.TestCase):
         self.assertTrue(batch.export_metadata.fill_header)
 
 
+    def build_table(self, count: int) -> RecordTable:
+        return RecordTable(
+            CertificateRecord(
+                surname=f"Novakova {index}",
+                name="Jana",
+                birth_date="05.09.1980",
+                course_name="Kurz AI ve vyuce",
+                completion_date="14.03.2024",
+                hours="8",
+                origin=RecordOrigin(source_mode="raw_text", source_index=index),
+            )
+            for index in range(count)
+        )
+
+    def test_record_table_copies_working_column_only_on_first_edit(self) -> None:
+        table = self.build_table(3)
+
+        self.assertIs(table._working["hours"], table._extracted["hours"])
+        self.assertEqual("16", table.set_value(1, "hours", " 16 "))
+
+        self.assertIsNot(table._working["hours"], table._extracted["hours"])
+        self.assertIs(table._working["surname"], table._extracted["surname"])
+        self.assertEqual("8", table.value(1, "hours", working=False))
+        self.assertEqual(["hours"], table.edited_fields(1))
+        self.assertEqual([], table.edited_fields(0))
+        self.assertEqual("16", table[1].working_record.hours)
+        self.assertEqual("8", table[1].extracted_record.hours)
+
+    def test_record_table_set_value_validates_like_certificate_record(self) -> None:
+        table = self.build_table(1)
+
+        with self.assertRaises(ValueError):
+            table.set_value(0, "completion_date", "31.02.2024")
+        with self.assertRaises(ValueError):
+            table.set_value(0, "surname", "  ")
+        self.assertEqual("", table.set_value(0, "forma", "supervize"))
+
+    def test_record_table_payload_matches_dataclass_serialization(self) -> None:
+        table = self.build_table(2)
+        table.set_value(0, "course_name", "Kurz AI ve vyuce - upraveno")
+        expected = [
+            {"extracted_record": asdict(record.extracted_record), "working_record": asdict(record.working_record)}
+            for record in table
+        ]
+
+        payload = table.to_payload()
+
+        self.assertEqual(expected, payload)
+        self.assertEqual(payload, json.loads(table.to_json()))
+        self.assertEqual(payload, RecordTable.from_payload(payload).to_payload())
+
+    def test_record_table_from_payload_rejects_unknown_fields(self) -> None:
+        payload = self.build_table(1).to_payload()
+        payload[0]["working_record"]["unexpected"] = "x"
+
+        with self.assertRaises(TypeError):
+            RecordTable.from_payload(payload)
+
+    def test_large_batch_exports_without_materializing_records(self) -> None:
+        table = self.build_table(5000)
+        table.set_value(4999, "hours", "12")
+        batch = ExtractionBatch(input_mode="raw_text", records=table)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            result = export_records_to_tsv(batch.records, output_path=str(Path(temp_dir) / "records.tsv"))
+
+        lines = result["content"].splitlines()
+        self.assertEqual(5000, len(lines))
+        self.assertEqual("Novakova 4999\tJana\t05.09.1980\t\tKurz AI ve vyuce\t14.03.2024\t12\t\t", lines[-1])
+
 if __name__ == "__main__":
     unittest.main()
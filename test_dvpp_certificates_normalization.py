@@ -10,9 +10,11 @@ from dvpp_certificates.domain import CertificateRecord, RecordOrigin
 from dvpp_certificates.normalization import (
     FORMA_CATALOG,
     TOPIC_CATALOG,
+    clear_normalization_caches,
     normalize_certificate_fields,
     normalize_date,
     normalize_forma,
+    normalize_many,
     normalize_topic,
     strip_titles,
 )
@@ -67,6 +69,9 @@ class DvppCertificatesNormalizationTests(unittest.TestCase):
     def test_strip_titles_removes_academic_prefixes_and_suffixes(self) -> None:
         self.assertEqual("Jana", strip_titles("Mgr. Jana, Ph.D."))
         self.assertEqual("Novakova", strip_titles("Bc. Novakova, DiS."))
+        self.assertEqual("Petr Dvorak", strip_titles("Ing. Mgr. Petr Dvorak, Ph.D., DiS."))
+        self.assertEqual("Jana", strip_titles("Mgr.Jana"))
+        self.assertEqual("", strip_titles("Mgr. Ph.D."))
 
     def test_normalize_date_preserves_uncertainty_marker(self) -> None:
         self.assertEqual("07.03.2024", normalize_date("2024-03-07"))
@@ -167,5 +172,56 @@ class DvppCertificatesNormalizationTests(unittest.TestCase):
         self.assertIn("name", str(exc_info.exception))
 
 
+    def test_normalize_many_matches_single_record_normalization(self) -> None:
+        raw_records = [
+            {
+                "surname": "Mgr. Novakova",
+                "name": "Jana",
+                "birth_date": "1980-09-05",
+                "course_name": "Kurz AI ve vyuce",
+                "completion_date": "14/03/2024",
+                "hours": "8",
+                "topic": "umela inteligence",
+            },
+            {
+                "surname": "Dvorak, Ph.D.",
+                "name": "Petr",
+                "birth_date": "24.7.1975",
+                "course_name": "Kurz AI ve vyuce",
+                "completion_date": "14/03/2024",
+                "hours": "8",
+                "forma": "stáž",
+            },
+        ]
+        origins = [RecordOrigin(source_mode="raw_text", source_index=index) for index in (1, 2)]
+
+        records = normalize_many(raw_records, origins)
+
+        self.assertEqual(
+            [normalize_certificate_fields(raw, origin=origin) for raw, origin in zip(raw_records, origins)],
+            records,
+        )
+        self.assertEqual(["Novakova", "Dvorak"], [record.surname for record in records])
+        self.assertEqual([None], [record.origin for record in normalize_many(raw_records[:1])])
+
+    def test_repeated_values_are_served_from_normalization_caches(self) -> None:
+        clear_normalization_caches()
+        self.addCleanup(clear_normalization_caches)
+        raw_record = {
+            "surname": "Novakova",
+            "name": "Jana",
+            "birth_date": "05.09.1980",
+            "course_name": "Kurz AI ve vyuce",
+            "completion_date": "2024-03-14",
+            "hours": "8",
+            "topic": "umela inteligence",
+        }
+
+        normalize_many([raw_record] * 50)
+
+        self.assertEqual(1, normalize_topic.cache_info().misses)
+        self.assertEqual(49, normalize_topic.cache_info().hits)
+        self.assertEqual(2, normalize_date.cache_info().misses)
+
 if __name__ == "__main__":
     unittest.main()
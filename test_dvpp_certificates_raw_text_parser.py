@@ -1,13 +1,25 @@
 #!/usr/bin/env python3
 
 import sys
+import tempfile
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent / "src" / "python"))
 
 from dvpp_certificates.domain import ExtractionBatch, WorkingRecord
-from dvpp_certificates.raw_text_parser import parse_raw_text_batch
+from dvpp_certificates.raw_text_parser import (
+    RawTextParseError,
+    iter_raw_text_records,
+    parse_raw_text_batch,
+    parse_raw_text_stream,
+)
+from tools.dvpp_certificate_processor import DvppCertificateProcessor
+
+
+def build_raw_row(index: int) -> str:
+    return f"Novakova {index}\tJana\t05.09.1980\t\tKurz AI ve vyuce\t14.03.2024\t8\t\tumela inteligence"
 
 
 class DvppCertificatesRawTextParserTests(unittest.TestCase):
@@ -100,5 +112,83 @@ class DvppCertificatesRawTextParserTests(unittest.TestCase):
         self.assertEqual("stáž", batch.records[0].working_record.forma)
 
 
+    def test_parse_raw_text_batch_reports_every_malformed_line_in_one_pass(self) -> None:
+        text = "\n".join(
+            [
+                build_raw_row(1),
+                "Novakova\tJana\t05.09.1980",
+                "",
+                "Novakova\tJana\t31.02.1980\t\tKurz\t14.03.2024\t8\t\t",
+                build_raw_row(2),
+                "\tJana\t05.09.1980\t\tKurz\t14.03.2024\t8\t\t",
+            ]
+        )
+
+        with self.assertRaises(RawTextParseError) as exc_info:
+            parse_raw_text_batch(text)
+
+        line_errors = exc_info.exception.line_errors
+        self.assertEqual([2, 4, 6], [line_error.line_number for line_error in line_errors])
+        self.assertIn("column count", line_errors[0].message)
+        self.assertIn("birth_date", line_errors[1].message)
+        self.assertIn("surname", line_errors[2].message)
+        self.assertEqual("Novakova\tJana\t05.09.1980", line_errors[0].raw_row)
+        self.assertIn("line 6", str(exc_info.exception))
+
+    def test_iter_raw_text_records_yields_lazily_from_line_stream(self) -> None:
+        consumed: list[int] = []
+
+        def lines():
+            for index in range(1, 4):
+                consumed.append(index)
+                yield build_raw_row(index) + "\n"
+
+        records = iter_raw_text_records(lines(), chunk_size=1)
+
+        self.assertEqual("Novakova 1", next(records).surname)
+        self.assertEqual([1], consumed)
+        self.assertEqual(["Novakova 2", "Novakova 3"], [record.surname for record in records])
+
+    def test_parse_raw_text_stream_reads_file_path(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "certifikaty.tsv"
+            path.write_text("\r\n".join(build_raw_row(index) for index in range(1, 2501)), encoding="utf-8-sig")
+
+            batch = parse_raw_text_stream(path, chunk_size=100)
+
+        self.assertEqual(2500, len(batch.records))
+        self.assertEqual("Novakova 1", batch.records[0].working_record.surname)
+        self.assertEqual(build_raw_row(2500), batch.records[2499].extracted_record.origin.raw_row)
+
+    def test_parse_raw_text_stream_keeps_row_order_with_worker_pool(self) -> None:
+        text = "\n".join(build_raw_row(index) for index in range(1, 1001))
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            batch = parse_raw_text_stream(text, executor=executor, chunk_size=7)
+
+        self.assertEqual(
+            [f"Novakova {index}" for index in range(1, 1001)],
+            [record.working_record.surname for record in batch.records],
+        )
+        self.assertEqual(
+            list(range(1, 1001)),
+            [record.extracted_record.origin.source_index for record in batch.records],
+        )
+
+    def test_processor_lists_all_raw_text_line_errors(self) -> None:
+        result = DvppCertificateProcessor().import_raw_text(
+            "\n".join([build_raw_row(1), "chybny radek", "dalsi chybny radek"])
+        )
+
+        self.assertFalse(result["success"])
+        self.assertEqual(2, result["data"]["invalidRows"])
+        self.assertEqual(
+            [
+                "Malformed raw text row at line 2: wrong column count, expected 6, 8 or 9 tab-separated columns",
+                "Malformed raw text row at line 3: wrong column count, expected 6, 8 or 9 tab-separated columns",
+            ],
+            result["errors"],
+        )
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
 
+import json
+import os
 import sys
 import tempfile
 import unittest
@@ -10,7 +12,7 @@ from openpyxl import Workbook
 
 sys.path.insert(0, str(Path(__file__).resolve().parent / "src" / "python"))
 
-from tools.dvpp_report_processor import DvppReportProcessor
+from tools.dvpp_report_processor import DvppReportProcessor, DvppScanCache
 
 
 def build_dvpp_workbook(path: Path, *, report_number: int, rows: list[tuple[str, str, float]]) -> None:
@@ -140,6 +142,186 @@ class DvppReportProcessorTests(unittest.TestCase):
             self.assertIn("Eva Svobodová", html)
             self.assertIn("Souhrn podpory DVPP podle pedagogů", html)
 
+    def test_process_reads_each_workbook_once(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_dir = Path(temp_dir) / "Project_12968"
+            first_path = project_dir / "1ZoR" / "first.xlsx"
+            second_path = project_dir / "2ZoR" / "second.xlsx"
+            build_dvpp_workbook(first_path, report_number=1, rows=[("Novák", "Jan", 8)])
+            build_dvpp_workbook(second_path, report_number=2, rows=[("Novák", "Jan", 12), ("Svobodová", "Eva", 4)])
+
+            from tools import dvpp_report_processor as module
+
+            processor = DvppReportProcessor()
+            with patch.object(module, "load_workbook", wraps=module.load_workbook) as load_mock, patch.object(
+                module.pd, "read_excel", side_effect=AssertionError("workbook read twice")
+            ):
+                result = processor.process([str(first_path), str(second_path)], {"project_dir": str(project_dir)})
+
+            self.assertTrue(result["success"])
+            self.assertEqual(2, load_mock.call_count)
+            self.assertEqual(2, result["data"]["unique_participants"])
+
+            html = Path(result["data"]["report_path"]).read_text(encoding="utf-8")
+            self.assertIn("Jan Novák", html)
+            self.assertIn("20", html)
+
+    def test_extract_workbook_returns_metadata_and_columns(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_dir = Path(temp_dir) / "Project_12968"
+            workbook_path = project_dir / "1ZoR" / "first.xlsx"
+            build_dvpp_workbook(workbook_path, report_number=3, rows=[("Novák", "Jan", 8), ("Svobodová", "Eva", 16)])
+
+            extraction = DvppReportProcessor().extract_workbook(workbook_path, project_dir)
+
+            self.assertIsNotNone(extraction)
+            self.assertEqual(3, extraction.match.report_number)
+            self.assertEqual(2, extraction.match.participant_count)
+            self.assertEqual(["Jan", "Eva"], extraction.columns["first_name"])
+            self.assertEqual([8, 16], extraction.columns["support_hours"])
+            self.assertEqual(["Formativní hodnocení"] * 2, extraction.columns["theme"])
+
+    def test_extract_workbook_streams_rows_without_random_cell_access(self) -> None:
+        from openpyxl.worksheet._read_only import ReadOnlyWorksheet
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_dir = Path(temp_dir) / "Project_12968"
+            workbook_path = project_dir / "1ZoR" / "large.xlsx"
+            rows = [(f"Příjmení{index}", f"Jméno{index}", 2) for index in range(120)]
+            build_dvpp_workbook(workbook_path, report_number=4, rows=rows)
+
+            with patch.object(ReadOnlyWorksheet, "cell", side_effect=AssertionError("random cell access")):
+                match = DvppReportProcessor().inspect_workbook(workbook_path, project_dir)
+
+            self.assertEqual("CZ.TEST/00/00/00/00000", match.project_number)
+            self.assertEqual(4, match.report_number)
+            self.assertEqual(10, match.header_row)
+            self.assertEqual(120, match.participant_count)
+
+    def test_scan_project_directory_uses_cache_for_unchanged_workbooks(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_dir = Path(temp_dir) / "Project_12968"
+            build_dvpp_workbook(project_dir / "1ZoR" / "first.xlsx", report_number=1, rows=[("Novák", "Jan", 8)])
+            build_dvpp_candidate_workbook(project_dir / "1ZoR" / "candidate.xlsx")
+            (project_dir / "notes.xlsx").write_bytes(b"not a workbook")
+            cache_dir = Path(temp_dir) / "cache"
+
+            first_scan = DvppReportProcessor(scan_cache=DvppScanCache(cache_dir)).scan_project_directory(project_dir)
+            self.assertEqual(2, len(first_scan))
+
+            new_path = project_dir / "2ZoR" / "second.xlsx"
+            build_dvpp_workbook(new_path, report_number=2, rows=[("Novák", "Jan", 12)])
+
+            processor = DvppReportProcessor(scan_cache=DvppScanCache(cache_dir))
+            with patch.object(processor, "inspect_workbook", wraps=processor.inspect_workbook) as inspect_mock, patch.object(
+                processor, "has_required_sheet_names", wraps=processor.has_required_sheet_names
+            ) as sniff_mock:
+                second_scan = processor.scan_project_directory(project_dir)
+
+            self.assertEqual([new_path], [call.args[0] for call in inspect_mock.call_args_list])
+            self.assertEqual([new_path], [call.args[0] for call in sniff_mock.call_args_list])
+            self.assertEqual(first_scan + [second_scan[-1]], second_scan)
+            self.assertEqual(2, second_scan[-1]["report_number"])
+
+    def test_scan_cache_reinspects_modified_workbooks(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_dir = Path(temp_dir) / "Project_12968"
+            workbook_path = project_dir / "1ZoR" / "first.xlsx"
+            build_dvpp_workbook(workbook_path, report_number=1, rows=[("Novák", "Jan", 8)])
+            cache = DvppScanCache(Path(temp_dir) / "cache")
+
+            DvppReportProcessor(scan_cache=cache).scan_project_directory(project_dir)
+            build_dvpp_workbook(workbook_path, report_number=1, rows=[("Novák", "Jan", 8), ("Svobodová", "Eva", 4)])
+            stat = workbook_path.stat()
+            os.utime(workbook_path, (stat.st_atime, stat.st_mtime + 10))
+
+            matches = DvppReportProcessor(scan_cache=cache).scan_project_directory(project_dir)
+
+            self.assertEqual(2, matches[0]["participant_count"])
+
+    def test_scan_project_directory_parallel_matches_sequential(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_dir = Path(temp_dir) / "Project_12968"
+            for index in range(6):
+                build_dvpp_workbook(
+                    project_dir / f"{index}ZoR" / "report.xlsx",
+                    report_number=index,
+                    rows=[("Novák", "Jan", index)],
+                )
+
+            sequential = DvppReportProcessor(max_workers=1).scan_project_directory(project_dir)
+            parallel = DvppReportProcessor(max_workers=4).scan_project_directory(project_dir)
+
+            self.assertEqual(sequential, parallel)
+            self.assertEqual(list(range(6)), [match["report_number"] for match in parallel])
+
+    def test_process_with_lazy_tables_embeds_compact_json_payload(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_dir = Path(temp_dir) / "Project_12968"
+            workbook_path = project_dir / "1ZoR" / "first.xlsx"
+            rows = [(f"Příjmení{index}", f"Jméno{index}", index) for index in range(300)]
+            build_dvpp_workbook(workbook_path, report_number=1, rows=rows)
+
+            processor = DvppReportProcessor()
+            eager = processor.process([str(workbook_path)], {"project_dir": str(project_dir)})
+            eager_html = Path(eager["data"]["report_path"]).read_text(encoding="utf-8")
+            lazy = processor.process([str(workbook_path)], {"project_dir": str(project_dir), "lazy_tables": True})
+            lazy_html = Path(lazy["data"]["report_path"]).read_text(encoding="utf-8")
+
+            self.assertEqual(300, lazy["data"]["unique_participants"])
+            self.assertNotIn("<table", lazy_html)
+            self.assertLess(len(lazy_html), len(eager_html))
+
+            payload_start = lazy_html.index('type="application/json">') + len('type="application/json">')
+            payload = json.loads(lazy_html[payload_start:lazy_html.index("</script>", payload_start)])
+            self.assertEqual(["Celé Jméno", "Celkem hodin"], payload["persons"]["columns"])
+            self.assertEqual(["Jméno299 Příjmení299", 299], payload["persons"]["rows"][0])
+            self.assertEqual(["DVPP/1"], payload["themes"]["columns"])
+            self.assertEqual([["Formativní hodnocení"]], payload["themes"]["rows"])
+
+    def test_render_html_report_switches_to_lazy_tables_above_threshold(self) -> None:
+        from tools import dvpp_report_processor as module
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_dir = Path(temp_dir) / "Project_12968"
+            workbook_path = project_dir / "1ZoR" / "first.xlsx"
+            build_dvpp_workbook(workbook_path, report_number=1, rows=[("Novák", "Jan", 8), ("Svobodová", "Eva", 4)])
+
+            with patch.object(module, "LAZY_TABLES_THRESHOLD", 1):
+                result = DvppReportProcessor().process([str(workbook_path)], {"project_dir": str(project_dir)})
+
+            html = Path(result["data"]["report_path"]).read_text(encoding="utf-8")
+            self.assertIn('id="reportData"', html)
+            self.assertIn('"Jan Novák"', html)
+
+    def test_process_batch_generates_report_per_project(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            first_project = Path(temp_dir) / "Project_A"
+            second_project = Path(temp_dir) / "Project_B"
+            build_dvpp_workbook(first_project / "1ZoR" / "report.xlsx", report_number=1, rows=[("Novák", "Jan", 8)])
+            second_report = second_project / "1ZoR" / "report.xlsx"
+            build_dvpp_workbook(second_report, report_number=1, rows=[("Svobodová", "Eva", 4), ("Novák", "Jan", 2)])
+            missing_project = Path(temp_dir) / "Missing"
+
+            processor = DvppReportProcessor(scan_cache=DvppScanCache(Path(temp_dir) / "cache"))
+            results = processor.process_batch(
+                [
+                    str(first_project),
+                    {"project_dir": str(second_project), "files": [str(second_report)]},
+                    str(missing_project),
+                ],
+                max_workers=3,
+            )
+
+            self.assertEqual([0, 1, 2], [item["index"] for item in results])
+            self.assertEqual([True, True, False], [item["success"] for item in results])
+            self.assertEqual(1, results[0]["data"]["unique_participants"])
+            self.assertEqual(2, results[1]["data"]["unique_participants"])
+            self.assertTrue((first_project / "Project_A_dvpp_report.html").exists())
+            self.assertTrue((second_project / "Project_B_dvpp_report.html").exists())
+            self.assertIn("Projektový adresář neexistuje", results[2]["errors"][0])
+            self.assertEqual(str(missing_project), results[2]["project_dir"])
+
 
 if __name__ == "__main__":
     unittest.main()
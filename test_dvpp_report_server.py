@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from openpyxl import Workbook
+
+REPO_ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(REPO_ROOT / "src" / "python"))
+
+import server
+from tools.dvpp_report_processor import DvppScanCache
+
+
+def build_dvpp_workbook(path: Path, *, report_number: int, rows: list[tuple[str, str, float]]) -> None:
+    workbook = Workbook()
+    workbook.active.title = "postup vyplňování"
+    sheet = workbook.create_sheet("podpory")
+    sheet["H6"] = "Zpráva o realizaci č. "
+    sheet["I6"] = report_number
+    sheet["B10"] = "Příjmení"
+    sheet["C10"] = "Jméno"
+    sheet["G10"] = "Počet  hodin podpory"
+    for row_index, (last_name, first_name, hours) in enumerate(rows, start=11):
+        sheet.cell(row_index, 2).value = last_name
+        sheet.cell(row_index, 3).value = first_name
+        sheet.cell(row_index, 7).value = hours
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    workbook.save(path)
+
+
+class DvppReportBatchServerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client = server.app.test_client()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.root = Path(self.temp_dir.name)
+        cache_patch = patch.object(server, "DVPP_SCAN_CACHE", DvppScanCache(self.root / "cache"))
+        cache_patch.start()
+        self.addCleanup(cache_patch.stop)
+
+        self.first_project = self.root / "Project_A"
+        self.second_project = self.root / "Project_B"
+        build_dvpp_workbook(self.first_project / "1ZoR" / "report.xlsx", report_number=1, rows=[("Novák", "Jan", 8)])
+        build_dvpp_workbook(self.second_project / "1ZoR" / "report.xlsx", report_number=1, rows=[("Svobodová", "Eva", 4)])
+
+    def test_batch_endpoint_returns_results_for_all_projects(self) -> None:
+        response = self.client.post(
+            "/api/process/dvpp-report-batch",
+            json={"projects": [str(self.first_project), {"projectDir": str(self.second_project)}]},
+        )
+
+        self.assertEqual(200, response.status_code)
+        payload = response.get_json()
+        self.assertEqual("success", payload["status"])
+        self.assertEqual(2, payload["data"]["successful_projects"])
+        self.assertEqual(
+            ["Project_A_dvpp_report.html", "Project_B_dvpp_report.html"],
+            [item["data"]["report_filename"] for item in payload["data"]["results"]],
+        )
+
+    def test_batch_endpoint_streams_ndjson_results(self) -> None:
+        response = self.client.post(
+            "/api/process/dvpp-report-batch",
+            json={"projects": [str(self.first_project), str(self.second_project)], "stream": True},
+        )
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual("application/x-ndjson", response.mimetype)
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines() if line]
+        self.assertEqual({0, 1}, {item["index"] for item in lines})
+        self.assertTrue(all(item["success"] for item in lines))
+
+    def test_batch_endpoint_requires_projects(self) -> None:
+        response = self.client.post("/api/process/dvpp-report-batch", json={"projects": []})
+
+        self.assertEqual(400, response.status_code)
+        self.assertEqual("error", response.get_json()["status"])
+
+    def test_batch_endpoint_rejects_invalid_max_workers(self) -> None:
+        for max_workers in ("many", 0, -2, [4]):
+            response = self.client.post(
+                "/api/process/dvpp-report-batch",
+                json={"projects": [str(self.first_project)], "maxWorkers": max_workers},
+            )
+
+            self.assertEqual(400, response.status_code, max_workers)
+            self.assertEqual("error", response.get_json()["status"])
+
+    def test_batch_endpoint_clamps_large_max_workers(self) -> None:
+        with patch.object(server.DvppReportProcessor, "process_batch", return_value=[]) as process_batch:
+            self.client.post(
+                "/api/process/dvpp-report-batch",
+                json={"projects": [str(self.first_project)], "maxWorkers": "500"},
+            )
+
+        self.assertEqual(server.MAX_BATCH_WORKERS, process_batch.call_args.kwargs["max_workers"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "src" / "python"))
+
+from plakat.checkpoint import CHECKPOINT_FILENAME, PosterCheckpoint, batch_fingerprint
+from tools.plakat_generator import PlakatGenerator
+
+
+PROJECTS = [
+    {"id": "CZ.02.3.68/0.0/0.0/20_083/0021931", "name": "Projekt A"},
+    {"id": "CZ.02.3.68/0.0/0.0/20_083/0021932", "name": "Projekt B"},
+    {"id": "CZ.02.3.68/0.0/0.0/20_083/0021933", "name": "Projekt C"},
+]
+
+
+class PlakatCheckpointTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.output_dir = Path(self.temp_dir.name)
+
+    def run_generator(self, failures_per_project: dict[str, int], **options):
+        generator = PlakatGenerator()
+        generator.retry_backoff = 0
+        calls = []
+        remaining = dict(failures_per_project)
+
+        def fake_remote(project, orientation, common_text):
+            calls.append(project["name"])
+            if remaining.get(project["name"], 0) > 0:
+                remaining[project["name"]] -= 1
+                return False, None, "HTTP 503"
+            return True, f"%PDF-1.4 {project['name']}".encode("utf-8"), generator._generate_filename(project["id"])
+
+        with patch.object(generator, "_generate_poster_for_project", side_effect=fake_remote):
+            result = generator.process(
+                [],
+                {
+                    "projects": PROJECTS,
+                    "orientation": "portrait",
+                    "common_text": "Text",
+                    "output_dir": str(self.output_dir),
+                    **options,
+                },
+            )
+        return result, calls
+
+    def test_failed_projects_are_retried_at_end_of_batch(self) -> None:
+        result, calls = self.run_generator({"Projekt B": 2})
+
+        self.assertEqual(["Projekt A", "Projekt B", "Projekt C", "Projekt B", "Projekt B"], calls)
+        self.assertEqual(3, result["data"]["successful_projects"])
+        self.assertEqual([], result["errors"])
+        self.assertEqual(
+            ["21931_plakat.pdf", "21932_plakat.pdf", "21933_plakat.pdf"],
+            [Path(path).name for path in result["data"]["output_files"]],
+        )
+
+    def test_resume_skips_projects_recorded_in_manifest(self) -> None:
+        first, _calls = self.run_generator({"Projekt B": 5}, retry_rounds=1)
+        self.assertEqual(["Project CZ.02.3.68/0.0/0.0/20_083/0021932: HTTP 503"], first["errors"])
+        self.assertTrue((self.output_dir / CHECKPOINT_FILENAME).is_file())
+
+        second, calls = self.run_generator({}, resume=True)
+
+        self.assertEqual(["Projekt B"], calls)
+        self.assertEqual(2, second["data"]["resumed_projects"])
+        self.assertEqual(3, second["data"]["successful_projects"])
+        self.assertEqual(
+            ["21931_plakat.pdf", "21932_plakat.pdf", "21933_plakat.pdf"],
+            [Path(path).name for path in second["data"]["output_files"]],
+        )
+
+    def test_manifest_is_ignored_for_changed_settings_or_missing_files(self) -> None:
+        self.run_generator({})
+        (self.output_dir / "21931_plakat.pdf").unlink()
+
+        _result, changed_calls = self.run_generator({}, resume=True, common_text="Jiný text")
+        self.assertEqual(3, len(changed_calls))
+
+        checkpoint = PosterCheckpoint(self.output_dir, batch_fingerprint("portrait", "Jiný text", "remote"))
+        (self.output_dir / "21931_plakat.pdf").unlink()
+        self.assertIsNone(checkpoint.completed_file(PROJECTS[0]["id"], "Projekt A"))
+        self.assertIsNone(checkpoint.completed_file(PROJECTS[1]["id"], "Přejmenovaný projekt"))
+        self.assertIsNotNone(checkpoint.completed_file(PROJECTS[1]["id"], "Projekt B"))
+
+    def test_run_without_resume_regenerates_everything(self) -> None:
+        self.run_generator({})
+
+        _result, calls = self.run_generator({})
+
+        self.assertEqual(3, len(calls))
+
+
+if __name__ == "__main__":
+    unittest.main()
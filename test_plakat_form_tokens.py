@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+
+import logging
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "src" / "python"))
+
+from plakat import form_tokens
+from plakat.form_tokens import extract_form_token, extract_step_progress
+from tools.plakat_generator import PlakatGenerator
+
+
+STEP_PAGE = """
+<html><body>
+<ul class="wizard" id="steps"><li class="done first">Formát</li><li class='active'>Texty</li><li>Tisk</li></ul>
+<label for="form__token">form[_token]</label>
+<form method="post">
+  <input type="hidden" id="form__token" value="a&amp;b-123" name="form[_token]" />
+</form>
+</body></html>
+"""
+
+
+class FormTokenExtractionTests(unittest.TestCase):
+    def test_fast_path_reads_token_regardless_of_attribute_order(self) -> None:
+        with patch.object(form_tokens, "_parse_form_token_with_soup") as soup_parser:
+            self.assertEqual("a&b-123", extract_form_token(STEP_PAGE))
+            self.assertEqual("x", extract_form_token("<INPUT name='form[_token]' value=x>"))
+            self.assertEqual("", extract_form_token('<input name="form[_token]">'))
+            self.assertIsNone(extract_form_token("<p>no form here</p>"))
+
+        soup_parser.assert_not_called()
+
+    def test_falls_back_to_full_parser_for_markup_the_scanner_cannot_read(self) -> None:
+        page = '<input name="form[_token]" title="a>b" value="abc">'
+
+        with patch.object(form_tokens, "_parse_form_token_with_soup", wraps=form_tokens._parse_form_token_with_soup) as soup_parser:
+            self.assertEqual("abc", extract_form_token(page))
+
+        soup_parser.assert_called_once_with(page)
+
+    def test_step_progress_reads_list_item_classes(self) -> None:
+        self.assertEqual(["DONE", "ACTIVE", "PENDING"], extract_step_progress(STEP_PAGE))
+        self.assertIsNone(extract_step_progress("<ul id='menu'><li class='done'></li></ul>"))
+
+    def test_generator_parses_progress_only_with_debug_logging(self) -> None:
+        logger = logging.getLogger("test_plakat_form_tokens")
+        generator = PlakatGenerator(logger)
+        response = SimpleNamespace(text=STEP_PAGE, raise_for_status=lambda: None)
+        session_data = {"current_token": "old"}
+
+        with patch.object(generator, "_request", return_value=response), patch(
+            "tools.plakat_generator.extract_step_progress", wraps=extract_step_progress
+        ) as progress:
+            logger.setLevel(logging.INFO)
+            generator._step2_set_format(None, session_data, "portrait")
+            progress.assert_not_called()
+
+            logger.setLevel(logging.DEBUG)
+            generator._step4_finalize(None, session_data)
+            progress.assert_called_once_with(STEP_PAGE)
+
+        self.assertEqual("a&b-123", session_data["current_token"])
+
+
+if __name__ == "__main__":
+    unittest.main()
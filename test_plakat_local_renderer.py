@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+
+import io
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from pypdf import PdfReader
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "src" / "python"))
+
+from plakat import local_renderer
+from plakat.local_renderer import PosterRenderError, render_poster
+from tools.plakat_generator import PlakatGenerator
+
+
+COMMON_TEXT = "Cílem projektu je přispět k zajištění rovného přístupu ke kvalitnímu vzdělávání."
+
+
+HAS_POSTER_FONT = any(
+    regular.is_file() and bold.is_file() for regular, bold in local_renderer.default_font_candidates()
+)
+
+
+@unittest.skipUnless(HAS_POSTER_FONT, "no system TrueType font for local poster rendering")
+class LocalPosterRendererTests(unittest.TestCase):
+    def test_renders_a3_portrait_and_landscape_with_czech_text(self) -> None:
+        for orientation, expected_size in (("portrait", (297, 420)), ("landscape", (420, 297))):
+            reader = PdfReader(io.BytesIO(render_poster("Modernizace učeben ŽŠ Ústí", orientation, COMMON_TEXT)))
+            page = reader.pages[0]
+            size_mm = tuple(round(float(value) / 72 * 25.4) for value in page.mediabox[2:])
+            text = " ".join(page.extract_text().split())
+
+            self.assertEqual(expected_size, size_mm)
+            self.assertIn("Modernizace učeben ŽŠ Ústí", text)
+            self.assertIn("rovného přístupu", text)
+            self.assertIn(local_renderer.FINANCING_TEXT, text)
+            self.assertIn(local_renderer.DRAFT_NOTICE, text)
+
+    def test_output_is_deterministic(self) -> None:
+        self.assertEqual(
+            render_poster("Projekt", "portrait", COMMON_TEXT),
+            render_poster("Projekt", "portrait", COMMON_TEXT),
+        )
+
+    def test_generator_renders_locally_without_network(self) -> None:
+        generator = PlakatGenerator()
+        with tempfile.TemporaryDirectory() as output_dir, patch.object(
+            generator, "_generate_poster_for_project", side_effect=AssertionError("remote flow used")
+        ):
+            result = generator.process(
+                [],
+                {
+                    "projects": [{"id": "CZ.02.3.68/0.0/0.0/20_083/0021933", "name": "Modernizace učeben"}],
+                    "orientation": "landscape",
+                    "common_text": COMMON_TEXT,
+                    "output_dir": output_dir,
+                    "renderer": "local",
+                },
+            )
+            saved = Path(result["data"]["output_files"][0])
+
+            self.assertTrue(result["success"], result["errors"])
+            self.assertEqual("21933_plakat.pdf", saved.name)
+            self.assertTrue(saved.read_bytes().startswith(b"%PDF"))
+        self.assertEqual(1, result["data"]["local_projects"])
+        self.assertIn("neoficiální náhled", result["message"])
+        self.assertTrue(any("neoficiální náhled" in warning for warning in result["warnings"]))
+
+
+class LocalPosterFallbackTests(unittest.TestCase):
+    def test_falls_back_to_remote_flow_when_local_rendering_fails(self) -> None:
+        generator = PlakatGenerator()
+        remote = (True, b"%PDF-1.4 remote", "21933_plakat.pdf")
+
+        with tempfile.TemporaryDirectory() as output_dir, patch(
+            "tools.plakat_generator.render_poster", side_effect=PosterRenderError("no font")
+        ), patch.object(generator, "_generate_poster_for_project", return_value=remote) as remote_flow:
+            result = generator.process(
+                [],
+                {
+                    "projects": [{"id": "CZ.02.3.68/0.0/0.0/20_083/0021933", "name": "Modernizace učeben"}],
+                    "orientation": "portrait",
+                    "common_text": COMMON_TEXT,
+                    "output_dir": output_dir,
+                    "renderer": "local",
+                },
+            )
+
+        remote_flow.assert_called_once()
+        self.assertTrue(result["success"])
+        self.assertEqual(0, result["data"]["local_projects"])
+        self.assertEqual(1, len(result["warnings"]))
+
+    def test_rejects_unknown_renderer(self) -> None:
+        generator = PlakatGenerator()
+
+        result = generator.process(
+            [],
+            {
+                "projects": [{"id": "CZ.00/1", "name": "Projekt"}],
+                "orientation": "portrait",
+                "common_text": "",
+                "renderer": "svg",
+            },
+        )
+
+        self.assertFalse(result["success"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "src" / "python"))
+
+from plakat.poster_cache import PosterCache
+from tools.plakat_generator import PlakatGenerator
+
+
+PROJECTS = [
+    {"id": "CZ.02.3.68/0.0/0.0/20_083/0021933", "name": "Modernizace učeben"},
+    {"id": "CZ.02.3.68/0.0/0.0/20_083/0021934", "name": "Digitalizace výuky"},
+]
+
+
+class PosterCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.cache_dir = Path(self.temp_dir.name)
+
+    def test_key_covers_every_poster_input(self) -> None:
+        cache = PosterCache(self.cache_dir)
+        base = cache.key_for("Projekt", "portrait", "Text", "v1")
+
+        self.assertEqual(base, cache.key_for("Projekt", "portrait", "Text", "v1"))
+        for variant in (
+            ("Projekt 2", "portrait", "Text", "v1"),
+            ("Projekt", "landscape", "Text", "v1"),
+            ("Projekt", "portrait", "Text 2", "v1"),
+            ("Projekt", "portrait", "Text", "v2"),
+        ):
+            self.assertNotEqual(base, cache.key_for(*variant))
+
+    def test_round_trip_invalidation_and_corrupt_entries(self) -> None:
+        cache = PosterCache(self.cache_dir)
+        cache.put("a", b"%PDF-1.4 a")
+        (self.cache_dir / "b.pdf").write_bytes(b"<html>error page</html>")
+
+        self.assertEqual(b"%PDF-1.4 a", cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertFalse((self.cache_dir / "b.pdf").exists())
+
+        cache.invalidate("a")
+        self.assertIsNone(cache.get("a"))
+
+    def test_least_recently_used_entries_are_evicted_over_size_cap(self) -> None:
+        cache = PosterCache(self.cache_dir, max_bytes=25)
+        cache.put("old", b"%PDF-1.4 old")
+        cache.put("recent", b"%PDF-1.4 new")
+        os.utime(self.cache_dir / "old.pdf", (1, 1))
+        os.utime(self.cache_dir / "recent.pdf", (2, 2))
+        cache.get("old")
+
+        cache.put("third", b"%PDF-1.4 3rd")
+
+        self.assertIsNotNone(cache.get("old"))
+        self.assertIsNone(cache.get("recent"))
+        self.assertIsNotNone(cache.get("third"))
+
+
+class PlakatGeneratorCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.cache = PosterCache(Path(self.temp_dir.name) / "cache")
+        self.output_dir = Path(self.temp_dir.name) / "out"
+        self.output_dir.mkdir()
+
+    def run_generator(self, **options):
+        generator = PlakatGenerator(poster_cache=self.cache)
+        remote_calls = []
+
+        def fake_remote(project, orientation, common_text):
+            remote_calls.append(project["id"])
+            return True, f"%PDF-1.4 {project['name']} {common_text}".encode("utf-8"), generator._generate_filename(project["id"])
+
+        with patch.object(generator, "_generate_poster_for_project", side_effect=fake_remote):
+            result = generator.process(
+                [],
+                {
+                    "projects": PROJECTS,
+                    "orientation": "portrait",
+                    "common_text": "Text",
+                    "output_dir": str(self.output_dir),
+                    **options,
+                },
+            )
+        return result, remote_calls
+
+    def test_repeat_batch_is_served_from_cache(self) -> None:
+        first, first_calls = self.run_generator()
+        second, second_calls = self.run_generator()
+
+        self.assertEqual(2, len(first_calls))
+        self.assertEqual(0, first["data"]["cached_projects"])
+        self.assertEqual([], second_calls)
+        self.assertEqual(2, second["data"]["cached_projects"])
+        self.assertIn("2 z mezipaměti", second["message"])
+        self.assertEqual(
+            "%PDF-1.4 Modernizace učeben Text".encode("utf-8"),
+            (self.output_dir / "21933_plakat.pdf").read_bytes(),
+        )
+
+    def test_changed_inputs_and_bypass_regenerate(self) -> None:
+        self.run_generator()
+
+        _result, changed_calls = self.run_generator(common_text="Jiný text")
+        bypass, bypass_calls = self.run_generator(bypass_cache=True)
+
+        self.assertEqual(2, len(changed_calls))
+        self.assertEqual(2, len(bypass_calls))
+        self.assertEqual(0, bypass["data"]["cached_projects"])
+
+
+if __name__ == "__main__":
+    unittest.main()
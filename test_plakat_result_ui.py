@@ -87,6 +87,17 @@ class PlakatResultUiTests(unittest.TestCase):
         self.assertIn("Project &lt;bad&gt;: script &amp; html", html)
         self.assertNotIn("Project <bad>", html)
 
+    def test_local_posters_are_labelled_as_unofficial_drafts(self) -> None:
+        result = {
+            "data": {"successful_projects": 2, "failed_projects": 0, "total_projects": 2, "local_projects": 2, "output_files": []},
+            "errors": [],
+            "warnings": [],
+        }
+
+        html = build_result_html(result, [], "C:\\Plakaty")
+
+        self.assertIn("Neoficiální náhled (vykresleno lokálně):</strong> 2", html)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import SimpleNamespace
+from urllib.parse import parse_qs
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "src" / "python"))
+
+from plakat.scheduler import PoliteScheduler
+from tools.plakat_generator import PlakatGenerator
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(round(seconds, 3))
+        self.now += seconds
+
+
+class ScriptedSession:
+    def __init__(self, *statuses: int, headers: dict | None = None) -> None:
+        self.statuses = list(statuses)
+        self.headers = headers or {}
+        self.calls = 0
+
+    def request(self, method: str, url: str, **kwargs):
+        self.calls += 1
+        status = self.statuses.pop(0) if self.statuses else 200
+        return SimpleNamespace(status_code=status, headers=self.headers, close=lambda: None)
+
+
+class PosterServiceStandIn(BaseHTTPRequestHandler):
+    throttle_remaining = 0
+    in_flight = 0
+    peak_in_flight = 0
+    lock = threading.Lock()
+    sessions: dict[str, dict[str, str]] = {}
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        self._handle(None)
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        self._handle(parse_qs(self.rfile.read(length).decode("utf-8")))
+
+    def _handle(self, form: dict | None) -> None:
+        cls = type(self)
+        with cls.lock:
+            cls.in_flight += 1
+            cls.peak_in_flight = max(cls.peak_in_flight, cls.in_flight)
+            throttled = cls.throttle_remaining > 0
+            cls.throttle_remaining -= int(throttled)
+        try:
+            time.sleep(0.02)
+            if throttled:
+                self.send_response(429)
+                self.send_header("Retry-After", "0")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self._route(form)
+        finally:
+            with cls.lock:
+                cls.in_flight -= 1
+
+    def _route(self, form: dict | None) -> None:
+        cookie = self.headers.get("Cookie", "")
+        session_id = cookie.partition("PHPSESSID=")[2].split(";")[0]
+        if self.path == "/gen/krok1" and form is None:
+            session_id = f"s{len(self.sessions) + 1}"
+            self.sessions[session_id] = {"token": f"{session_id}-1"}
+            self._send_form(session_id, cookie=True)
+            return
+
+        state = self.sessions.get(session_id)
+        if state is None:
+            self.send_error(500)
+            return
+        if self.path == "/gen/nahled":
+            body = f"%PDF-1.4 {state.get('project', '')}".encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/pdf")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        if form.get("form[_token]", [""])[0] != state["token"]:
+            self.send_error(400)
+            return
+        if self.path == "/gen/krok2":
+            state["project"] = form["form[texts][0][project]"][0]
+        state["token"] = f"{session_id}-{int(state['token'].rsplit('-', 1)[1]) + 1}"
+        self._send_form(session_id)
+
+    def _send_form(self, session_id: str, cookie: bool = False) -> None:
+        token = self.sessions[session_id]["token"]
+        body = (
+            '<ul id="steps"><li class="done">1</li><li class="active">2</li></ul>'
+            f'<form><input type="hidden" name="form[_token]" value="{token}"></form>'
+        ).encode("utf-8")
+        self.send_response(200)
+        if cookie:
+            self.send_header("Set-Cookie", f"PHPSESSID={session_id}; Path=/")
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class PoliteSchedulerTests(unittest.TestCase):
+    def test_global_rate_spaces_requests(self) -> None:
+        clock = FakeClock()
+        scheduler = PoliteScheduler(requests_per_second=2, clock=clock, sleep=clock.sleep)
+        session = ScriptedSession()
+
+        for _ in range(3):
+            scheduler.request(session, "GET", "http://example.test/gen/krok1")
+
+        self.assertEqual([0.5, 0.5], clock.sleeps)
+
+    def test_throttled_responses_back_off_and_honour_retry_after(self) -> None:
+        clock = FakeClock()
+        scheduler = PoliteScheduler(requests_per_second=100, base_backoff=1.0, clock=clock, sleep=clock.sleep)
+
+        response = scheduler.request(ScriptedSession(503, 503), "GET", "http://example.test/gen/nahled")
+        self.assertEqual(200, response.status_code)
+        self.assertEqual([1.0, 2.0], clock.sleeps)
+        self.assertEqual(1.0, scheduler.host_backoff("http://example.test/"))
+
+        clock.sleeps.clear()
+        scheduler.request(ScriptedSession(429, headers={"Retry-After": "7"}), "GET", "http://example.test/gen/krok1")
+        self.assertEqual(7.0, clock.sleeps[-1])
+
+    def test_gives_up_after_max_retries(self) -> None:
+        clock = FakeClock()
+        scheduler = PoliteScheduler(max_retries=2, clock=clock, sleep=clock.sleep)
+        session = ScriptedSession(500, 500, 500, 500)
+
+        response = scheduler.request(session, "GET", "http://example.test/gen/nahled")
+
+        self.assertEqual(500, response.status_code)
+        self.assertEqual(3, session.calls)
+
+
+class PlakatConcurrentGenerationTests(unittest.TestCase):
+    def setUp(self) -> None:
+        PosterServiceStandIn.sessions = {}
+        PosterServiceStandIn.throttle_remaining = 0
+        PosterServiceStandIn.in_flight = 0
+        PosterServiceStandIn.peak_in_flight = 0
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), PosterServiceStandIn)
+        self.addCleanup(self.server.server_close)
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.shutdown)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/gen"
+        self.output_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.output_dir.cleanup)
+
+    def run_generator(self, scheduler: PoliteScheduler, project_count: int) -> dict:
+        generator = PlakatGenerator(base_url=self.base_url, scheduler=scheduler)
+        return generator.process(
+            [],
+            {
+                "projects": [
+                    {"id": f"CZ.02.3.68/0.0/0.0/20_083/00219{index:02d}", "name": f"Projekt {index}"}
+                    for index in range(1, project_count + 1)
+                ],
+                "orientation": "portrait",
+                "common_text": "Spolecny text",
+                "output_dir": self.output_dir.name,
+                "max_concurrency": 4,
+            },
+        )
+
+    def test_projects_run_concurrently_under_per_host_cap(self) -> None:
+        result = self.run_generator(PoliteScheduler(requests_per_second=500, per_host_limit=2), 5)
+
+        self.assertTrue(result["success"], result["errors"])
+        self.assertEqual(5, result["data"]["successful_projects"])
+        self.assertEqual(
+            ["21901_plakat.pdf", "21902_plakat.pdf", "21903_plakat.pdf", "21904_plakat.pdf", "21905_plakat.pdf"],
+            [Path(path).name for path in result["data"]["output_files"]],
+        )
+        self.assertEqual(
+            b"%PDF-1.4 Projekt 3",
+            Path(result["data"]["output_files"][2]).read_bytes(),
+        )
+        self.assertEqual(2, PosterServiceStandIn.peak_in_flight)
+
+    def test_throttled_service_is_retried_with_backoff(self) -> None:
+        PosterServiceStandIn.throttle_remaining = 2
+        scheduler = PoliteScheduler(requests_per_second=500, base_backoff=0.01)
+
+        result = self.run_generator(scheduler, 2)
+
+        self.assertTrue(result["success"], result["errors"])
+        self.assertEqual(2, result["data"]["successful_projects"])
+        self.assertEqual(2, scheduler.retried_responses)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -165,7 +165,7 @@ class RuntimeConsistencyTests(unittest.TestCase):
         output_path.write_bytes(b"%PDF-1.4\n")
 
         class FakePlakatGenerator:
-            def __init__(self, logger) -> None:
+            def __init__(self, logger, poster_cache=None) -> None:
                 self.logger = logger
 
             def process(self, files, options):